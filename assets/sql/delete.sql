@@ -1,4 +1,5 @@
 DROP TABLE IF EXISTS individual_listings CASCADE;
 DROP TABLE IF EXISTS searches CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
-DROP TABLE IF EXISTS addresses CASCADE;
\ No newline at end of file
+DROP TABLE IF EXISTS addresses CASCADE;
+DROP TABLE IF EXISTS schema_migrations;
\ No newline at end of file
@@ -87,11 +87,7 @@ CREATE TABLE IF NOT EXISTS individual_listings (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Add foreign key constraints
-ALTER TABLE users 
-ADD CONSTRAINT fk_address 
-FOREIGN KEY (address_id) 
-REFERENCES addresses(id);
+-- Indexes and later schema changes are versioned migrations in assets/sql/migrations
 
 -- Grant permissions to role
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO ${POSTGRES_ROLE};
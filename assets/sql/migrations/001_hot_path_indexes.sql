@@ -0,0 +1,13 @@
+-- Indexes for the lookups the services run on every request
+
+-- AuthService: sessions of a user
+CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
+
+-- SearchService: searches of a user, and the newest search of a user by name in
+-- create_search. The leading user_id column also serves the plain user_id lookups.
+CREATE INDEX IF NOT EXISTS idx_searches_user_id_name_created_at
+    ON searches (user_id, name, created_at DESC);
+
+-- listings of a search, optionally only the ones not contacted yet
+CREATE INDEX IF NOT EXISTS idx_individual_listings_search_config_id_contacted
+    ON individual_listings (search_config_id, contacted);
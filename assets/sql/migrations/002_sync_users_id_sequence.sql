@@ -0,0 +1,5 @@
+-- User ids used to be computed as max(id) + 1 by AuthService and inserted
+-- explicitly, which never advanced the sequence of users.id. Users are now created
+-- with the generated id, so move the sequence past the existing ids.
+SELECT setval(pg_get_serial_sequence('users', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL)
+FROM users;
@@ -0,0 +1,16 @@
+-- Revocation of sessions before their token expires, see
+-- backend/src/utils/session_revocations.py
+
+-- every revocation takes the next id, the auth service polls for ids above the
+-- highest one it has seen
+CREATE SEQUENCE IF NOT EXISTS session_revocations_seq;
+
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS revoked_at TIMESTAMP;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS revocation_id BIGINT;
+
+-- polls for new revocations, only revoked sessions are indexed
+CREATE INDEX IF NOT EXISTS idx_sessions_revocation_id
+    ON sessions (revocation_id) WHERE revocation_id IS NOT NULL;
+
+-- batched purge of expired sessions
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
@@ -0,0 +1,86 @@
+"""Throughput benchmark for `DatabaseService.bulk_insert`.
+
+Inserts generated `individual_listings` rows into a scratch copy of the table using
+one INSERT per row (the previous implementation), `execute_values` and `COPY FROM
+STDIN`, and reports rows per second for each strategy. Needs a running PostgreSQL
+with the schema from `assets/sql/init.sql` and the `POSTGRES_ROLE` and
+`POSTGRES_PWD` environment variables.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_bulk_insert.py [number_of_rows]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+from services.database_service import DatabaseService, DBConfig
+from utils import getenv
+
+TABLE = "bench_individual_listings"
+
+
+def make_rows(number: int) -> list:
+    return [{
+        "listing_id": str(9000000 + i),
+        "listing_title": f"Zimmer {i} in Berlin",
+        "listing_url": f"https://www.wg-gesucht.de/wg-zimmer-in-Berlin.{9000000 + i}.html",
+        "location": "Berlin, Mitte",
+        "price": 400 + i % 300,
+        "size": 10 + i % 20,
+        "rental_start_date": date(2024, 5, 1) + timedelta(days=i % 90),
+        "deposit": 1000,
+        "utilities": None,
+    } for i in range(number)]
+
+
+def insert_per_row(db_service: DatabaseService, rows: list) -> None:
+    columns = list(rows[0].keys())
+    query = (f"INSERT INTO {TABLE} ({', '.join(columns)}) "
+             f"VALUES ({', '.join(['%s'] * len(columns))})")
+    with db_service.pool.connection() as conn, conn.cursor() as cur:
+        for row in rows:
+            cur.execute(query, tuple(row[col] for col in columns))
+        conn.commit()
+
+
+def main(number: int = 10000):
+    db_service = DatabaseService(DBConfig(
+        host=getenv("POSTGRES_HOST", "localhost"),
+        port=int(getenv("POSTGRES_PORT", "5432")),
+        database="postgres",
+        user=getenv("POSTGRES_ROLE"),
+        password=getenv("POSTGRES_PWD"),
+    ))
+    db_service.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+    db_service.execute_query(f"CREATE TABLE {TABLE} (LIKE individual_listings INCLUDING ALL)")
+    rows = make_rows(number)
+
+    strategies = [
+        ("one INSERT per row", lambda: insert_per_row(db_service, rows)),
+        ("execute_values", lambda: db_service.bulk_insert(TABLE, rows)),
+        ("COPY", lambda: db_service.bulk_insert(TABLE, rows, method="copy")),
+        ("execute_values upsert", lambda: db_service.bulk_insert(
+            TABLE, rows, on_conflict="update", conflict_columns=["listing_id"])),
+        ("COPY upsert", lambda: db_service.bulk_insert(
+            TABLE, rows, method="copy", on_conflict="update", conflict_columns=["listing_id"])),
+    ]
+
+    print(f"{'strategy':<24}{'seconds':>10}{'rows/s':>12}")
+    try:
+        for label, run in strategies:
+            if "upsert" not in label:
+                db_service.execute_query(f"TRUNCATE {TABLE}")
+            start = time.perf_counter()
+            result = run()
+            seconds = time.perf_counter() - start
+            if isinstance(result, dict) and not result["success"]:
+                raise RuntimeError(result["error"])
+            print(f"{label:<24}{seconds:>10.3f}{number / seconds:>12.0f}")
+    finally:
+        db_service.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+        db_service.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
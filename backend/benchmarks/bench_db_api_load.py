@@ -0,0 +1,60 @@
+"""Load test for the database API with the sync and the async backend.
+
+Fires concurrent `/query` and `/select` requests that each hold a connection for a
+slow query, and reports throughput and latency per concurrency level. Start the API
+once per backend and compare the output:
+
+    DB_BACKEND=sync PYTHONPATH=src python src/api/v1/database.py
+    DB_BACKEND=async PYTHONPATH=src python src/api/v1/database.py
+
+Then, from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_db_api_load.py [requests_per_level] [url]
+"""
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CONCURRENCY_LEVELS = (1, 4, 16, 64)
+SLOW_QUERY = "SELECT pg_sleep(0.05)"
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    return (statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000)
+
+
+def request(session: requests.Session, url: str, i: int) -> float:
+    start = time.perf_counter()
+    if i % 2:
+        response = session.post(f"{url}/query", json={"query": SLOW_QUERY})
+    else:
+        response = session.get(f"{url}/select",
+                               params={"table": "(SELECT pg_sleep(0.05)) AS slow"})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main(number: int = 200, url: str = "http://localhost:7999"):
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=max(CONCURRENCY_LEVELS)))
+    print(session.get(f"{url}/pool-stats").json())
+
+    for concurrency in CONCURRENCY_LEVELS:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            samples = list(executor.map(lambda i: request(session, url, i), range(number)))
+            elapsed = time.perf_counter() - start
+        p50, p99 = percentiles(samples)
+        print(f"concurrency {concurrency:>3}: {number / elapsed:7.1f} req/s  "
+              f"p50 {p50:7.1f}ms  p99 {p99:7.1f}ms")
+
+    print(session.get(f"{url}/pool-stats").json())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+         sys.argv[2] if len(sys.argv) > 2 else "http://localhost:7999")
@@ -0,0 +1,64 @@
+"""Latency benchmark for queries through `DatabaseService`.
+
+Compares opening a new connection per query, as `DatabaseService` used to, against
+borrowing a connection from its pool. Needs a running PostgreSQL and the
+`POSTGRES_ROLE` and `POSTGRES_PWD` environment variables.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_db_pool.py [number_of_queries]
+"""
+import statistics
+import sys
+import time
+
+from services.database_service import DatabaseService, DBConfig
+from utils import getenv
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    return (statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000)
+
+
+def connect_per_query(db_service: DatabaseService, query: str) -> None:
+    conn = db_service._get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query)
+            cur.fetchall()
+    finally:
+        conn.close()
+
+
+def main(number: int = 500):
+    db_service = DatabaseService(DBConfig(
+        host=getenv("POSTGRES_HOST", "localhost"),
+        port=int(getenv("POSTGRES_PORT", "5432")),
+        database="postgres",
+        user=getenv("POSTGRES_ROLE"),
+        password=getenv("POSTGRES_PWD"),
+    ))
+    query = "SELECT 1"
+
+    results = {}
+    for label, run in [
+        ("connect per query", lambda: connect_per_query(db_service, query)),
+        ("pooled execute_query", lambda: db_service.execute_query(query)),
+    ]:
+        samples = []
+        for _ in range(number):
+            start = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - start)
+        results[label] = percentiles(samples)
+
+    print(f"{'strategy':<24}{'p50 [ms]':>10}{'p99 [ms]':>10}")
+    for label, (p50, p99) in results.items():
+        print(f"{label:<24}{p50:>10.3f}{p99:>10.3f}")
+    print(db_service.pool_stats())
+    db_service.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
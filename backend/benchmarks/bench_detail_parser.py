@@ -0,0 +1,68 @@
+"""Micro-benchmark for parsing WG-Gesucht listing detail pages.
+
+Compares the previous implementation, which built a new BeautifulSoup tree for every
+property that was read, against the parse-once `ListingInfoGetter.details` with and
+without the lxml XPath fast path, using the saved detail pages in `tests/data`.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_detail_parser.py
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from listing_info_getter import ListingInfoGetter
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "tests" / "data"
+FIXTURES = ["listing_detail.html", "listing_detail_unlimited.html"]
+REF = "/wg-zimmer-in-Berlin.1.html"
+
+
+def legacy_parse(html: str) -> tuple:
+    """Read the text and rental duration the way ListingInfoGetter used to."""
+    soup = BeautifulSoup(html, "lxml")
+    chunks = soup.find("div", {"id": "ad_description_text"}).find_all(["p", "h3"])
+    text = "".join(chunk.getText().strip() + "\n\n" for chunk in chunks)
+
+    soup = BeautifulSoup(html, "lxml")
+    dates = []
+    for p in soup.find_all("p", {"style": "line-height: 2em;"}):
+        p_text = p.getText().strip()
+        if "frei ab:" in p_text:
+            dates = [elem for elem in re.split(" |\n", p_text.replace("  ", "")) if "." in elem]
+    return text, ListingInfoGetter._compute_rental_duration("-".join(dates))
+
+
+def soup_parse(html: str) -> tuple:
+    """Read all fields from a single BeautifulSoup tree."""
+    getter = ListingInfoGetter(REF, html=html, fast_path=False)
+    return getter.listing_text, getter.rental_duration_months, getter.details
+
+
+def fast_parse(html: str) -> tuple:
+    """Read all fields using the lxml XPath fast path."""
+    getter = ListingInfoGetter(REF, html=html)
+    return getter.listing_text, getter.rental_duration_months, getter.details
+
+
+def bench(func, arg, number: int) -> float:
+    """Return the best per-call time in milliseconds over five repeats."""
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number * 1000
+
+
+def main(number: int = 50):
+    print(f"{'fixture':<34}{'before [ms]':>14}{'soup [ms]':>12}{'xpath [ms]':>13}{'speedup':>10}")
+    for name in FIXTURES:
+        html = (DATA_DIR / name).read_text()
+        before = bench(legacy_parse, html, number)
+        soup = bench(soup_parse, html, number)
+        fast = bench(fast_parse, html, number)
+        print(f"{name:<34}{before:>14.2f}{soup:>12.2f}{fast:>13.2f}{before / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,99 @@
+"""EXPLAIN ANALYZE timings of the hot lookups before and after the index migration.
+
+Copies the table definitions into a scratch schema, seeds it with realistic row
+counts, times the lookups the services run on every request, applies
+`001_hot_path_indexes.sql` and times them again. The scratch schema is dropped
+afterwards. Needs a running PostgreSQL with the schema of `assets/sql/init.sql` and
+the `POSTGRES_ROLE` and `POSTGRES_PWD` environment variables.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_indexes.py [number_of_users]
+"""
+import json
+import sys
+
+import psycopg2
+
+from utils import getenv
+from utils.migrations import MIGRATIONS_DIR
+
+SCHEMA = "bench_indexes"
+TABLES = ("users", "sessions", "searches", "individual_listings")
+
+SEED = """
+INSERT INTO users (id, email)
+    SELECT i, 'user' || i || '@example.com' FROM generate_series(1, %(users)s) i;
+INSERT INTO sessions (user_id, token, expires_at)
+    SELECT (i %% %(users)s + 1)::text, md5(i::text), NOW() + interval '1 day'
+    FROM generate_series(1, %(users)s * 5) i;
+INSERT INTO searches (id, user_id, name, created_at)
+    SELECT i, i %% %(users)s + 1, 'Search ' || (i %% 3), NOW() - i * interval '1 minute'
+    FROM generate_series(1, %(users)s * 3) i;
+INSERT INTO individual_listings (search_config_id, listing_id, price, contacted)
+    SELECT i %% (%(users)s * 3) + 1, 'listing-' || i, 300 + i %% 700, i %% 10 = 0
+    FROM generate_series(1, %(users)s * 60) i;
+ANALYZE;
+"""
+
+QUERIES = {
+    "sessions by user": "SELECT * FROM sessions WHERE user_id = '42'",
+    "searches by user": "SELECT * FROM searches WHERE user_id = 42",
+    "newest search by name": "SELECT id FROM searches WHERE user_id = 42 AND name = 'Search 1' "
+                             "ORDER BY created_at DESC LIMIT 1",
+    "listings of search": "SELECT * FROM individual_listings WHERE search_config_id = 42",
+    "uncontacted listings": "SELECT * FROM individual_listings "
+                            "WHERE search_config_id = 42 AND contacted = FALSE",
+}
+
+
+def explain(cur, query: str, repeat: int = 5) -> tuple:
+    """Best execution time in ms over `repeat` runs and the top plan node."""
+    times = []
+    for _ in range(repeat):
+        cur.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}")
+        plan = cur.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        times.append(plan[0]["Execution Time"])
+    node = plan[0]["Plan"]
+    while node.get("Plans") and node["Node Type"] in ("Limit", "Sort"):
+        node = node["Plans"][0]
+    return min(times), node["Node Type"]
+
+
+def main(users: int = 10000):
+    conn = psycopg2.connect(host=getenv("POSTGRES_HOST", "localhost"),
+                            port=int(getenv("POSTGRES_PORT", "5432")),
+                            database="postgres",
+                            user=getenv("POSTGRES_ROLE"),
+                            password=getenv("POSTGRES_PWD"))
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {SCHEMA}")
+            for table in TABLES:
+                # constraints and defaults only, the indexes are what is measured
+                cur.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} "
+                            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                cur.execute(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id)")
+            cur.execute(f"SET search_path TO {SCHEMA}")
+            cur.execute(SEED, {"users": users})
+
+            before = {label: explain(cur, query) for label, query in QUERIES.items()}
+            cur.execute((MIGRATIONS_DIR / "001_hot_path_indexes.sql").read_text())
+            cur.execute("ANALYZE")
+            after = {label: explain(cur, query) for label, query in QUERIES.items()}
+
+            print(f"{users} users, {users * 60} listings")
+            for label in QUERIES:
+                (ms_before, node_before), (ms_after, node_after) = before[label], after[label]
+                print(f"{label:<22} {ms_before:8.2f}ms {node_before:<16} -> "
+                      f"{ms_after:8.2f}ms {node_after}")
+            cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
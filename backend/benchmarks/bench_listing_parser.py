@@ -0,0 +1,103 @@
+"""Micro-benchmark for parsing WG-Gesucht search result pages.
+
+Compares the previous implementation, which built the full document tree and scanned
+every listing element once per extracted property, against the single-pass parser
+of `ListingGetter`, using the saved search pages in `tests/data`.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_listing_parser.py
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from listing_getter import ListingGetter
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "tests" / "data"
+FIXTURES = ["sample.html", "search_results.html"]
+
+
+def legacy_find_listings(html: str) -> list:
+    """Build the full document tree and look up the listing elements."""
+    soup = BeautifulSoup(html, "lxml")
+    return soup.find_all("div", id=re.compile(r"^liste-details-ad-\d+"))
+
+
+def legacy_extract(listings: list) -> dict:
+    """The six-scan extraction ListingGetter used before the single-pass parser."""
+    refs = [listing.find("a", href=True)["href"] for listing in listings]
+    user_names = [listing.find("span", {"class": "ml5"}).getText() for listing in listings]
+    addresses, wg_types = [], []
+    for listing in listings:
+        text = listing.find("div", {"class": "col-xs-11"}).find("span").getText()
+        parts = [part.strip() for part in re.split(r"\||\n", text) if part.strip() != ""]
+        wg_types.append(parts[0])
+        addresses.append(", ".join(parts[::-1][:-1]))
+    lengths, starts = [], []
+    for listing in listings:
+        text = listing.find("div", {"class": "col-xs-5 text-center"}).getText()
+        start_end = [part.strip() for part in re.split("-|\n", text) if part.strip() != ""]
+        lengths.append(ListingGetter._compute_range_length("-".join(start_end)))
+    for listing in listings:
+        text = listing.find("div", {"class": "col-xs-5 text-center"}).getText()
+        start_end = [part.strip() for part in re.split("-|\n", text) if part.strip() != ""]
+        starts.append(ListingGetter._convert_to_datetime(start_end[0]))
+    verified = []
+    for listing in listings:
+        element = listing.find("a", {"class": "campaign_click label_verified ml5"})
+        verified.append(int(bool(element and "unternehmen" in element.text.lower())))
+
+    info_dict = {}
+    for i, values in enumerate(
+            zip(refs, user_names, addresses, wg_types, lengths, starts, verified)):
+        if "\n" in values[1] or values[6]:
+            continue
+        info_dict[i] = values[:6]
+    return info_dict
+
+
+def legacy_parse(html: str) -> dict:
+    """Build the tree and extract the listings the way ListingGetter used to."""
+    return legacy_extract(legacy_find_listings(html))
+
+
+def single_pass_extract(listings: list) -> dict:
+    """Extract the listings the way ListingGetter does, without fetching the page."""
+    getter = ListingGetter.__new__(ListingGetter)
+    getter.listings = listings
+    return getter.all_infos
+
+
+def single_pass_parse(html: str) -> dict:
+    """Build the tree and extract the listings the way ListingGetter does now."""
+    return single_pass_extract(ListingGetter._find_listings(html))
+
+
+def bench(func, arg, number: int) -> float:
+    """Return the best per-call time in milliseconds over five repeats."""
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number * 1000
+
+
+def report(label: str, before_ms: float, after_ms: float):
+    print(f"{label:<42}{before_ms:>14.2f}{after_ms:>13.2f}{before_ms / after_ms:>9.1f}x")
+
+
+def main(number: int = 50):
+    print(f"{'fixture':<42}{'before [ms]':>14}{'after [ms]':>13}{'speedup':>10}")
+    for name in FIXTURES:
+        html = (DATA_DIR / name).read_text()
+        n_listings = len(re.findall(r'id="liste-details-ad-\d+"', html))
+        label = f"{name} ({n_listings} listings)"
+
+        report(f"{label} parse", bench(legacy_parse, html, number),
+               bench(single_pass_parse, html, number))
+        report(f"{label} extract", bench(legacy_extract, legacy_find_listings(html), number),
+               bench(single_pass_extract, ListingGetter._find_listings(html), number))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,51 @@
+"""Peak memory of reading a large table through the database API.
+
+Compares `DatabaseClient.select`, which receives the whole result as one JSON
+document, against `DatabaseClient.iter_select`, which consumes the NDJSON stream of
+a server-side cursor. Needs the database API on port 7999. Optionally seeds
+`individual_listings` with synthetic rows first.
+
+Run from the backend directory:
+
+    PYTHONPATH=src python benchmarks/bench_select_stream.py [rows_to_seed]
+"""
+import sys
+import time
+import tracemalloc
+
+from clients.database_client import DatabaseClient
+
+
+def measure(label: str, read) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = read()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {rows:>8} rows  {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MiB")
+
+
+def main(seed: int = 0):
+    client = DatabaseClient()
+    if seed:
+        rows = [{
+            "listing_id": f"bench-{i}",
+            "listing_title": f"Room {i}",
+            "location": "Berlin",
+            "price": 400 + i % 500,
+            "room_details": "Bright room in a friendly flat share. " * 40,
+            "contacted": False,
+        } for i in range(seed)]
+        client.bulk_insert("individual_listings", rows, method="copy", on_conflict="nothing",
+                           conflict_columns=["listing_id"])
+
+    measure("select", lambda: len(client.select("individual_listings")["data"]))
+    measure("iter_select", lambda: sum(1 for _ in client.iter_select("individual_listings")))
+
+    if seed:
+        client.delete("individual_listings", filters=[["listing_id", "like", "bench-%"]])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
@@ -1,5 +1,6 @@
 # in src folder
-from .listing_info_getter import ListingInfoGetter
+from .listing import Listing
+from .listing_info_getter import ListingDetails, ListingInfoGetter
 from .listing_getter import ListingGetter
 from .openai_helper import OpenAIChatHelper, OpenAIHelper
 from .submit_wg import submit_app
\ No newline at end of file
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from services.auth_service import (
@@ -5,15 +6,34 @@ from services.auth_service import (
     WGGesuchtCredentials,
     OpenAICredentials,
 )
+from utils import getenv
 from utils.browser_manager import BrowserManager
 from dotenv import load_dotenv
 
 load_dotenv()
 
+browser_manager = BrowserManager.from_env()
+auth_service = AuthService(browser_manager,
+                           vault_secret_ttl=float(getenv("VAULT_SECRET_TTL", "60")))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keeps the revoked sessions in sync with the database while the API runs, quits
+    the browsers on shutdown."""
+    if getenv("VAULT_WARM_ON_STARTUP", "false").lower() in ("1", "true", "yes"):
+        auth_service.warm_vaults()
+    auth_service.start_session_sync(
+        poll_interval=float(getenv("SESSION_POLL_INTERVAL", "5")),
+        purge_interval=float(getenv("SESSION_PURGE_INTERVAL", "3600")),
+    )
+    yield
+    auth_service.stop_session_sync()
+    browser_manager.close_all()
+
+
 # Initialize FastAPI
-app = FastAPI(title="Auth Service API")
-browser_manager = BrowserManager()
-auth_service = AuthService(browser_manager)
+app = FastAPI(title="Auth Service API", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -25,6 +45,18 @@ async def health_check():
         return {"status": "unhealthy", "error": str(e)}
 
 
+@app.get("/browser-pool-stats")
+async def browser_pool_stats():
+    """Assigned and pre-launched browsers, pool hits and waits for a free browser."""
+    return browser_manager.pool_stats()
+
+
+@app.get("/vault-cache-stats")
+async def vault_cache_stats():
+    """Cached vaults and the hit rates of vault and secret lookups."""
+    return auth_service.vault_cache_stats()
+
+
 @app.post("/authenticate/wg-gesucht")
 async def authenticate_wg_gesucht(credentials: WGGesuchtCredentials):
     """Authenticate with WG-Gesucht and return session token."""
@@ -74,6 +106,17 @@ async def delete_credentials(
     return {"message": f"Successfully deleted {key}"}
 
 
+@app.post("/logout")
+async def logout(session_token: str):
+    """Revoke a session, its token is rejected from then on."""
+    try:
+        return {"revoked": auth_service.revoke_session(session_token)}
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/get-user-id")
 async def get_user_id(session_token: str):
     """Extract user ID from a session token."""
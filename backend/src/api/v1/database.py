@@ -1,13 +1,25 @@
 import os
+import json
+from contextlib import asynccontextmanager
+from itertools import chain, islice
 from utils import getenv
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator
 from services.database_service import DatabaseService, DBConfig
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# "sync" runs queries through psycopg2, "async" through an asyncpg pool
+DB_BACKENDS = ("sync", "async")
+DB_BACKEND = getenv("DB_BACKEND", "sync")
+if DB_BACKEND not in DB_BACKENDS:
+    raise RuntimeError(f"DB_BACKEND must be one of {DB_BACKENDS}, got {DB_BACKEND}")
+
 
 # Pydantic models for request/response validation
 class QueryRequest(BaseModel):
@@ -21,18 +33,23 @@ class TableOperationRequest(BaseModel):
     table: str
     data: Dict[str, Any]
     conditions: Optional[str] = None
+    params: Optional[list] = None
+    filters: Optional[list] = None
     fields: Optional[List[str]] = None
+    returning: Optional[List[str]] = None
 
 
 class BulkInsertRequest(BaseModel):
     """Model for bulk insert operations."""
     table: str
     data: List[Dict[str, Any]]
+    method: str = "values"
+    page_size: int = 1000
+    on_conflict: Optional[str] = None
+    conflict_columns: Optional[List[str]] = None
+    returning: Optional[List[str]] = None
 
 
-# Initialize FastAPI
-app = FastAPI(title="Database Service API")
-
 # Initialize database service
 db_config = DBConfig(
     host="localhost",
@@ -40,16 +57,46 @@ db_config = DBConfig(
     database="postgres",
     user=getenv("POSTGRES_ROLE"),
     password=getenv("POSTGRES_PWD"),
+    pool_min_size=int(getenv("DB_POOL_MIN_SIZE", "1")),
+    pool_max_size=int(getenv("DB_POOL_MAX_SIZE", "10")),
 )
 
-db_service = DatabaseService(db_config)
+if DB_BACKEND == "async":
+    from services.async_database_service import AsyncDatabaseService
+    db_service = AsyncDatabaseService(db_config)
+else:
+    db_service = DatabaseService(db_config)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Opens the asyncpg pool on the serving event loop and closes the pool on shutdown."""
+    if DB_BACKEND == "async":
+        await db_service.connect()
+    yield
+    if DB_BACKEND == "async":
+        await db_service.close()
+    else:
+        db_service.close()
+
+
+# Initialize FastAPI
+app = FastAPI(title="Database Service API", lifespan=lifespan)
+
+
+async def run(operation: str, *args, **kwargs) -> Dict[str, Any]:
+    """Runs a `DatabaseService` operation on the configured backend."""
+    result = getattr(db_service, operation)(*args, **kwargs)
+    if DB_BACKEND == "async":
+        result = await result
+    return result
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     try:
-        result = db_service.execute_query("SELECT 1")
+        result = await run("execute_query", "SELECT 1")
         if result["success"]:
             return {"status": "healthy", "database": "connected"}
         return {"status": "unhealthy", "database": "error", "details": result.get("error")}
@@ -57,10 +104,89 @@ async def health_check():
         return {"status": "unhealthy", "database": "error", "details": str(e)}
 
 
+@app.get("/pool-stats")
+async def pool_stats():
+    """Connection pool size and checkout metrics."""
+    return db_service.pool_stats()
+
+
+@app.get("/statement-cache-stats")
+async def statement_cache_stats():
+    """Prepared statement hit and miss counters."""
+    if DB_BACKEND == "async":
+        raise HTTPException(status_code=501,
+                            detail="asyncpg does not report prepared statement statistics")
+    return db_service.statement_cache_stats()
+
+
+def parse_json_list(value: Optional[str], name: str) -> Optional[list]:
+    """Decodes a JSON list passed as query parameter, e.g. `params` or `filters`."""
+    if not value:
+        return None
+    try:
+        values = json.loads(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a JSON list")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail=f"{name} must be a JSON list")
+    return values
+
+
+def parse_params(params: Optional[str]) -> Optional[tuple]:
+    """Decodes the JSON list of condition parameters passed as query parameter."""
+    values = parse_json_list(params, "params")
+    return tuple(values) if values else None
+
+
+def to_ndjson(rows: List[Dict[str, Any]]) -> str:
+    """Serializes rows as JSON lines, with the same encoding as the JSON responses."""
+    return "".join(json.dumps(jsonable_encoder(row)) + "\n" for row in rows)
+
+
+async def stream_select(batch_size: int, **kwargs) -> StreamingResponse:
+    """
+    Streams the result of a select as NDJSON, one record per line.
+
+    The first record is read before the response starts, so invalid queries are
+    still answered with status 400. Errors while streaming end the response early.
+    """
+    rows = db_service.stream_select(batch_size=batch_size, **kwargs)
+    try:
+        if DB_BACKEND == "async":
+            first = [await rows.__anext__()]
+        else:
+            first = await run_in_threadpool(lambda: list(islice(rows, 1)))
+    except StopAsyncIteration:
+        first = []
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def sync_lines() -> Iterator[str]:
+        remaining = chain(first, rows)
+        while True:
+            batch = list(islice(remaining, batch_size))
+            if not batch:
+                return
+            yield to_ndjson(batch)
+
+    async def async_lines() -> AsyncIterator[str]:
+        batch = first
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield to_ndjson(batch)
+                batch = []
+        if batch:
+            yield to_ndjson(batch)
+
+    lines = async_lines() if DB_BACKEND == "async" else sync_lines()
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @app.post("/query")
 async def execute_query(request: QueryRequest):
     """Execute raw SQL query."""
-    result = db_service.execute_query(request.query, request.params)
+    result = await run("execute_query", request.query, request.params)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -68,8 +194,8 @@ async def execute_query(request: QueryRequest):
 
 @app.post("/insert")
 async def insert_data(request: TableOperationRequest):
-    """Insert data into a table."""
-    result = db_service.insert(request.table, request.data)
+    """Insert data into a table, `returning` columns of the new record are returned as data."""
+    result = await run("insert", request.table, request.data, returning=request.returning)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -78,17 +204,56 @@ async def insert_data(request: TableOperationRequest):
 @app.post("/bulk-insert")
 async def bulk_insert_data(request: BulkInsertRequest):
     """Bulk insert data into a table."""
-    result = db_service.bulk_insert(request.table, request.data)
+    result = await run(
+        "bulk_insert",
+        request.table,
+        request.data,
+        method=request.method,
+        page_size=request.page_size,
+        on_conflict=request.on_conflict,
+        conflict_columns=request.conflict_columns,
+        returning=request.returning,
+    )
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 
 @app.get("/select")
-async def select_data(table: str, conditions: Optional[str] = None, fields: Optional[str] = None):
-    """Select data from a table."""
-    field_list = fields.split(',') if fields else None
-    result = db_service.select(table, conditions, field_list)
+async def select_data(table: str,
+                      conditions: Optional[str] = None,
+                      fields: Optional[str] = None,
+                      params: Optional[str] = None,
+                      filters: Optional[str] = None,
+                      order_by: Optional[str] = None,
+                      limit: Optional[int] = None,
+                      offset: Optional[int] = None,
+                      stream: bool = False,
+                      batch_size: int = 1000):
+    """
+    Select data from a table.
+
+    `params` is a JSON list of the values of the `%s` placeholders in `conditions`,
+    which are rejected without them. `filters` is a JSON encoded
+    structured filter, see `utils.filters`, and `order_by` a comma separated list
+    like "created_at desc,id". With `stream=true` the records are returned as NDJSON,
+    read from a server-side cursor `batch_size` rows at a time.
+    """
+    select_args = dict(
+        table=table,
+        conditions=conditions,
+        fields=fields.split(',') if fields else None,
+        params=parse_params(params),
+        filters=parse_json_list(filters, "filters"),
+        order_by=order_by.split(',') if order_by else None,
+        limit=limit,
+        offset=offset,
+    )
+    if stream:
+        if batch_size < 1:
+            raise HTTPException(status_code=400, detail="batch_size must be positive")
+        return await stream_select(batch_size, **select_args)
+    result = await run("select", **select_args)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -97,20 +262,29 @@ async def select_data(table: str, conditions: Optional[str] = None, fields: Opti
 @app.put("/update")
 async def update_data(request: TableOperationRequest):
     """Update data in a table."""
-    if not request.conditions:
+    if not request.conditions and not request.filters:
         raise HTTPException(status_code=400, detail="Conditions required for update")
-    result = db_service.update(request.table, request.data, request.conditions)
+    result = await run("update",
+                       request.table,
+                       request.data,
+                       request.conditions,
+                       tuple(request.params) if request.params else None,
+                       filters=request.filters)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 
 @app.delete("/delete")
-async def delete_data(table: str, conditions: str):
-    """Delete data from a table."""
-    if not conditions:
-        raise HTTPException(status_code=400, detail="Conditions required for delete")
-    result = db_service.delete(table, conditions)
+async def delete_data(table: str,
+                      conditions: Optional[str] = None,
+                      params: Optional[str] = None,
+                      filters: Optional[str] = None):
+    """Delete data from a table, `params` and `filters` as for `/select`."""
+    filter_list = parse_json_list(filters, "filters")
+    if not conditions and not filter_list:
+        raise HTTPException(status_code=422, detail="Conditions required for delete")
+    result = await run("delete", table, conditions, parse_params(params), filters=filter_list)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
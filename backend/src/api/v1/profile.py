@@ -1,18 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-from services.profile_service import ProfileService
+from services.async_profile_service import AsyncProfileService
 from utils.browser_manager import BrowserManager
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Initialize FastAPI
-app = FastAPI(title="Profile Service API")
-
 # Initialize services
-browser_manager = BrowserManager()
-profile_service = ProfileService(browser_manager)
+browser_manager = BrowserManager.from_env()
+profile_service = AsyncProfileService(browser_manager)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Closes the connections to the database and auth APIs and the browsers on shutdown."""
+    yield
+    await profile_service.aclose()
+    browser_manager.close_all()
+
+
+# Initialize FastAPI
+app = FastAPI(title="Profile Service API", lifespan=lifespan)
 
 
 # Response models
@@ -48,7 +58,7 @@ async def health_check():
 async def get_profile_photo(session_token: str):
     """Get user's profile photo URL."""
     try:
-        photo_url = profile_service.get_profile_photo(session_token)
+        photo_url = await profile_service.get_profile_photo(session_token)
         return {"photo_url": photo_url}
     except HTTPException as e:
         raise e
@@ -60,7 +70,7 @@ async def get_profile_photo(session_token: str):
 async def get_profile_name(session_token: str):
     """Get user's name details."""
     try:
-        name_data = profile_service.get_profile_name(session_token)
+        name_data = await profile_service.get_profile_name(session_token)
         return name_data
     except HTTPException as e:
         raise e
@@ -72,7 +82,7 @@ async def get_profile_name(session_token: str):
 async def get_profile_address(session_token: str):
     """Get user's address details."""
     try:
-        address_data = profile_service.get_user_address(session_token)
+        address_data = await profile_service.get_user_address(session_token)
         return address_data
     except HTTPException as e:
         raise e
@@ -84,7 +94,7 @@ async def get_profile_address(session_token: str):
 async def download_profile_photo(session_token: str, save_path: Optional[str] = None):
     """Download user's profile photo."""
     try:
-        photo_path = profile_service.download_profile_photo(session_token, save_path)
+        photo_path = await profile_service.download_profile_photo(session_token, save_path)
         return {"photo_path": photo_path}
     except HTTPException as e:
         raise e
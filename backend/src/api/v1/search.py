@@ -1,16 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List
-from services.search_service import SearchService, SearchConfig
-from clients.auth_client import AuthClient
-from clients.database_client import DatabaseClient
+from services.async_search_service import AsyncSearchService
+from services.search_service import SearchConfig
 
-# Initialize FastAPI
-app = FastAPI(title="Search Service API")
+# the database and auth API calls are awaited, so they do not block the event loop
+search_service = AsyncSearchService()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Closes the connections to the database and auth APIs on shutdown."""
+    yield
+    await search_service.aclose()
 
-db_client = DatabaseClient("http://localhost:7999")
-auth_client = AuthClient("http://localhost:8000")
-search_service = SearchService()
+
+# Initialize FastAPI
+app = FastAPI(title="Search Service API", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -26,7 +33,7 @@ async def health_check():
 async def create_search(session_token: str, config: SearchConfig):
     """Create a new search configuration."""
     try:
-        search_id = search_service.create_search(session_token, config)
+        search_id = await search_service.create_search(session_token, config)
         return {"search_id": search_id}
     except HTTPException as e:
         raise e
@@ -38,7 +45,7 @@ async def create_search(session_token: str, config: SearchConfig):
 async def update_search(session_token: str, search_id: str, config: SearchConfig):
     """Update an existing search configuration."""
     try:
-        search_service.update_search(session_token, search_id, config)
+        await search_service.update_search(session_token, search_id, config)
         return {"message": "Search updated successfully"}
     except HTTPException as e:
         raise e
@@ -50,7 +57,7 @@ async def update_search(session_token: str, search_id: str, config: SearchConfig
 async def delete_search(session_token: str, search_id: str):
     """Delete a search configuration."""
     try:
-        search_service.delete_search(session_token, search_id)
+        await search_service.delete_search(session_token, search_id)
         return {"message": "Search deleted successfully"}
     except HTTPException as e:
         raise e
@@ -62,7 +69,7 @@ async def delete_search(session_token: str, search_id: str):
 async def retrieve_all_searches(session_token: str) -> List[dict]:
     """Retrieve all searches for the authenticated user."""
     try:
-        searches = search_service.retrieve_all_searches(session_token)
+        searches = await search_service.retrieve_all_searches(session_token)
         return searches
     except HTTPException as e:
         raise e
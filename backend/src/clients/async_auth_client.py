@@ -0,0 +1,186 @@
+from typing import Any, Dict, Optional, Tuple, Union
+
+import httpx
+import jwt
+from fastapi import HTTPException
+
+from clients.auth_client import AUTH_TIMEOUT
+from clients.async_database_client import drop_none, raise_for_response
+from utils.http_session import AsyncHttpSession, SharedAsyncClient
+from utils.token_verifier import TokenVerifier
+
+
+class AsyncAuthClient:
+    """
+    An async client for the Authentication API, with the methods of `AuthClient`.
+    """
+
+    def __init__(
+        self,
+        auth_api_url: str = "http://localhost:8000",
+        client: Optional[SharedAsyncClient] = None,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = AUTH_TIMEOUT,
+        retries: int = 3,
+        verifier: Optional[TokenVerifier] = None,
+    ):
+        """
+        Initialize the AsyncAuthClient.
+
+        Parameters
+        ----------
+        auth_api_url : str
+            The base URL of the authentication API service.
+        client : SharedAsyncClient, optional
+            Client shared with other async clients. If not given, an own client with
+            `pool_size` connections is created.
+        pool_size : int
+            Maximum number of connections of an own client.
+        timeout : float or Tuple[float, float]
+            Request timeout in seconds, or a (connect, read) tuple.
+        retries : int
+            Maximum number of retries, see `utils.http_session.AsyncHttpSession`.
+        verifier : TokenVerifier, optional
+            Verifies session tokens locally, see `AuthClient`.
+        """
+        self.auth_api_url = auth_api_url.rstrip("/")
+        self._session = AsyncHttpSession(self.auth_api_url,
+                                         client=client,
+                                         pool_size=pool_size,
+                                         timeout=timeout,
+                                         retries=retries)
+        self.verifier = TokenVerifier.from_env() if verifier is None else verifier
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
+        """
+        Generic method for making HTTP requests, see `AuthClient._make_request`.
+
+        Raises
+        ------
+        HTTPException
+            If the request fails.
+        """
+        if "params" in kwargs:
+            kwargs["params"] = drop_none(kwargs["params"])
+        try:
+            response = await self._session.request(method, endpoint, **kwargs)
+        except httpx.HTTPError as e:
+            # For connection errors, timeouts, etc.
+            raise HTTPException(status_code=500, detail=f"Auth API request failed: {str(e)}")
+        raise_for_response(response)
+        return response.json()
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the authentication API."""
+        return self._session.latency_stats()
+
+    async def aclose(self) -> None:
+        """Close the connections to the authentication API, unless the client is shared."""
+        await self._session.aclose()
+
+    async def health_check(self) -> dict:
+        """Check the health of the authentication service."""
+        return await self._make_request("GET", "/health")
+
+    async def authenticate_wg_gesucht(self, email: str, password: str) -> dict:
+        """Authenticate with WG-Gesucht and return session token."""
+        return await self._make_request(
+            "POST",
+            "/authenticate/wg-gesucht",
+            json={
+                "email": email,
+                "password": password
+            },
+        )
+
+    async def authenticate_openai(self, session_token: str, api_key: str) -> dict:
+        """Authenticate and store OpenAI API key."""
+        return await self._make_request(
+            "POST",
+            "/authenticate/openai",
+            params={"session_token": session_token},
+            json={"api_key": api_key},
+        )
+
+    async def _validate_remotely(self, session_token: str) -> bool:
+        response = await self._make_request(
+            "GET",
+            "/validate-token",
+            params={"session_token": session_token},
+        )
+        return response.get("valid", False)
+
+    async def _verify_locally(self, session_token: str) -> str:
+        """
+        Verify a session token with the local verifier, see `AuthClient._verify_locally`.
+        """
+        try:
+            user_id, check_due = self.verifier.verify(session_token)
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid session token")
+        if check_due:
+            if not await self._validate_remotely(session_token):
+                self.verifier.forget(session_token)
+                raise HTTPException(status_code=401, detail="Invalid session token")
+            self.verifier.confirm(session_token)
+        return user_id
+
+    async def validate_session_token(self, session_token: str) -> bool:
+        """Validate a session token."""
+        if self.verifier is None:
+            return await self._validate_remotely(session_token)
+        try:
+            await self._verify_locally(session_token)
+            return True
+        except HTTPException as e:
+            if e.status_code != 401:
+                raise
+            return False
+
+    async def get_credentials(self, session_token: str) -> dict:
+        """Retrieve stored user credentials."""
+        return await self._make_request(
+            "GET",
+            "/get-credentials",
+            params={"session_token": session_token},
+        )
+
+    async def delete_credentials(self, session_token: str, key: str) -> dict:
+        """Delete a specific credential from the user's vault."""
+        return await self._make_request(
+            "DELETE",
+            "/delete-credentials",
+            params={
+                "session_token": session_token,
+                "key": key
+            },
+        )
+
+    async def logout(self, session_token: str) -> bool:
+        """Revoke a session, returns False if it was revoked before."""
+        response = await self._make_request(
+            "POST",
+            "/logout",
+            params={"session_token": session_token},
+        )
+        if self.verifier is not None:
+            self.verifier.forget(session_token)
+        return response["revoked"]
+
+    async def get_user_id(self, session_token: str) -> str:
+        """
+        Get the user ID associated with a session token, see `AuthClient.get_user_id`.
+
+        Raises
+        ------
+        HTTPException
+            If the token is invalid or the request fails.
+        """
+        if self.verifier is not None:
+            return await self._verify_locally(session_token)
+        response = await self._make_request(
+            "GET",
+            "/get-user-id",
+            params={"session_token": session_token},
+        )
+        return response["user_id"]
@@ -0,0 +1,221 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import httpx
+from fastapi import HTTPException
+
+from clients.database_client import DatabaseClient
+from utils.http_session import DEFAULT_TIMEOUT, AsyncHttpSession, SharedAsyncClient
+
+
+def drop_none(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Removes unset query parameters, httpx would send them as empty strings."""
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def raise_for_response(response: httpx.Response) -> None:
+    """
+    Raises an HTTPException with the status code and detail of a failed response.
+    """
+    if response.is_success:
+        return
+    try:
+        detail = response.json().get("detail", response.reason_phrase)
+    except ValueError:
+        detail = f"{response.status_code} {response.reason_phrase}"
+    raise HTTPException(status_code=response.status_code, detail=detail)
+
+
+class AsyncDatabaseClient:
+    """
+    An async client for the Database API, with the methods of `DatabaseClient`.
+
+    Requests are sent with an `httpx.AsyncClient`, so async FastAPI handlers can
+    await them without blocking the event loop.
+    """
+
+    def __init__(self,
+                 db_api_url: str = "http://localhost:7999",
+                 client: Optional[SharedAsyncClient] = None,
+                 pool_size: int = 10,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 retries: int = 3):
+        """
+        Initialize the AsyncDatabaseClient.
+
+        Parameters
+        ----------
+        db_api_url : str
+            The base URL of the database API service.
+        client : SharedAsyncClient, optional
+            Client shared with other async clients. If not given, an own client with
+            `pool_size` connections is created.
+        pool_size : int
+            Maximum number of connections of an own client.
+        timeout : float or Tuple[float, float]
+            Request timeout in seconds, or a (connect, read) tuple.
+        retries : int
+            Maximum number of retries, see `utils.http_session.AsyncHttpSession`.
+        """
+        self.db_api_url = db_api_url.rstrip("/")
+        self._session = AsyncHttpSession(self.db_api_url,
+                                         client=client,
+                                         pool_size=pool_size,
+                                         timeout=timeout,
+                                         retries=retries)
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
+        """
+        Generic method for making HTTP requests, see `DatabaseClient._make_request`.
+
+        Raises
+        ------
+        HTTPException
+            If the request fails.
+        """
+        if "params" in kwargs:
+            kwargs["params"] = drop_none(kwargs["params"])
+        try:
+            response = await self._session.request(method, endpoint, **kwargs)
+        except httpx.HTTPError as e:
+            # For connection errors, timeouts etc
+            raise HTTPException(status_code=500, detail=f"Database API request failed: {str(e)}")
+        raise_for_response(response)
+        return response.json()
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the database API per endpoint."""
+        return self._session.latency_stats()
+
+    async def aclose(self) -> None:
+        """Close the connections to the database API, unless the client is shared."""
+        await self._session.aclose()
+
+    async def health_check(self) -> dict:
+        """Check the health of the database service."""
+        return await self._make_request("GET", "/health")
+
+    async def execute_query(self, query: str, params: Optional[tuple] = None) -> dict:
+        """Execute a raw SQL query."""
+        return await self._make_request("POST", "/query", json={"query": query, "params": params})
+
+    async def insert(self,
+                     table: str,
+                     data: Dict[str, Any],
+                     returning: Optional[List[str]] = None) -> dict:
+        """Insert data into a table, `returning` columns of the new record are returned as data."""
+        return await self._make_request("POST",
+                                        "/insert",
+                                        json={
+                                            "table": table,
+                                            "data": data,
+                                            "returning": returning
+                                        })
+
+    async def bulk_insert(self,
+                          table: str,
+                          data: List[Dict[str, Any]],
+                          method: str = "values",
+                          page_size: int = 1000,
+                          on_conflict: Optional[str] = None,
+                          conflict_columns: Optional[List[str]] = None,
+                          returning: Optional[List[str]] = None) -> dict:
+        """Bulk insert multiple rows into a table, see `DatabaseService.bulk_insert`."""
+        return await self._make_request(
+            "POST",
+            "/bulk-insert",
+            json={
+                "table": table,
+                "data": data,
+                "method": method,
+                "page_size": page_size,
+                "on_conflict": on_conflict,
+                "conflict_columns": conflict_columns,
+                "returning": returning,
+            },
+        )
+
+    async def select(self,
+                     table: str,
+                     conditions: Optional[str] = None,
+                     fields: Optional[List[str]] = None,
+                     params: Optional[tuple] = None,
+                     filters: Optional[list] = None,
+                     order_by: Optional[List[str]] = None,
+                     limit: Optional[int] = None,
+                     offset: Optional[int] = None) -> dict:
+        """Select data from a table, see `DatabaseClient.select`."""
+        query_params = DatabaseClient._select_params(table, conditions, fields, params, filters,
+                                                     order_by, limit, offset)
+        return await self._make_request("GET", "/select", params=query_params)
+
+    async def iter_select(self,
+                          table: str,
+                          conditions: Optional[str] = None,
+                          fields: Optional[List[str]] = None,
+                          params: Optional[tuple] = None,
+                          filters: Optional[list] = None,
+                          order_by: Optional[List[str]] = None,
+                          limit: Optional[int] = None,
+                          offset: Optional[int] = None,
+                          batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the records of a select without loading the whole result, see
+        `DatabaseClient.iter_select`.
+        """
+        query_params = drop_none({
+            **DatabaseClient._select_params(table, conditions, fields, params, filters, order_by,
+                                            limit, offset),
+            "stream": "true",
+            "batch_size": batch_size,
+        })
+        try:
+            async with self._session.stream("GET", "/select", params=query_params) as response:
+                if not response.is_success:
+                    await response.aread()
+                    raise_for_response(response)
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=500, detail=f"Database API request failed: {str(e)}")
+
+    async def update(self,
+                     table: str,
+                     data: Dict[str, Any],
+                     conditions: Optional[str] = None,
+                     params: Optional[tuple] = None,
+                     filters: Optional[list] = None) -> dict:
+        """Update data in a table, `conditions`, `params` and `filters` as for `select`."""
+        return await self._make_request(
+            "PUT",
+            "/update",
+            json={
+                "table": table,
+                "data": data,
+                "conditions": conditions,
+                "params": list(params) if params else None,
+                "filters": filters,
+            },
+        )
+
+    async def delete(self,
+                     table: str,
+                     conditions: Optional[str] = None,
+                     params: Optional[tuple] = None,
+                     filters: Optional[list] = None) -> dict:
+        """Delete data from a table, `conditions`, `params` and `filters` as for `select`."""
+        return await self._make_request(
+            "DELETE",
+            "/delete",
+            params={
+                "table": table,
+                "conditions": conditions,
+                "params": DatabaseClient._encode_list(params),
+                "filters": DatabaseClient._encode_list(filters),
+            },
+        )
+
+    async def statement_cache_stats(self) -> dict:
+        """Prepared statement hit and miss counters of the database service."""
+        return await self._make_request("GET", "/statement-cache-stats")
@@ -0,0 +1,93 @@
+import httpx
+from fastapi import HTTPException
+from typing import Any, Dict, Optional, Tuple, Union
+from clients.async_database_client import drop_none, raise_for_response
+from clients.profile_client import PROFILE_TIMEOUT
+from utils.http_session import AsyncHttpSession, SharedAsyncClient
+
+
+class AsyncProfileClient:
+    """An async client for the Profile API, with the methods of `ProfileClient`."""
+
+    def __init__(
+        self,
+        profile_api_url: str = "http://localhost:8001",
+        client: Optional[SharedAsyncClient] = None,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = PROFILE_TIMEOUT,
+        retries: int = 3,
+    ):
+        self.profile_api_url = profile_api_url.rstrip("/")
+        self._session = AsyncHttpSession(self.profile_api_url,
+                                         client=client,
+                                         pool_size=pool_size,
+                                         timeout=timeout,
+                                         retries=retries)
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        **kwargs,
+    ) -> dict:
+        if "params" in kwargs:
+            kwargs["params"] = drop_none(kwargs["params"])
+        try:
+            response = await self._session.request(method, endpoint, **kwargs)
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=500, detail=f"Profile API request failed: {str(e)}")
+        raise_for_response(response)
+        return response.json()
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the profile API per endpoint."""
+        return self._session.latency_stats()
+
+    async def aclose(self) -> None:
+        """Close the connections to the profile API, unless the client is shared."""
+        await self._session.aclose()
+
+    async def health_check(self) -> dict:
+        """Check API health status."""
+        return await self._make_request("GET", "/health")
+
+    async def get_profile_photo(self, session_token: str) -> str:
+        """Get user's profile photo URL."""
+        response = await self._make_request(
+            "GET",
+            "/profile/photo",
+            params={"session_token": session_token},
+        )
+        return response["photo_url"]
+
+    async def get_profile_name(self, session_token: str) -> dict:
+        """Get user's name details."""
+        return await self._make_request(
+            "GET",
+            "/profile/name",
+            params={"session_token": session_token},
+        )
+
+    async def get_profile_address(self, session_token: str) -> dict:
+        """Get user's address details."""
+        return await self._make_request(
+            "GET",
+            "/profile/address",
+            params={"session_token": session_token},
+        )
+
+    async def download_profile_photo(
+        self,
+        session_token: str,
+        save_path: Optional[str] = None,
+    ) -> str:
+        """Download user's profile photo."""
+        response = await self._make_request(
+            "POST",
+            "/profile/photo/download",
+            params={
+                "session_token": session_token,
+                "save_path": save_path
+            },
+        )
+        return response["photo_path"]
@@ -1,6 +1,15 @@
+from typing import Any, Dict, Optional, Tuple, Union
+
+import jwt
 import requests
 from fastapi import HTTPException
 
+from utils.http_session import HttpSession
+from utils.token_verifier import TokenVerifier
+
+# authenticating with WG-Gesucht drives a browser, which takes a while
+AUTH_TIMEOUT = (3.05, 120.0)
+
 
 class AuthClient:
     """
@@ -9,7 +18,14 @@ class AuthClient:
     Provides methods similar to AuthService but communicates over HTTP.
     """
 
-    def __init__(self, auth_api_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        auth_api_url: str = "http://localhost:8000",
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = AUTH_TIMEOUT,
+        retries: int = 3,
+        verifier: Optional[TokenVerifier] = None,
+    ):
         """
         Initialize the AuthClient.
 
@@ -17,8 +33,23 @@ class AuthClient:
         ----------
         auth_api_url : str
             The base URL of the authentication API service.
+        pool_size : int
+            Maximum number of keep-alive connections to the authentication API.
+        timeout : float or Tuple[float, float]
+            Request timeout in seconds, or a (connect, read) tuple.
+        retries : int
+            Maximum number of retries, see `utils.http_session.HttpSession`.
+        verifier : TokenVerifier, optional
+            Verifies session tokens locally instead of asking the authentication
+            API every time. Defaults to `TokenVerifier.from_env()`, which is None
+            unless `JWT_VERIFY_LOCALLY` is set.
         """
         self.auth_api_url = auth_api_url.rstrip("/")
+        self._session = HttpSession(self.auth_api_url,
+                                    pool_size=pool_size,
+                                    timeout=timeout,
+                                    retries=retries)
+        self.verifier = TokenVerifier.from_env() if verifier is None else verifier
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
         """
@@ -43,9 +74,8 @@ class AuthClient:
         HTTPException
             If the request fails.
         """
-        url = f"{self.auth_api_url}{endpoint}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._session.request(method, endpoint, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.HTTPError as e:
@@ -63,6 +93,14 @@ class AuthClient:
             # For connection errors, timeouts, etc.
             raise HTTPException(status_code=500, detail=f"Auth API request failed: {str(e)}")
 
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the authentication API."""
+        return self._session.latency_stats()
+
+    def close(self) -> None:
+        """Close the pooled connections to the authentication API."""
+        self._session.close()
+
     def health_check(self) -> dict:
         """Check the health of the authentication service."""
         return self._make_request("GET", "/health")
@@ -87,8 +125,7 @@ class AuthClient:
             json={"api_key": api_key},
         )
 
-    def validate_session_token(self, session_token: str) -> bool:
-        """Validate a session token."""
+    def _validate_remotely(self, session_token: str) -> bool:
         response = self._make_request(
             "GET",
             "/validate-token",
@@ -96,6 +133,41 @@ class AuthClient:
         )
         return response.get("valid", False)
 
+    def _verify_locally(self, session_token: str) -> str:
+        """
+        Verify a session token with the local verifier and return its user ID.
+
+        The authentication API is only asked whether the session was revoked, when
+        the token is first seen and every `verifier.revalidate_after` seconds.
+
+        Raises
+        ------
+        HTTPException
+            If the token is invalid, expired or revoked.
+        """
+        try:
+            user_id, check_due = self.verifier.verify(session_token)
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid session token")
+        if check_due:
+            if not self._validate_remotely(session_token):
+                self.verifier.forget(session_token)
+                raise HTTPException(status_code=401, detail="Invalid session token")
+            self.verifier.confirm(session_token)
+        return user_id
+
+    def validate_session_token(self, session_token: str) -> bool:
+        """Validate a session token."""
+        if self.verifier is None:
+            return self._validate_remotely(session_token)
+        try:
+            self._verify_locally(session_token)
+            return True
+        except HTTPException as e:
+            if e.status_code != 401:
+                raise
+            return False
+
     def get_credentials(self, session_token: str) -> dict:
         """Retrieve stored user credentials."""
         return self._make_request(
@@ -115,10 +187,23 @@ class AuthClient:
             },
         )
 
+    def logout(self, session_token: str) -> bool:
+        """Revoke a session, returns False if it was revoked before."""
+        response = self._make_request(
+            "POST",
+            "/logout",
+            params={"session_token": session_token},
+        )
+        if self.verifier is not None:
+            self.verifier.forget(session_token)
+        return response["revoked"]
+
     def get_user_id(self, session_token: str) -> str:
         """
         Get the user ID associated with a session token.
 
+        With a `verifier`, the token is verified locally, see `_verify_locally`.
+
         Parameters
         ----------
         session_token : str
@@ -134,6 +219,8 @@ class AuthClient:
         HTTPException
             If the token is invalid or the request fails.
         """
+        if self.verifier is not None:
+            return self._verify_locally(session_token)
         response = self._make_request(
             "GET",
             "/get-user-id",
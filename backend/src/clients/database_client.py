@@ -1,6 +1,8 @@
+import json
 import requests
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterator, List, Any, Sequence, Tuple, Union
 from fastapi import HTTPException
+from utils.http_session import DEFAULT_TIMEOUT, HttpSession
 
 
 class DatabaseClient:
@@ -10,7 +12,11 @@ class DatabaseClient:
     Provides methods similar to DatabaseService but communicates over HTTP.
     """
 
-    def __init__(self, db_api_url: str = "http://localhost:7999"):
+    def __init__(self,
+                 db_api_url: str = "http://localhost:7999",
+                 pool_size: int = 10,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 retries: int = 3):
         """
         Initialize the DatabaseClient.
 
@@ -18,8 +24,18 @@ class DatabaseClient:
         ----------
         db_api_url : str
             The base URL of the database API service.
+        pool_size : int
+            Maximum number of keep-alive connections to the database API.
+        timeout : float or Tuple[float, float]
+            Request timeout in seconds, or a (connect, read) tuple.
+        retries : int
+            Maximum number of retries, see `utils.http_session.HttpSession`.
         """
         self.db_api_url = db_api_url.rstrip("/")
+        self._session = HttpSession(self.db_api_url,
+                                    pool_size=pool_size,
+                                    timeout=timeout,
+                                    retries=retries)
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
         """
@@ -37,7 +53,7 @@ class DatabaseClient:
         Returns
         -------
         dict
-            The JSON response.
+            The JSON response, or the `requests.Response` itself for `stream=True`.
 
         Raises
         ------
@@ -45,11 +61,10 @@ class DatabaseClient:
             If the request fails.
         """
 
-        url = f"{self.db_api_url}{endpoint}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._session.request(method, endpoint, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return response if kwargs.get("stream") else response.json()
         except requests.HTTPError as e:
             # Preserve the original error status code and parse error message from API
             try:
@@ -63,6 +78,14 @@ class DatabaseClient:
             # For connection errors, timeouts etc
             raise HTTPException(status_code=500, detail=f"Database API request failed: {str(e)}")
 
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the database API per endpoint."""
+        return self._session.latency_stats()
+
+    def close(self) -> None:
+        """Close the pooled connections to the database API."""
+        self._session.close()
+
     def health_check(self) -> dict:
         """Check the health of the database service."""
         return self._make_request("GET", "/health")
@@ -71,45 +94,156 @@ class DatabaseClient:
         """Execute a raw SQL query."""
         return self._make_request("POST", "/query", json={"query": query, "params": params})
 
-    def insert(self, table: str, data: Dict[str, Any]) -> dict:
-        """Insert data into a table."""
-        return self._make_request("POST", "/insert", json={"table": table, "data": data})
+    def insert(self,
+               table: str,
+               data: Dict[str, Any],
+               returning: Optional[List[str]] = None) -> dict:
+        """Insert data into a table, `returning` columns of the new record are returned as data."""
+        return self._make_request("POST",
+                                  "/insert",
+                                  json={
+                                      "table": table,
+                                      "data": data,
+                                      "returning": returning
+                                  })
+
+    def bulk_insert(self,
+                    table: str,
+                    data: List[Dict[str, Any]],
+                    method: str = "values",
+                    page_size: int = 1000,
+                    on_conflict: Optional[str] = None,
+                    conflict_columns: Optional[List[str]] = None,
+                    returning: Optional[List[str]] = None) -> dict:
+        """Bulk insert multiple rows into a table, see `DatabaseService.bulk_insert`."""
+        return self._make_request(
+            "POST",
+            "/bulk-insert",
+            json={
+                "table": table,
+                "data": data,
+                "method": method,
+                "page_size": page_size,
+                "on_conflict": on_conflict,
+                "conflict_columns": conflict_columns,
+                "returning": returning,
+            },
+        )
 
-    def bulk_insert(self, table: str, data: List[Dict[str, Any]]) -> dict:
-        """Bulk insert multiple rows into a table."""
-        return self._make_request("POST", "/bulk-insert", json={"table": table, "data": data})
+    @staticmethod
+    def _encode_list(values: Optional[Sequence]) -> Optional[str]:
+        """Encodes condition parameters or filters for a query string."""
+        return json.dumps(list(values), default=str) if values else None
+
+    @staticmethod
+    def _select_params(table: str, conditions: Optional[str], fields: Optional[List[str]],
+                       params: Optional[tuple], filters: Optional[list],
+                       order_by: Optional[List[str]], limit: Optional[int],
+                       offset: Optional[int]) -> dict:
+        """Query string of a `/select` request."""
+        return {
+            "table": table,
+            "conditions": conditions,
+            "fields": ",".join(fields) if fields else None,
+            "params": DatabaseClient._encode_list(params),
+            "filters": DatabaseClient._encode_list(filters),
+            "order_by": ",".join(order_by) if order_by else None,
+            "limit": limit,
+            "offset": offset,
+        }
 
     def select(self,
                table: str,
                conditions: Optional[str] = None,
-               fields: Optional[List[str]] = None) -> dict:
-        """Select data from a table."""
-        params = {
-            "table": table,
-            "conditions": conditions,
-            "fields": ",".join(fields) if fields else None
-        }
-        return self._make_request("GET", "/select", params=params)
+               fields: Optional[List[str]] = None,
+               params: Optional[tuple] = None,
+               filters: Optional[list] = None,
+               order_by: Optional[List[str]] = None,
+               limit: Optional[int] = None,
+               offset: Optional[int] = None) -> dict:
+        """
+        Select data from a table, see `DatabaseService.select`.
+
+        Prefer a structured filter like `filters=[["user_id", "=", user_id]]` over
+        `conditions`, `params` are the values of `%s` in `conditions`.
+        """
+        query_params = self._select_params(table, conditions, fields, params, filters, order_by,
+                                           limit, offset)
+        return self._make_request("GET", "/select", params=query_params)
+
+    def iter_select(self,
+                    table: str,
+                    conditions: Optional[str] = None,
+                    fields: Optional[List[str]] = None,
+                    params: Optional[tuple] = None,
+                    filters: Optional[list] = None,
+                    order_by: Optional[List[str]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the records of a select without loading the whole result.
 
-    def update(self, table: str, data: Dict[str, Any], conditions: str) -> dict:
-        """Update data in a table."""
+        The API streams the records as NDJSON, which is parsed line by line, so memory
+        stays flat regardless of the result size. Arguments as for `select`.
+
+        Yields
+        ------
+        Dict[str, Any]
+            The records.
+        """
+        query_params = {
+            **self._select_params(table, conditions, fields, params, filters, order_by, limit,
+                                  offset),
+            "stream": "true",
+            "batch_size": batch_size,
+        }
+        response = self._make_request("GET", "/select", params=query_params, stream=True)
+        with response:
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+            except requests.RequestException as e:
+                raise HTTPException(status_code=500,
+                                    detail=f"Database API request failed: {str(e)}")
+
+    def update(self,
+               table: str,
+               data: Dict[str, Any],
+               conditions: Optional[str] = None,
+               params: Optional[tuple] = None,
+               filters: Optional[list] = None) -> dict:
+        """Update data in a table, `conditions`, `params` and `filters` as for `select`."""
         return self._make_request(
             "PUT",
             "/update",
             json={
                 "table": table,
                 "data": data,
-                "conditions": conditions
+                "conditions": conditions,
+                "params": list(params) if params else None,
+                "filters": filters,
             },
         )
 
-    def delete(self, table: str, conditions: str) -> dict:
-        """Delete data from a table."""
+    def delete(self,
+               table: str,
+               conditions: Optional[str] = None,
+               params: Optional[tuple] = None,
+               filters: Optional[list] = None) -> dict:
+        """Delete data from a table, `conditions`, `params` and `filters` as for `select`."""
         return self._make_request(
             "DELETE",
             "/delete",
             params={
                 "table": table,
-                "conditions": conditions
+                "conditions": conditions,
+                "params": self._encode_list(params),
+                "filters": self._encode_list(filters),
             },
         )
+
+    def statement_cache_stats(self) -> dict:
+        """Prepared statement hit and miss counters of the database service."""
+        return self._make_request("GET", "/statement-cache-stats")
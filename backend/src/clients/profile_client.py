@@ -1,12 +1,26 @@
 import requests
 from fastapi import HTTPException
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple, Union
+from utils.http_session import HttpSession
+
+# profile data is scraped with a browser, which takes a while
+PROFILE_TIMEOUT = (3.05, 120.0)
 
 
 class ProfileClient:
 
-    def __init__(self, profile_api_url: str = "http://localhost:8001"):
+    def __init__(
+        self,
+        profile_api_url: str = "http://localhost:8001",
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = PROFILE_TIMEOUT,
+        retries: int = 3,
+    ):
         self.profile_api_url = profile_api_url.rstrip("/")
+        self._session = HttpSession(self.profile_api_url,
+                                    pool_size=pool_size,
+                                    timeout=timeout,
+                                    retries=retries)
 
     def _make_request(
         self,
@@ -14,9 +28,8 @@ class ProfileClient:
         endpoint: str,
         **kwargs,
     ) -> dict:
-        url = f"{self.profile_api_url}{endpoint}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._session.request(method, endpoint, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.HTTPError as e:
@@ -31,6 +44,14 @@ class ProfileClient:
         except requests.RequestException as e:
             raise HTTPException(status_code=500, detail=f"Profile API request failed: {str(e)}")
 
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms of the requests to the profile API per endpoint."""
+        return self._session.latency_stats()
+
+    def close(self) -> None:
+        """Close the pooled connections to the profile API."""
+        self._session.close()
+
     def health_check(self) -> dict:
         """Check API health status."""
         return self._make_request("GET", "/health")
@@ -0,0 +1,114 @@
+"""Persistent index of listings that have already been contacted.
+
+The bot identifies a contacted listing by the user name and address of the listing, so
+that re-uploads of the same offer are recognised as well. Identifiers are stored in a
+small SQLite database and mirrored in an in-memory set, which is loaded once on start
+up and then updated incrementally, so each lookup is O(1) and each new entry costs a
+single insert.
+
+Examples
+--------
+>>> store = ContactedStore("contacted_listings.sqlite3")
+>>> store.import_legacy_file("past_listings.txt")
+>>> identifier = ContactedStore.identifier("John Doe", "Mitte, Berlin")
+>>> identifier in store
+False
+>>> store.add(identifier, listing_id=123)
+>>> identifier in store
+True
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+
+class ContactedStore:
+    """SQLite backed set of already contacted listings.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the SQLite database file, created if it does not exist
+    """
+
+    def __init__(self, db_path: str = "contacted_listings.sqlite3"):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS contacted_listings (
+                identifier TEXT PRIMARY KEY,
+                listing_id INTEGER,
+                contacted_at TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+        self._identifiers = {
+            row[0] for row in self._conn.execute("SELECT identifier FROM contacted_listings")
+        }
+
+    @staticmethod
+    def identifier(user_name: str, address: str) -> str:
+        """Build the identifier under which a listing is stored."""
+        return f"{user_name}: {address}"
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self._identifiers
+
+    def __len__(self) -> int:
+        return len(self._identifiers)
+
+    def add(self, identifier: str, listing_id: Optional[int] = None) -> None:
+        """Mark a listing as contacted.
+
+        Parameters
+        ----------
+        identifier : str
+            Identifier of the listing, see `ContactedStore.identifier`
+        listing_id : int, optional
+            Numeric ad id of the listing
+        """
+        if identifier in self._identifiers:
+            return
+        self._conn.execute(
+            "INSERT OR IGNORE INTO contacted_listings VALUES (?, ?, ?)",
+            (identifier, listing_id, datetime.now().isoformat()),
+        )
+        self._conn.commit()
+        self._identifiers.add(identifier)
+
+    def import_legacy_file(self, file_name: str = "past_listings.txt") -> int:
+        """Import the identifiers of a legacy `past_listings.txt` file.
+
+        The file is renamed to `<file_name>.imported` afterwards, so the import only
+        happens once.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the legacy file with one identifier per line
+
+        Returns
+        -------
+        int
+            Number of newly imported identifiers
+        """
+        if not os.path.exists(file_name):
+            return 0
+
+        with open(file_name, "r") as msgs:
+            identifiers = {line.rstrip("\n") for line in msgs if line.strip()}
+        new_identifiers = identifiers - self._identifiers
+        contacted_at = datetime.now().isoformat()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO contacted_listings VALUES (?, NULL, ?)",
+            [(identifier, contacted_at) for identifier in new_identifiers],
+        )
+        self._conn.commit()
+        self._identifiers |= new_identifiers
+
+        os.replace(file_name, f"{file_name}.imported")
+        return len(new_identifiers)
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,149 @@
+"""Concurrent prefetching of WG-Gesucht.de listing detail pages.
+
+When a poll finds several new listings, their detail pages are downloaded in the
+background over a shared connection pool while the bot is still filtering them. Only
+the pages of listings that are actually contacted have to be waited on.
+
+Requests to the same host are rate limited and failed requests are retried with
+exponential backoff.
+
+Examples
+--------
+>>> fetcher = DetailFetcher(max_workers=4, requests_per_second=2)
+>>> fetcher.prefetch(["/wg-zimmer-in-Berlin-Mitte.123.html", "/wg-zimmer-in-Berlin-Wedding.456.html"])
+>>> html = fetcher.get("/wg-zimmer-in-Berlin-Mitte.123.html")
+>>> fetcher.discard()
+>>> fetcher.close()
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_for_futures
+from typing import Dict, Iterable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from listing import URL_BASE
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class _HostRateLimiter:
+    """Spaces out requests to each host by a minimum interval."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DetailFetcher:
+    """Downloads listing detail pages with bounded concurrency.
+
+    Parameters
+    ----------
+    max_workers : int
+        Maximum number of pages downloaded at the same time.
+    requests_per_second : float
+        Maximum request rate per host, 0 disables rate limiting.
+    retries : int
+        Number of retries after a failed request.
+    backoff : float
+        Initial delay in seconds between retries, doubled after every attempt.
+    timeout : float
+        Timeout in seconds for a single request.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        requests_per_second: float = 2,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._rate_limiter = _HostRateLimiter(requests_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="detail-fetcher")
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._pending: Dict[str, Future] = {}
+
+    def _fetch(self, ref: str) -> str:
+        """Download a single detail page, retrying on errors.
+
+        Raises
+        ------
+        requests.RequestException
+            If the last attempt failed
+        """
+        url = URL_BASE + ref
+        host = urlparse(url).netloc
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            self._rate_limiter.wait(host)
+            try:
+                response = self._session.get(url, timeout=self.timeout)
+            except requests.RequestException:
+                # connection errors, timeouts etc
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.text
+            time.sleep(delay)
+            delay *= 2
+
+    def prefetch(self, refs: Iterable[str]) -> None:
+        """Start downloading the detail pages of the given listings in the background."""
+        for ref in refs:
+            if ref not in self._pending:
+                self._pending[ref] = self._executor.submit(self._fetch, ref)
+
+    def get(self, ref: str) -> str:
+        """Return the HTML of a detail page, waiting for it if it is still downloading.
+
+        Pages that were not prefetched are downloaded right away.
+
+        Raises
+        ------
+        requests.RequestException
+            If the page could not be downloaded
+        """
+        future = self._pending.pop(ref, None)
+        if future is None:
+            return self._fetch(ref)
+        return future.result()
+
+    def wait(self) -> None:
+        """Wait until all prefetched pages that were not requested yet are downloaded.
+
+        Failed downloads are not raised here, but by `get`.
+        """
+        wait_for_futures(list(self._pending.values()))
+
+    def discard(self) -> None:
+        """Drop all prefetched pages that were not requested, e.g. after a poll."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+
+    def close(self) -> None:
+        self.discard()
+        self._executor.shutdown(wait=True)
+        self._session.close()
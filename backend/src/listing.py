@@ -0,0 +1,134 @@
+"""Compact, immutable representation of a single WG-Gesucht.de listing.
+
+A `Listing` is identified by the numeric ad id contained in its reference URL, so two
+listings compare equal and hash the same whenever they point to the same ad. This makes
+it cheap to diff the listings of two consecutive polls using sets.
+
+Examples
+--------
+>>> listing = Listing.from_ref(
+>>>     "/wg-zimmer-in-Berlin-Mitte.123.html",
+>>>     user_name="John Doe",
+>>>     address="Mitte, Berlin",
+>>>     wg_type="2er WG",
+>>>     rental_length_months=3,
+>>>     rental_start=datetime(2024, 5, 1),
+>>>     verified_business=False,
+>>> )
+>>> listing.listing_id
+123
+>>> listing.to_row(search_config_id=1)
+{'listing_id': '123', 'listing_url': 'https://www.wg-gesucht.de/wg-zimmer-in-Berlin-Mitte.123.html', ...}
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+URL_BASE = "https://www.wg-gesucht.de"
+
+_AD_ID_PATTERN = re.compile(r"\.(\d+)\.html")
+
+
+@dataclass(frozen=True, eq=False)
+class Listing:
+    """A listing as shown on a WG-Gesucht.de search page.
+
+    Equality and hashing only consider `listing_id`.
+    """
+    __slots__ = (
+        "listing_id",
+        "ref",
+        "user_name",
+        "address",
+        "wg_type",
+        "rental_length_months",
+        "rental_start",
+        "verified_business",
+    )
+    listing_id: int
+    ref: str
+    user_name: str
+    address: str
+    wg_type: str
+    rental_length_months: int
+    rental_start: datetime
+    verified_business: bool
+
+    def __eq__(self, other):
+        if not isinstance(other, Listing):
+            return NotImplemented
+        return self.listing_id == other.listing_id
+
+    def __hash__(self):
+        return hash(self.listing_id)
+
+    @staticmethod
+    def parse_id(ref: str) -> Optional[int]:
+        """Extract the numeric ad id from a listing reference URL.
+
+        Parameters
+        ----------
+        ref : str
+            Relative listing URL, e.g. "/wg-zimmer-in-Berlin-Mitte.123.html"
+
+        Returns
+        -------
+        Optional[int]
+            The ad id, or None if the reference does not contain one
+        """
+        match = _AD_ID_PATTERN.search(ref)
+        return int(match.group(1)) if match else None
+
+    @classmethod
+    def from_ref(cls, ref: str, **fields) -> "Listing":
+        """Create a listing, deriving its id from the reference URL.
+
+        Raises
+        ------
+        ValueError
+            If no ad id can be parsed from `ref`
+        """
+        listing_id = cls.parse_id(ref)
+        if listing_id is None:
+            raise ValueError(f"Could not parse ad id from {ref}")
+        return cls(listing_id=listing_id, ref=ref, **fields)
+
+    @property
+    def url(self) -> str:
+        """Absolute URL of the listing."""
+        return URL_BASE + self.ref
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the listing in the dictionary format of `ListingGetter.all_infos`."""
+        return {
+            "ref": self.ref,
+            "user_name": self.user_name,
+            "address": self.address,
+            "wg_type": self.wg_type,
+            "rental_length_months": self.rental_length_months,
+            "rental_start": self.rental_start,
+        }
+
+    def to_row(self, search_config_id: Optional[int] = None) -> Dict[str, Any]:
+        """Map the listing onto the columns of the `individual_listings` table.
+
+        Parameters
+        ----------
+        search_config_id : int, optional
+            Id of the search configuration that found the listing
+
+        Returns
+        -------
+        Dict[str, Any]
+            Column-value pairs ready to be passed to `DatabaseClient.insert`
+        """
+        row = {
+            "listing_id": str(self.listing_id),
+            "listing_url": self.url,
+            "location": self.address,
+            "rental_start_date": self.rental_start.date().isoformat(),
+        }
+        if search_config_id is not None:
+            row["search_config_id"] = search_config_id
+        return row
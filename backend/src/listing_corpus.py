@@ -0,0 +1,163 @@
+"""Append-only corpus of listing texts stored as JSON lines.
+
+Every saved listing text is one JSON object on its own line, so saving a text only
+appends a line to the active file instead of rewriting the whole corpus. Optionally,
+the active file is rolled over into gzip compressed segments once it holds a given
+number of records. Reading the corpus streams the records segment by segment.
+
+A roll-over first renames the active file to `<stem>.<number>.jsonl.pending` and
+only removes that snapshot once the segment is complete. A roll-over interrupted by
+a crash is finished when the corpus is opened again, without duplicating records.
+
+Examples
+--------
+>>> corpus = ListingCorpus("listing_texts.jsonl", segment_size=1000)
+>>> corpus.append("Bright room in the heart of Berlin...", ref="/wg-zimmer-in-Berlin.123.html")
+>>> for text in corpus.texts():
+>>>     print(text)
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ListingCorpus:
+    """Append-only, line-delimited JSON store for listing texts.
+
+    Parameters
+    ----------
+    path : str
+        Path of the active JSONL file. Compressed segments are stored next to it as
+        `<stem>.<number>.jsonl.gz`.
+    segment_size : int, optional
+        Number of records after which the active file is compressed into a new
+        segment. If not given, all records stay in the active file.
+    """
+
+    def __init__(self, path: str = "listing_texts.jsonl", segment_size: Optional[int] = None):
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self._active_records = None
+        self._finish_roll_overs()
+        if segment_size is not None:
+            self._active_records = self._count_lines(self.path)
+
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        if not path.exists():
+            return 0
+        with path.open("rb") as f:
+            return sum(1 for _ in f)
+
+    @property
+    def _stem(self) -> str:
+        name = self.path.name
+        return name[:-len(".jsonl")] if name.endswith(".jsonl") else name
+
+    def _segment_paths(self) -> List[Path]:
+        """Compressed segments in the order they were written."""
+        return sorted(self.path.parent.glob(f"{self._stem}.[0-9]*.jsonl.gz"))
+
+    def _roll_over(self) -> None:
+        """Compress the active file into the next segment and start a new one."""
+        self._finish_roll_overs()
+        segments = self._segment_paths()
+        number = int(segments[-1].name.split(".")[-3]) + 1 if segments else 1
+        pending_path = self.path.with_name(f"{self._stem}.{number:06d}.jsonl.pending")
+
+        os.replace(self.path, pending_path)
+        self._active_records = 0
+        self._compress(pending_path)
+
+    def _compress(self, pending_path: Path) -> None:
+        """Write the segment of a renamed active file, then remove the file.
+
+        A segment that already exists was completed before a crash, it is not
+        written again.
+        """
+        segment_path = pending_path.with_name(pending_path.name[:-len(".pending")] + ".gz")
+        if not segment_path.exists():
+            tmp_path = segment_path.with_name(segment_path.name + ".tmp")
+            with pending_path.open("rb") as src, gzip.open(tmp_path, "wb") as dst:
+                dst.writelines(src)
+            os.replace(tmp_path, segment_path)
+        pending_path.unlink()
+
+    def _finish_roll_overs(self) -> None:
+        """Complete roll-overs that were interrupted, e.g. by a crash."""
+        for pending_path in sorted(
+                self.path.parent.glob(f"{self._stem}.[0-9]*.jsonl.pending")):
+            self._compress(pending_path)
+
+    def append(self, text: str, **metadata: Any) -> None:
+        """Append a listing text to the corpus.
+
+        Parameters
+        ----------
+        text : str
+            The listing text to be saved
+        **metadata
+            Additional JSON serialisable fields stored with the text, e.g. `ref`
+        """
+        record = {"text": text, "saved_at": datetime.now().isoformat(), **metadata}
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if self.segment_size is not None:
+            self._active_records += 1
+            if self._active_records >= self.segment_size:
+                self._roll_over()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stream all records, oldest first."""
+        for segment_path in self._segment_paths():
+            with gzip.open(segment_path, "rt", encoding="utf-8") as f:
+                yield from self._read_records(f)
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                yield from self._read_records(f)
+
+    @staticmethod
+    def _read_records(lines) -> Iterator[Dict[str, Any]]:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+    def texts(self) -> Iterator[str]:
+        """Stream only the listing texts, oldest first."""
+        for record in self:
+            yield record["text"]
+
+    def import_legacy_json(self, file_name: str = "listing_texts.json") -> int:
+        """Import texts from the legacy `{"texts": [...]}` JSON file.
+
+        The file is first renamed to `<file_name>.importing` and to
+        `<file_name>.imported` once all texts are appended, so the import only happens
+        once. Imported records are tagged with `imported_from` and `import_index`, an
+        import interrupted by a crash resumes after the last appended text.
+
+        Returns
+        -------
+        int
+            Number of texts imported by this call
+        """
+        importing_name = f"{file_name}.importing"
+        source = os.path.basename(file_name)
+        if os.path.exists(importing_name):
+            start = sum(1 for record in self if record.get("imported_from") == source)
+        elif os.path.exists(file_name):
+            os.replace(file_name, importing_name)
+            start = 0
+        else:
+            return 0
+
+        with open(importing_name, "r") as f:
+            texts = json.load(f).get("texts", [])
+        for index in range(start, len(texts)):
+            self.append(texts[index], imported_from=source, import_index=index)
+
+        os.replace(importing_name, f"{file_name}.imported")
+        return len(texts) - start
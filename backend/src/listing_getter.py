@@ -4,11 +4,18 @@ This module provides functionality to scrape WG-Gesucht.de listings and extract
 structured information about each rental listing, including references, usernames,
 addresses, rental periods, and verification status.
 
+Search result pages are first downloaded over a pooled HTTP session, which is much
+cheaper than rendering them in Chromium. Only if the expected listing elements are
+missing from the plain HTML, the page is rendered with Playwright instead.
+
 Examples
 --------
 >>> url = "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html"
 >>> listings_getter = ListingGetter(url)
->>> info_dict = listings_getter.get_all_infos()
+>>> listings = listings_getter.all_listings
+>>> # Example output:
+>>> [Listing(listing_id=123, ref='/wg-zimmer-in-Berlin-Mitte.123.html', ...)]
+>>> info_dict = listings_getter.all_infos
 >>> # Example output:
 >>> {0: {
 >>>     'ref': '/wg-zimmer-in-Berlin-Mitte.123.html',
@@ -22,10 +29,27 @@ Examples
 import pprint
 import re
 from datetime import datetime
-from typing import List
+from functools import cached_property
+from typing import Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+
+from listing import Listing
+from utils.page_pool import PagePool, get_page_pool
+
+FETCH_MODES = ("auto", "http", "browser")
+
+# shared across all ListingGetter instances so polls reuse open connections
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_http_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+# only build the subtrees of the listing elements when parsing a search page
+_LISTING_STRAINER = SoupStrainer("div", id=re.compile(r"^liste-details-ad-\d+"))
+_DATE_CLASSES = ["col-xs-5", "text-center"]
+_VERIFIED_CLASSES = ["campaign_click", "label_verified", "ml5"]
 
 
 class ListingGetter:
@@ -33,22 +57,100 @@ class ListingGetter:
 
     Uses Playwright to fetch dynamic content and BeautifulSoup to parse the HTML structure
     of WG-Gesucht.de listings, extracting relevant information about each rental offering.
+    Pages are borrowed from a long-lived `PagePool`, so no browser is launched per search.
     
     Parameters
     ----------
     url : str
         The complete WG-Gesucht.de search URL with all desired filters applied
+    page_pool : PagePool, optional
+        Pool to borrow the browser page from. Defaults to the process wide pool.
+    fetch_mode : str
+        "auto" tries a plain HTTP request first and falls back to the browser if no
+        listings are found, "http" only uses HTTP and "browser" only uses Playwright.
+    timeout : float
+        Timeout in seconds for the HTTP request.
     """
-    def __init__(self, url):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+    def __init__(
+        self,
+        url,
+        page_pool: Optional[PagePool] = None,
+        fetch_mode: str = "auto",
+        timeout: float = 10,
+    ):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode {fetch_mode}, expected one of {FETCH_MODES}")
+
+        self.listings = []
+        self.fetched_via = None
+        if fetch_mode != "browser":
+            try:
+                self.listings = self._find_listings(self._fetch_http(url, timeout))
+                self.fetched_via = "http"
+            except requests.RequestException:
+                if fetch_mode == "http":
+                    raise
+
+        # listings are missing from the plain HTML -> let the browser render the page
+        if not self.listings and fetch_mode != "http":
+            self.listings = self._find_listings(self._fetch_browser(url, page_pool))
+            self.fetched_via = "browser"
+
+    @staticmethod
+    def _fetch_http(url: str, timeout: float) -> str:
+        """Download the search page over the shared HTTP session.
+
+        Raises
+        ------
+        requests.RequestException
+            If the request fails or returns an error status code
+        """
+        response = _http_session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def _fetch_browser(url: str, page_pool: Optional[PagePool]) -> str:
+        """Render the search page with Playwright and return the main column."""
+        page_pool = page_pool or get_page_pool()
+        with page_pool.page() as page:
             page.goto(url, timeout=0)  # millisecond timeout
-            html = page.inner_html("#main_column")
+            return page.inner_html("#main_column")
+
+    @staticmethod
+    def _find_listings(html: str) -> list:
+        """Find all listing elements by looking for 'liste-details-ad-#####'."""
+        soup = BeautifulSoup(html, "lxml", parse_only=_LISTING_STRAINER)
+        return soup.find_all("div", id=re.compile(r"^liste-details-ad-\d+"))
+
+    @cached_property
+    def records(self) -> Dict[int, Listing]:
+        """Parse every listing element in a single pass.
+
+        Returns
+        -------
+        Dict[int, Listing]
+            Parsed listings keyed by their position on the search page. Listings
+            that could not be parsed are left out.
+        """
+        records = {}
+        for i, listing in enumerate(self.listings):
+            record = self._parse_listing(listing)
+            if record is not None:
+                records[i] = record
+        return records
 
-        soup = BeautifulSoup(html, "lxml")
-        # get all listing elements by looking for 'liste-details-ad-#####'
-        self.listings = soup.find_all("div", id=re.compile("^liste-details-ad-\d+"))
+    @property
+    def all_listings(self) -> List[Listing]:
+        """Listings worth contacting, in the order they appear on the search page.
+
+        Returns
+        -------
+        List[Listing]
+            All parsed listings except promoted offers from letting agencies and
+            sponsored offers from verified businesses
+        """
+        return [listing for _, listing in self._contactable()]
 
     @property
     def all_infos(self):
@@ -60,72 +162,18 @@ class ListingGetter:
             Dictionary where keys are listing indices and values are dictionaries
             containing listing details (ref, user_name, address, wg_type,
             rental_length_months, rental_start)
-
-        Raises
-        ------
-        ValueError
-            If the extracted listing information lists have inconsistent lengths
         """
-        info_dict = {}
-        refs = self.reference_urls
-        user_names = self.user_names
-        addresses, wg_types = self.rental_infos
-        rental_lengths_months = self.rental_durations
-        rental_starts = self.rental_start_dates
-        is_verifiziertes_unternehmen = self.check_verified_business()
-
-        # ensure all list are the same length
-        lists = [
-            refs,
-            user_names,
-            addresses,
-            wg_types,
-            rental_lengths_months,
-            rental_starts,
-        ]
-        it = iter(lists)
-        the_len = len(next(it))
-        if not all(len(l) == the_len for l in it):
-            raise ValueError("Not all lists have the same length!")
-
-        # write dict for all listings
-        for i, (
-            ref,
-            user_name,
-            address,
-            wg_type,
-            rental_length_months,
-            rental_start,
-            verifiziertes_unternehmen,
-        ) in enumerate(
-            zip(
-                refs,
-                user_names,
-                addresses,
-                wg_types,
-                rental_lengths_months,
-                rental_starts,
-                is_verifiziertes_unternehmen,
-            )
-        ):
+        return {i: listing.to_dict() for i, listing in self._contactable()}
+
+    def _contactable(self):
+        for i, listing in self.records.items():
             # skip promotes offers from letting agencies
-            if "\n" in user_name:
+            if "\n" in listing.user_name:
                 continue
             # skip sponsored offers
-            if verifiziertes_unternehmen:
+            if listing.verified_business:
                 continue
-
-            listing_dict = {
-                "ref": ref,
-                "user_name": user_name,
-                "address": address,
-                "wg_type": wg_type,
-                "rental_length_months": rental_length_months,
-                "rental_start": rental_start,
-            }
-
-            info_dict[i] = listing_dict
-        return info_dict
+            yield i, listing
 
     @property
     def reference_urls(self):
@@ -136,11 +184,7 @@ class ListingGetter:
         List[str]
             List of strings containing the relative URLs for each listing
         """
-        refs = list()
-        for listing in self.listings:
-            element = listing.find("a", href=True)
-            refs.append(element["href"])
-        return refs
+        return [record.ref for record in self.records.values()]
 
     @property
     def user_names(self):
@@ -151,11 +195,7 @@ class ListingGetter:
         List[str]
             List of strings containing the usernames for each listing
         """
-        users = list()
-        for listing in self.listings:
-            element = listing.find("span", {"class": "ml5"})
-            users.append(element.getText())
-        return users
+        return [record.user_name for record in self.records.values()]
 
     @property
     def rental_infos(self):
@@ -167,16 +207,8 @@ class ListingGetter:
             First list contains address strings (formatted as "district, city")
             Second list contains WG type strings (e.g., "2er WG")
         """
-        address = list()
-        wg_type = list()
-        for listing in self.listings:
-            element = listing.find("div", {"class": "col-xs-11"})
-            text = element.find("span").getText()
-            parts = [
-                part.strip() for part in re.split("\||\n", text) if part.strip() != ""
-            ]
-            wg_type.append(parts[0])
-            address.append(", ".join(parts[::-1][:-1]))
+        address = [record.address for record in self.records.values()]
+        wg_type = [record.wg_type for record in self.records.values()]
         return address, wg_type
 
     @property
@@ -189,17 +221,7 @@ class ListingGetter:
             List of integers representing rental duration in months
             -1 indicates unlimited duration ("unbefristet")
         """
-        rental_length_months = list()
-        for listing in self.listings:
-            element = listing.find("div", {"class": "col-xs-5 text-center"})
-            text = element.getText()
-            start_end = [
-                part.strip() for part in re.split("-|\n", text) if part.strip() != ""
-            ]
-            rental_length_months.append(
-                self._compute_range_length("-".join(start_end))
-            )
-        return rental_length_months
+        return [record.rental_length_months for record in self.records.values()]
 
     @property
     def rental_start_dates(self):
@@ -210,15 +232,7 @@ class ListingGetter:
         List[datetime]
             List of datetime objects representing the start date of each rental
         """
-        rental_starts = list()
-        for listing in self.listings:
-            element = listing.find("div", {"class": "col-xs-5 text-center"})
-            text = element.getText()
-            start_end = [
-                part.strip() for part in re.split("-|\n", text) if part.strip() != ""
-            ]
-            rental_starts.append(self._convert_to_datetime(start_end[0]))
-        return rental_starts
+        return [record.rental_start for record in self.records.values()]
 
     def check_verified_business(self) -> List[int]:
         """Check if listings are from verified businesses.
@@ -229,16 +243,74 @@ class ListingGetter:
             List of integers (0 or 1) indicating whether each listing is from 
             a verified business (1) or not (0)
         """
-        is_verifiziertes_unternehmen = list()
-        for listing in self.listings:
-            status = 0
-            element = listing.find("a", {"class": "campaign_click label_verified ml5"})
-            if element:
-                text = element.text.lower()
-                if "unternehmen" in text:
-                    status = 1
-            is_verifiziertes_unternehmen.append(status)
-        return is_verifiziertes_unternehmen
+        return [int(record.verified_business) for record in self.records.values()]
+
+    @classmethod
+    def _parse_listing(cls, listing) -> Optional[Listing]:
+        """Extract all information from a single listing element.
+
+        Parameters
+        ----------
+        listing : bs4.element.Tag
+            The 'liste-details-ad-#####' div of the listing
+
+        Returns
+        -------
+        Optional[Listing]
+            The parsed listing, or None if the listing is malformed
+        """
+        # walk the listing once and remember the first element of every kind we need,
+        # repeated `find` calls are an order of magnitude slower than this
+        ref = user_element = info_element = date_element = verified_element = None
+        for element in listing.descendants:
+            if not isinstance(element, Tag):
+                continue
+            classes = element.get("class") or ()
+            if element.name == "a":
+                if ref is None and element.get("href") is not None:
+                    ref = element["href"]
+                if verified_element is None and classes == _VERIFIED_CLASSES:
+                    verified_element = element
+            elif element.name == "span":
+                if user_element is None and "ml5" in classes:
+                    user_element = element
+            elif element.name == "div":
+                if info_element is None and "col-xs-11" in classes:
+                    info_element = element
+                elif date_element is None and classes == _DATE_CLASSES:
+                    date_element = element
+
+        try:
+            user_name = user_element.getText()
+
+            text = info_element.find("span").getText()
+            parts = [part.strip() for part in re.split(r"\||\n", text) if part.strip() != ""]
+            wg_type = parts[0]
+            address = ", ".join(parts[::-1][:-1])
+
+            text = date_element.getText()
+            start_end = [part.strip() for part in re.split("-|\n", text) if part.strip() != ""]
+            rental_length_months = cls._compute_range_length("-".join(start_end))
+            rental_start = cls._convert_to_datetime(start_end[0])
+        except (AttributeError, IndexError, ValueError):
+            return None
+        listing_id = Listing.parse_id(ref) if ref is not None else None
+        if listing_id is None:
+            return None
+
+        verified_business = bool(
+            verified_element and "unternehmen" in verified_element.text.lower())
+
+        return Listing(
+            listing_id=listing_id,
+            ref=ref,
+            user_name=user_name,
+            address=address,
+            wg_type=wg_type,
+            rental_length_months=rental_length_months,
+            rental_start=rental_start,
+            verified_business=verified_business,
+        )
 
     @staticmethod
     def _convert_to_datetime(date: str) -> datetime:
@@ -292,5 +364,5 @@ class ListingGetter:
 if __name__ == "__main__":
     url = "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html?csrf_token=c9280a89ddcd56ac55c721ab68f7c5fd64996ca7&offer_filter=1&city_id=8&sort_column=0&sort_order=0&noDeact=1&categories%5B%5D=0&rent_types%5B%5D=2&rent_types%5B%5D=1&rent_types%5B%5D=2%2C1&sMin=14&ot%5B%5D=126&ot%5B%5D=132&ot%5B%5D=85079&ot%5B%5D=151&ot%5B%5D=163&ot%5B%5D=85086&ot%5B%5D=165&wgSea=2&wgMnF=2&wgArt%5B%5D=6&wgArt%5B%5D=12&wgArt%5B%5D=11&wgArt%5B%5D=19&wgArt%5B%5D=22&wgSmo=2&exc=2&img_only=1"
     listings_getter = ListingGetter(url)
-    info_dict = listings_getter.all_infos()
-    pprint.pprint(info_dict)
+    listings = listings_getter.all_listings
+    pprint.pprint(listings)
@@ -4,6 +4,11 @@
 This module handles the extraction of specific information from individual WG-Gesucht.de 
 listing pages, including listing descriptions and rental duration details.
 
+The detail page is parsed once, on first access, and all extracted fields are cached in
+a `ListingDetails` record. By default the page is parsed with lxml and the fields are
+looked up with XPath queries, which avoids building a BeautifulSoup tree of the whole
+page; `fast_path=False` parses the page with BeautifulSoup instead.
+
 Examples
 --------
 >>> getter = ListingInfoGetter("/wg-zimmer-in-Berlin-Mitte.123.html")
@@ -14,14 +19,112 @@ Examples
 >>> duration = getter.rental_duration_months
 >>> print(duration)
 3
+>>> getter.details.to_row()
+{'listing_title': 'Bright room in Mitte', 'price': 550, 'size': 18, ...}
 """
-import json
-import os
 import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
 
+from listing import URL_BASE, Listing
+from listing_corpus import ListingCorpus
+
+_DATE_PATTERN = re.compile(r"\d{1,2}\.\d{1,2}\.\d{4}")
+_AMOUNT_PATTERN = re.compile(r"\d+")
+
+# labels of the key facts and cost table rows mapped onto `ListingDetails` fields
+_KEY_FACT_FIELDS = {
+    "Zimmergröße": "size",
+    "Wohnungsgröße": "size",
+    "Größe": "size",
+    "Gesamtmiete": "price",
+}
+_COST_FIELDS = {
+    "Miete": "rent",
+    "Nebenkosten": "utilities",
+    "Sonstige Kosten": "other_costs",
+    "Kaution": "deposit",
+    "Ablösevereinbarung": "buyout",
+}
+
+_XPATH_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_XPATH_TITLE = "//h1[@id='sliderTopTitle']"
+_XPATH_DESCRIPTION = "//div[@id='ad_description_text']"
+_XPATH_CHUNKS = ".//*[self::p or self::h3]"
+_XPATH_DATES = "//p[@style='line-height: 2em;']"
+_XPATH_KEY_FACTS = f"//h2[{_XPATH_CLASS.format('key_fact_value')}]"
+_XPATH_KEY_FACT_LABEL = f"following-sibling::span[{_XPATH_CLASS.format('key_fact_detail')}][1]"
+_XPATH_COST_ROWS = "//table//tr[count(td) = 2]"
+
+
+@dataclass(frozen=True)
+class ListingDetails:
+    """Fields extracted from a listing detail page.
+
+    Amounts are in euros and sizes in square metres. Fields that are missing on the
+    page or given as "n.a." are None.
+    """
+    __slots__ = (
+        "title",
+        "text",
+        "rental_dates",
+        "price",
+        "size",
+        "rent",
+        "utilities",
+        "other_costs",
+        "deposit",
+        "buyout",
+    )
+    title: Optional[str]
+    text: Optional[str]
+    rental_dates: Tuple[str, ...]
+    price: Optional[int]
+    size: Optional[int]
+    rent: Optional[int]
+    utilities: Optional[int]
+    other_costs: Optional[int]
+    deposit: Optional[int]
+    buyout: Optional[int]
+
+    @property
+    def rental_start(self) -> Optional[datetime]:
+        """Date from which the room is available, if given."""
+        if not self.rental_dates:
+            return None
+        return datetime.strptime(self.rental_dates[0], "%d.%m.%Y")
+
+    def to_row(self) -> Dict[str, Any]:
+        """Map the details onto the columns of the `individual_listings` table.
+
+        Columns whose value is missing on the page are left out, so the table
+        defaults apply.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Column-value pairs, e.g. to be merged with `Listing.to_row`
+        """
+        row = {
+            "listing_title": self.title,
+            "price": self.price,
+            "size": self.size,
+            "utilities": self.utilities,
+            "other_costs": self.other_costs,
+            "deposit": self.deposit,
+            "buyout": self.buyout,
+        }
+        rental_start = self.rental_start
+        if rental_start is not None:
+            row["rental_start_date"] = rental_start.date().isoformat()
+        return {column: value for column, value in row.items() if value is not None}
+
 
 class ListingInfoGetter:
     """Handles retrieval and processing of individual WG-Gesucht.de listings.
@@ -31,14 +134,158 @@ class ListingInfoGetter:
 
     Parameters
     ----------
-    ref : str
-        The listing reference URL (relative path from wg-gesucht.de)
+    ref : Union[str, Listing]
+        The listing reference URL (relative path from wg-gesucht.de) or the listing
+        found on the search page
+    html : str, optional
+        The already downloaded detail page, e.g. from a `DetailFetcher`. If not
+        given, the page is downloaded.
+    fast_path : bool
+        Extract the fields with lxml XPath queries instead of a BeautifulSoup tree
     """
 
-    def __init__(self, ref: str):
-        url_base = "https://www.wg-gesucht.de"
-        url = url_base + ref
-        self.r = requests.get(url).text
+    def __init__(
+        self,
+        ref: Union[str, Listing],
+        html: Optional[str] = None,
+        fast_path: bool = True,
+    ):
+        if not isinstance(ref, str):
+            ref = ref.ref
+        self.ref = ref
+        self.listing_id = Listing.parse_id(ref)
+        if html is None:
+            url = URL_BASE + ref
+            html = requests.get(url).text
+        self.r = html
+        self.fast_path = fast_path
+
+    @cached_property
+    def details(self) -> ListingDetails:
+        """Parse the detail page once and extract all fields.
+
+        Returns
+        -------
+        ListingDetails
+            The fields found on the page
+        """
+        if self.fast_path:
+            raw = self._extract_xpath(self.r)
+        else:
+            raw = self._extract_soup(self.r)
+        return self._build_details(*raw)
+
+    @staticmethod
+    def _extract_xpath(html: str) -> tuple:
+        """Look up the raw field texts with XPath queries on an lxml tree."""
+        if not html.strip():
+            return None, None, [], [], []
+        tree = lxml.html.fromstring(html)
+
+        titles = tree.xpath(_XPATH_TITLE)
+        title = titles[0].text_content() if titles else None
+
+        descriptions = tree.xpath(_XPATH_DESCRIPTION)
+        chunks = None
+        if descriptions:
+            chunks = [chunk.text_content() for chunk in descriptions[0].xpath(_XPATH_CHUNKS)]
+
+        date_texts = [p.text_content() for p in tree.xpath(_XPATH_DATES)]
+
+        key_facts = []
+        for value in tree.xpath(_XPATH_KEY_FACTS):
+            labels = value.xpath(_XPATH_KEY_FACT_LABEL)
+            if labels:
+                key_facts.append((labels[0].text_content(), value.text_content()))
+
+        cost_rows = []
+        for row in tree.xpath(_XPATH_COST_ROWS):
+            label, value = row.xpath("td")
+            cost_rows.append((label.text_content(), value.text_content()))
+        return title, chunks, date_texts, key_facts, cost_rows
+
+    @staticmethod
+    def _extract_soup(html: str) -> tuple:
+        """Look up the raw field texts in a BeautifulSoup tree."""
+        soup = BeautifulSoup(html, "lxml")
+
+        title = soup.find("h1", {"id": "sliderTopTitle"})
+        title = title.getText() if title else None
+
+        description = soup.find("div", {"id": "ad_description_text"})
+        chunks = None
+        if description is not None:
+            chunks = [chunk.getText() for chunk in description.find_all(["p", "h3"])]
+
+        date_texts = [p.getText() for p in soup.find_all("p", {"style": "line-height: 2em;"})]
+
+        key_facts = []
+        for value in soup.find_all("h2", class_="key_fact_value"):
+            label = value.find_next_sibling("span", class_="key_fact_detail")
+            if label is not None:
+                key_facts.append((label.getText(), value.getText()))
+
+        cost_rows = []
+        for table in soup.find_all("table"):
+            for row in table.find_all("tr"):
+                cells = row.find_all("td", recursive=False)
+                if len(cells) == 2:
+                    cost_rows.append((cells[0].getText(), cells[1].getText()))
+        return title, chunks, date_texts, key_facts, cost_rows
+
+    @classmethod
+    def _build_details(
+        cls,
+        title: Optional[str],
+        chunks: Optional[List[str]],
+        date_texts: List[str],
+        key_facts: List[Tuple[str, str]],
+        cost_rows: List[Tuple[str, str]],
+    ) -> ListingDetails:
+        """Turn the raw texts found on the page into typed fields."""
+        text = None
+        if chunks is not None:
+            text = "".join(chunk.strip() + "\n\n" for chunk in chunks)
+
+        start_dates, end_dates = [], []
+        for date_text in date_texts:
+            if "frei ab:" in date_text:
+                start_dates = _DATE_PATTERN.findall(date_text)
+            elif "frei bis:" in date_text:
+                end_dates = _DATE_PATTERN.findall(date_text)
+
+        amounts = {}
+        for label, value in key_facts:
+            field = _KEY_FACT_FIELDS.get(label.strip())
+            if field is not None:
+                amounts[field] = cls._parse_amount(value)
+        for label, value in cost_rows:
+            field = _COST_FIELDS.get(label.strip().rstrip(":").strip())
+            if field is not None:
+                amounts[field] = cls._parse_amount(value)
+
+        price = amounts.get("price")
+        if price is None:
+            price = amounts.get("rent")
+
+        return ListingDetails(
+            title=title.strip() if title else None,
+            text=text,
+            rental_dates=tuple(start_dates + end_dates),
+            price=price,
+            size=amounts.get("size"),
+            rent=amounts.get("rent"),
+            utilities=amounts.get("utilities"),
+            other_costs=amounts.get("other_costs"),
+            deposit=amounts.get("deposit"),
+            buyout=amounts.get("buyout"),
+        )
+
+    @staticmethod
+    def _parse_amount(value: str) -> Optional[int]:
+        """Parse amounts like "1.200€" or "18m²", None for "n.a."."""
+        match = _AMOUNT_PATTERN.search(value.replace(".", ""))
+        return int(match.group()) if match else None
 
     @property
     def listing_text(self) -> str:
@@ -49,43 +296,33 @@ class ListingInfoGetter:
         str
             The formatted listing description text with headers and paragraphs
             separated by double newlines
+
+        Raises
+        ------
+        ValueError
+            If the listing has no description
         """
-        soup = BeautifulSoup(self.r, "lxml")
-        ad_description = soup.find("div", {"id": "ad_description_text"}).find_all(
-            ["p", "h3"]
-        )
-        text = []
-        for chunk in ad_description:
-            text.extend([chunk.getText().strip(), "\n\n"])
-        text = "".join(text)
-        return text
+        if self.details.text is None:
+            raise ValueError("Could not get listing text!")
+        return self.details.text
 
     @staticmethod
     def save_listing_text(file_name: str, text: str) -> None:
-        """Save listing text to a JSON file.
+        """Save listing text to a JSON lines corpus.
 
         Parameters
         ----------
         file_name : str
-            Path to the JSON file where texts should be saved
+            Path to the JSONL file where texts should be saved
         text : str
             The listing text to be saved
 
         Notes
         -----
-        If the file doesn't exist, it will be created with an initial text.
-        If it exists, the new text will be appended to the existing texts.
+        The text is appended as a single line, see `ListingCorpus`. The file is
+        created if it doesn't exist.
         """
-        if not os.path.exists(file_name):
-            data = {"texts": [text]}
-            with open(file_name, "w") as f:
-                json.dump(data, f)
-
-        with open(file_name, "r+") as f:
-            data = json.load(f)
-            data["texts"].append(text)
-            f.seek(0)
-            json.dump(data, f)
+        ListingCorpus(file_name).append(text)
 
     @property
     def rental_duration_months(self) -> int:
@@ -101,14 +338,7 @@ class ListingInfoGetter:
         ValueError
             If rental dates cannot be found in the listing
         """
-        soup = BeautifulSoup(self.r, "lxml")
-        ps = soup.find_all("p", {"style": "line-height: 2em;"})
-        dates = []
-        for i, p in enumerate(ps):
-            text = p.getText().strip()
-            if "frei ab:" in text:
-                text = text.replace("  ", "")
-                dates = [elem for elem in re.split(" |\n", text) if "." in elem]
+        dates = self.details.rental_dates
         if dates:
             return self._compute_rental_duration("-".join(dates))
         else:
@@ -0,0 +1,495 @@
+"""
+AsyncDatabaseService Module
+===========================
+
+This module provides an `AsyncDatabaseService` class with the same operations and
+result format as `DatabaseService`, implemented on top of an `asyncpg` connection
+pool. It lets the database API serve concurrent requests from a single event loop
+without a slow query blocking all others.
+
+
+Usage Examples
+--------------
+```python
+from services.database_service import DBConfig
+from services.async_database_service import AsyncDatabaseService
+
+db_service = AsyncDatabaseService(DBConfig(host="localhost", port=5432, database="mydb",
+                                           user="myuser", password="mypassword"))
+await db_service.connect()
+
+result = await db_service.execute_query("SELECT * FROM users WHERE id = %s", (1,))
+result = await db_service.insert("users", {"name": "Alice", "email": "alice@example.com"})
+users = await db_service.select("users", filters=[["age", ">", 21]], fields=["id", "name"])
+
+await db_service.close()
+```
+
+Notes
+------
+- Queries keep the psycopg2 `%s` placeholder style of `DatabaseService`, they are
+  translated to the `$n` placeholders of asyncpg.
+- asyncpg prepares every statement and caches up to `DBConfig.statement_cache_size`
+  of them per connection, so no separate statement cache is needed.
+- Unlike psycopg2, asyncpg does not let the server cast text parameters, so dates,
+  timestamps, numbers and booleans get custom codecs that also accept strings, as
+  ids and dates arrive from the JSON API, e.g. `"id": "1"` or ISO timestamps. Naive
+  timestamps are taken as UTC.
+"""
+
+import re
+import struct
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from services.database_service import (
+    BULK_INSERT_METHODS,
+    DatabaseService,
+    DBConfig,
+)
+from utils.statement_cache import numbered_placeholders
+
+# asyncpg allows at most 32767 parameters per statement
+MAX_QUERY_PARAMETERS = 32767
+
+_RETURNING = re.compile(r"\bRETURNING\b", re.IGNORECASE)
+# statements that only return rows with a RETURNING clause
+_DML_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+# dates and timestamps are sent as offsets from the PostgreSQL epoch
+_PG_EPOCH_DATE = date(2000, 1, 1)
+_PG_EPOCH = datetime(2000, 1, 1)
+_PG_EPOCH_UTC = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_asyncpg_query(query: str) -> str:
+    """
+    Translates psycopg2 style `%s` placeholders to asyncpg style `$1, $2, ...`.
+
+    Parameters
+    ----------
+    query : str
+        The query with `%s` placeholders, literal percent signs written as `%%`.
+
+    Returns
+    -------
+    str
+        The query with numbered placeholders.
+    """
+    return numbered_placeholders(query)
+
+
+def _affected_rows(status: str) -> int:
+    """Parses the row count from a command status like 'INSERT 0 3' or 'UPDATE 2'."""
+    count = status.rsplit(" ", 1)[-1]
+    return int(count) if count.isdigit() else 0
+
+
+def _encode_date(value: Any) -> tuple:
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    elif isinstance(value, datetime):
+        value = value.date()
+    return ((value - _PG_EPOCH_DATE).days,)
+
+
+def _decode_date(value: tuple) -> date:
+    return _PG_EPOCH_DATE + timedelta(days=value[0])
+
+
+def _encode_timestamp(value: Any) -> tuple:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return ((value - _PG_EPOCH) // _MICROSECOND,)
+
+
+def _decode_timestamp(value: tuple) -> datetime:
+    return _PG_EPOCH + timedelta(microseconds=value[0])
+
+
+def _decode_timestamptz(value: tuple) -> datetime:
+    return _PG_EPOCH_UTC + timedelta(microseconds=value[0])
+
+
+_TRUE_STRINGS = ("t", "true", "y", "yes", "on", "1")
+
+
+def _binary_codec(fmt: str, convert) -> Tuple[Callable, Callable]:
+    """An encoder and decoder for a fixed size binary type, converting strings first."""
+    packer = struct.Struct(fmt)
+    return (lambda value: packer.pack(convert(value)), lambda data: packer.unpack(data)[0])
+
+
+def _to_bool(value: Any) -> bool:
+    return value.strip().lower() in _TRUE_STRINGS if isinstance(value, str) else bool(value)
+
+
+# binary codecs, so they also work for the binary COPY of bulk_insert
+_NUMBER_CODECS = {
+    "int2": _binary_codec("!h", int),
+    "int4": _binary_codec("!i", int),
+    "int8": _binary_codec("!q", int),
+    "float4": _binary_codec("!f", float),
+    "float8": _binary_codec("!d", float),
+    "bool": _binary_codec("!?", _to_bool),
+}
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Registers the codecs for numbers, booleans, dates and timestamps on a new connection."""
+    for type_name, (encoder, decoder) in _NUMBER_CODECS.items():
+        await conn.set_type_codec(type_name, schema="pg_catalog", format="binary",
+                                  encoder=encoder, decoder=decoder)
+    await conn.set_type_codec("date", schema="pg_catalog", format="tuple",
+                              encoder=_encode_date, decoder=_decode_date)
+    await conn.set_type_codec("timestamp", schema="pg_catalog", format="tuple",
+                              encoder=_encode_timestamp, decoder=_decode_timestamp)
+    await conn.set_type_codec("timestamptz", schema="pg_catalog", format="tuple",
+                              encoder=_encode_timestamp, decoder=_decode_timestamptz)
+
+
+class AsyncDatabaseService:
+
+    def __init__(self, config: DBConfig):
+        """
+        An asyncio implementation of `DatabaseService` backed by an asyncpg pool.
+
+        The pool is created by `connect`, which has to be awaited from the event
+        loop that serves the requests.
+
+        Parameters
+        ----------
+        config : DBConfig
+            Configuration object containing database connection and pool details.
+        """
+        self.config = config
+        self.pool: Optional[asyncpg.Pool] = None
+
+    async def connect(self):
+        """
+        Creates the connection pool.
+
+        Raises
+        ------
+        ConnectionError
+            If the database connection cannot be established.
+        """
+        try:
+            self.pool = await asyncpg.create_pool(
+                host=self.config.host,
+                port=self.config.port,
+                database=self.config.database,
+                user=self.config.user,
+                password=self.config.password,
+                min_size=self.config.pool_min_size,
+                max_size=self.config.pool_max_size,
+                max_inactive_connection_lifetime=self.config.pool_max_lifetime,
+                statement_cache_size=self.config.statement_cache_size,
+                init=_init_connection,
+            )
+        except (OSError, asyncpg.PostgresError) as e:
+            raise ConnectionError(f"Failed to connect to database: {str(e)}")
+
+    async def close(self):
+        """
+        Closes all pooled database connections.
+        """
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Returns the size of the connection pool.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Pool size, idle connections and the configured bounds.
+        """
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "in_use": self.pool.get_size() - self.pool.get_idle_size(),
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+        }
+
+    async def execute_query(self, query: str, params: Sequence = None) -> Dict[str, Any]:
+        """
+        Executes a SQL query on the database.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query to be executed, with `%s` placeholders.
+        params : Sequence, optional
+            The parameters to be used in the query.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A dictionary containing query execution results.
+        """
+        params = tuple(params) if params else ()
+        if params:
+            # like psycopg2, only queries with parameters use placeholders
+            query = to_asyncpg_query(query)
+        try:
+            async with self.pool.acquire() as conn:
+                statement = query.lstrip()[:6].upper()
+                if statement == 'SELECT':
+                    rows = await conn.fetch(query, *params)
+                    return {"success": True, "data": [dict(row) for row in rows]}
+                if _RETURNING.search(query):
+                    # every affected row is returned
+                    rows = await conn.fetch(query, *params)
+                    return {"success": True, "affected_rows": len(rows),
+                            "data": [dict(row) for row in rows]}
+                if statement in _DML_STATEMENTS:
+                    status = await conn.execute(query, *params)
+                    return {"success": True, "affected_rows": _affected_rows(status)}
+                return await self._execute_other(conn, query, params)
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    async def _execute_other(conn: asyncpg.Connection, query: str,
+                             params: tuple) -> Dict[str, Any]:
+        """
+        Executes a statement that may or may not return rows, e.g. a `WITH` query.
+
+        The statement is prepared to learn from the server whether it returns rows.
+        Like the cursor of `DatabaseService.execute_query`, it then reports the row
+        count and, if there are any, the rows.
+        """
+        try:
+            prepared = await conn.prepare(query)
+        except asyncpg.PostgresSyntaxError:
+            if params:
+                raise
+            # scripts of several statements cannot be prepared, they never return rows
+            status = await conn.execute(query)
+            return {"success": True, "affected_rows": _affected_rows(status)}
+
+        rows = await prepared.fetch(*params)
+        response = {"success": True, "affected_rows": _affected_rows(prepared.get_statusmsg())}
+        if prepared.get_attributes():
+            response["data"] = [dict(row) for row in rows]
+        return response
+
+    async def insert(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        returning: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Inserts a record into the specified table, see `DatabaseService.insert`.
+        """
+        try:
+            DatabaseService._check_identifiers(table, data)
+            returning_clause = DatabaseService._returning_clause(returning)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(["%s"] * len(data))
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}){returning_clause}"
+        return await self.execute_query(query, tuple(data.values()))
+
+    async def select(
+        self,
+        table: str,
+        conditions: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+        order_by: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Retrieves records from a table, see `DatabaseService.select`.
+        """
+        try:
+            where, params = DatabaseService._where(conditions, params, filters)
+            query, page_params = DatabaseService._select_query(table, fields, where, order_by,
+                                                               limit, offset)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        return await self.execute_query(query, params + page_params)
+
+    async def stream_select(
+        self,
+        table: str,
+        conditions: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+        order_by: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams records from a table through a server-side cursor, see
+        `DatabaseService.stream_select`.
+        """
+        where, params = DatabaseService._where(conditions, params, filters)
+        query, page_params = DatabaseService._select_query(table, fields, where, order_by, limit,
+                                                           offset)
+        params += page_params
+        if params:
+            query = to_asyncpg_query(query)
+
+        async with self.pool.acquire() as conn, conn.transaction():
+            async for record in conn.cursor(query, *params, prefetch=batch_size):
+                yield dict(record)
+
+    async def update(
+        self,
+        table: str,
+        values: Dict[str, Any],
+        conditions: Optional[str] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+    ) -> Dict[str, Any]:
+        """
+        Updates records in a table, see `DatabaseService.update`.
+        """
+        try:
+            DatabaseService._check_identifiers(table, values)
+            where, params = DatabaseService._where(conditions, params, filters)
+            if not where:
+                raise ValueError("Conditions required for update")
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        set_values = ", ".join([f"{k} = %s" for k in values.keys()])
+        query = f"UPDATE {table} SET {set_values} WHERE {where}"
+        return await self.execute_query(query, tuple(values.values()) + params)
+
+    async def delete(
+        self,
+        table: str,
+        conditions: Optional[str] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+    ) -> Dict[str, Any]:
+        """
+        Deletes records from a table, see `DatabaseService.delete`.
+        """
+        try:
+            DatabaseService._check_identifiers(table)
+            where, params = DatabaseService._where(conditions, params, filters)
+            if not where:
+                raise ValueError("Conditions required for delete")
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        query = f"DELETE FROM {table} WHERE {where}"
+        return await self.execute_query(query, params)
+
+    async def bulk_insert(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        method: str = "values",
+        page_size: int = 1000,
+        on_conflict: Optional[str] = None,
+        conflict_columns: Optional[List[str]] = None,
+        returning: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Performs a bulk insert in a single transaction, see `DatabaseService.bulk_insert`.
+
+        With `method="values"` the rows are sent as multi-row INSERT statements, with
+        `method="copy"` they are streamed with the binary COPY protocol.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A dictionary with the operation result.
+        """
+        if not data:
+            return {"success": True, "affected_rows": 0, "data": []} if returning \
+                else {"success": True, "affected_rows": 0}
+
+        columns = list(data[0].keys())
+        columns_str = ", ".join(columns)
+        records = [tuple(item[col] for col in columns) for item in data]
+
+        try:
+            DatabaseService._check_identifiers(table, columns)
+            if method not in BULK_INSERT_METHODS:
+                raise ValueError(f"method must be one of {BULK_INSERT_METHODS}, got {method}")
+            conflict = DatabaseService._conflict_clause(columns, on_conflict, conflict_columns)
+            returning_clause = DatabaseService._returning_clause(returning)
+
+            async with self.pool.acquire() as conn, conn.transaction():
+                if method == "copy":
+                    rows_affected, rows = await self._copy_insert(conn, table, records, columns,
+                                                                  conflict, returning_clause)
+                else:
+                    page_size = max(1, min(page_size, MAX_QUERY_PARAMETERS // len(columns)))
+                    rows_affected, rows = 0, []
+                    for start in range(0, len(records), page_size):
+                        page = records[start:start + page_size]
+                        row = f"({', '.join(['%s'] * len(columns))})"
+                        query = to_asyncpg_query(
+                            f"INSERT INTO {table} ({columns_str}) "
+                            f"VALUES {', '.join([row] * len(page))}{conflict}{returning_clause}")
+                        params = [value for record in page for value in record]
+                        if returning:
+                            page_rows = await conn.fetch(query, *params)
+                            rows_affected += len(page_rows)
+                            rows.extend(dict(record) for record in page_rows)
+                        else:
+                            status = await conn.execute(query, *params)
+                            rows_affected += _affected_rows(status)
+
+            response = {"success": True, "affected_rows": rows_affected}
+            if returning:
+                response["data"] = rows
+            return response
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def _copy_insert(
+        self,
+        conn: asyncpg.Connection,
+        table: str,
+        records: List[tuple],
+        columns: List[str],
+        conflict: str,
+        returning_clause: str = "",
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Copies records into a table, through a staging table for upserts and
+        `returning_clause`.
+
+        Returns
+        -------
+        Tuple[int, List[Dict[str, Any]]]
+            The number of inserted or updated rows and the returned rows.
+        """
+        if not conflict and not returning_clause:
+            status = await conn.copy_records_to_table(table, records=records, columns=columns)
+            return _affected_rows(status), []
+
+        columns_str = ", ".join(columns)
+        staging = f"_bulk_insert_{table}"
+        await conn.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) "
+                           f"ON COMMIT DROP")
+        await conn.copy_records_to_table(staging, records=records, columns=columns)
+        query = (f"INSERT INTO {table} ({columns_str}) "
+                 f"SELECT {columns_str} FROM {staging}{conflict}{returning_clause}")
+        if returning_clause:
+            rows = await conn.fetch(query)
+            return len(rows), [dict(row) for row in rows]
+        return _affected_rows(await conn.execute(query)), []
@@ -0,0 +1,205 @@
+"""
+Async variant of `ProfileService` for async FastAPI handlers.
+
+The calls to the database and authentication APIs are awaited. Profile data that
+is not stored yet is scraped with the user's browser, and since Selenium blocks,
+the browser steps run in a worker thread. Browser steps of the same user are
+serialised, the browser can only show one page at a time.
+"""
+import asyncio
+import imghdr
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import HTTPException
+from selenium.webdriver.common.by import By
+
+from clients.async_auth_client import AsyncAuthClient
+from clients.async_database_client import AsyncDatabaseClient
+from services.profile_service import ProfileService
+from utils.browser_manager import BrowserManager
+from utils.browser_wrapper import BrowserWrapper
+from utils.http_session import SharedAsyncClient
+
+PROFILE_URL = "https://www.wg-gesucht.de/my-profile.html"
+
+
+class AsyncProfileService(ProfileService):
+    """
+    Retrieves the WG-Gesucht profile of users, see `ProfileService`.
+
+    Parameters
+    ----------
+    browser_manager : BrowserManager
+        Instance of the browser manager.
+    auth_api_url : str
+        The base URL of the authentication API service.
+    db_api_url : str
+        The base URL of the database API service.
+    client : SharedAsyncClient, optional
+        Client to send the API requests with. If not given, the service creates one
+        that is shared by its database and authentication clients.
+    """
+
+    def __init__(
+        self,
+        browser_manager: BrowserManager,
+        auth_api_url: str = "http://localhost:8000",
+        db_api_url: str = "http://localhost:7999",
+        client: Optional[SharedAsyncClient] = None,
+    ):
+        self.browser_manager = browser_manager
+        self.auth_api_url = auth_api_url.rstrip("/")
+        self.db_api_url = db_api_url.rstrip("/")
+        self._owns_client = client is None
+        self.client = SharedAsyncClient() if client is None else client
+        self.db_client = AsyncDatabaseClient(db_api_url, client=self.client)
+        self.auth_client = AsyncAuthClient(auth_api_url, client=self.client)
+        self._browser_locks: Dict[str, asyncio.Lock] = {}
+
+    async def aclose(self) -> None:
+        """Close the connections to the APIs, unless the client was passed in."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _select_user(self, user_id: str, fields: List[str]) -> Dict:
+        """The stored `fields` of a user, empty if the user could not be selected."""
+        result = await self.db_client.select(
+            table="users",
+            filters=[["id", "=", user_id]],
+            fields=fields,
+        )
+        return result["data"][0] if result["success"] and result["data"] else {}
+
+    async def _scrape_profile(self, session_token: str, user_id: str,
+                              element_ids: List[str]) -> List[Optional[str]]:
+        """
+        Read the values of input elements of the user's WG-Gesucht profile page.
+
+        The user's browser is logged in first if needed.
+        """
+        lock = self._browser_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            browser: BrowserWrapper = await asyncio.to_thread(
+                self.browser_manager.get_browser_for_user, user_id)
+            if not await asyncio.to_thread(browser.is_logged_in):
+                creds = await self.auth_client.get_credentials(session_token)
+                await asyncio.to_thread(browser.login, creds["email"], creds["wg_password"])
+
+            def read_values() -> List[Optional[str]]:
+                browser.navigate_to(PROFILE_URL)
+                return [
+                    browser.get_element(By.ID, element_id).get_attribute(
+                        "src" if element_id == "my_profile_profile_image" else "value")
+                    for element_id in element_ids
+                ]
+
+            return await asyncio.to_thread(read_values)
+
+    async def get_profile_photo(self, session_token: str) -> str:
+        """
+        Retrieve the user's profile photo, see `ProfileService.get_profile_photo`.
+        """
+        user_id = await self.auth_client.get_user_id(session_token)
+
+        stored = await self._select_user(user_id, ["profile_photo"])
+        if stored.get("profile_photo"):
+            return stored["profile_photo"]
+
+        # Fetch from WG-Gesucht if not stored
+        try:
+            photo_url, = await self._scrape_profile(session_token, user_id,
+                                                    ["my_profile_profile_image"])
+        except Exception:
+            raise HTTPException(status_code=404, detail="Profile photo not found")
+        if not photo_url:
+            raise HTTPException(status_code=404, detail="Profile photo not found")
+
+        await self.db_client.update(
+            table="users",
+            data={"profile_photo": photo_url},
+            filters=[["id", "=", user_id]],
+        )
+        return photo_url
+
+    async def get_profile_name(self, session_token: str) -> dict:
+        """
+        Retrieve the user's first and last name, see `ProfileService.get_profile_name`.
+        """
+        user_id = await self.auth_client.get_user_id(session_token)
+
+        stored = await self._select_user(user_id, ["first_name", "last_name"])
+        if stored.get("first_name") and stored.get("last_name"):
+            return {"first_name": stored["first_name"], "last_name": stored["last_name"]}
+
+        # Fetch from WG-Gesucht if not stored
+        first_name, last_name = await self._scrape_profile(session_token, user_id,
+                                                           ["first_name", "last_name"])
+        if not first_name or not last_name:
+            raise HTTPException(status_code=404, detail="User name not found")
+
+        name = {"first_name": first_name, "last_name": last_name}
+        await self.db_client.update(
+            table="users",
+            data=name,
+            filters=[["id", "=", user_id]],
+        )
+        return name
+
+    async def get_user_address(self, session_token: str) -> dict:
+        """
+        Retrieve the user's address details, see `ProfileService.get_user_address`.
+        """
+        user_id = await self.auth_client.get_user_id(session_token)
+
+        fields = ["city", "postal_code", "street_and_house_number"]
+        stored = await self._select_user(user_id, fields)
+        if all(stored.get(field) for field in fields):
+            return {field: stored[field] for field in fields}
+
+        # Fetch from WG-Gesucht if not stored
+        values = await self._scrape_profile(session_token, user_id,
+                                            ["city", "postcode", "street"])
+        if not all(values):
+            raise HTTPException(status_code=404, detail="User address not found")
+
+        address = dict(zip(fields, values))
+        await self.db_client.update(
+            table="users",
+            data=address,
+            filters=[["id", "=", user_id]],
+        )
+        return address
+
+    async def download_profile_photo(
+        self,
+        session_token: str,
+        save_path: str = None,
+    ) -> str:
+        """
+        Download the user's profile photo, see `ProfileService.download_profile_photo`.
+        """
+        user_id = await self.auth_client.get_user_id(session_token)
+        photo_url = await self.get_profile_photo(session_token)
+
+        if not save_path:
+            save_path = str(Path(self._get_user_dir(user_id), "profile_photo.jpg"))
+
+        try:
+            response = await self.client.get().get(photo_url)
+        except httpx.HTTPError:
+            raise HTTPException(status_code=500, detail="Failed to download profile photo")
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail="Failed to download profile photo")
+
+        with open(save_path, 'wb') as f:
+            f.write(response.content)
+
+        # Check if the file is a valid image
+        if not imghdr.what(save_path):
+            os.remove(save_path)
+            raise HTTPException(status_code=500, detail="Invalid profile image")
+
+        return save_path
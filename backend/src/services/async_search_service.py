@@ -0,0 +1,143 @@
+"""
+Async variant of `SearchService` for async FastAPI handlers.
+
+The calls to the database and authentication APIs are awaited instead of blocking
+the event loop, so one worker can serve many requests whose API calls are in
+flight at the same time. The conversion between search configurations and
+database rows is shared with `SearchService`.
+"""
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from clients.async_auth_client import AsyncAuthClient
+from clients.async_database_client import AsyncDatabaseClient
+from services.search_service import SearchConfig, SearchService
+from utils.http_session import SharedAsyncClient
+
+
+class AsyncSearchService(SearchService):
+    """
+    Manages the search configurations of users, see `SearchService`.
+
+    Parameters
+    ----------
+    auth_api_url : str
+        The base URL of the authentication API service.
+    db_api_url : str
+        The base URL of the database API service.
+    client : SharedAsyncClient, optional
+        Client to send the API requests with. If not given, the service creates one
+        that is shared by its database and authentication clients.
+    """
+
+    def __init__(
+        self,
+        auth_api_url: str = "http://localhost:8000",
+        db_api_url: str = "http://localhost:7999",
+        client: Optional[SharedAsyncClient] = None,
+    ):
+        self._owns_client = client is None
+        self.client = SharedAsyncClient() if client is None else client
+        self.db_client = AsyncDatabaseClient(db_api_url, client=self.client)
+        self.auth_client = AsyncAuthClient(auth_api_url, client=self.client)
+
+    async def aclose(self) -> None:
+        """Close the connections to the APIs, unless the client was passed in."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _get_own_search(self, user_id: str, search_id: str) -> None:
+        """Raises a 404 unless the search exists and belongs to the user."""
+        result = await self.db_client.select(
+            "searches",
+            filters=[["id", "=", search_id], ["user_id", "=", user_id]],
+            fields=["id"],
+        )
+        if not result["success"] or not result["data"]:
+            raise HTTPException(status_code=404, detail="Search configuration not found")
+
+    async def create_search(
+        self,
+        session_token: str,
+        config: SearchConfig,
+    ) -> str:
+        user_id = await self.auth_client.get_user_id(session_token)
+
+        search_data = {
+            "user_id": user_id,
+            "name": config.name,
+            **self._convert_filters_to_db(config.filters),
+        }
+
+        result = await self.db_client.insert(
+            "searches",
+            search_data,
+            returning=["id"],
+        )
+        if not result["success"] or not result.get("data"):
+            raise HTTPException(status_code=500, detail="Failed to create search configuration")
+
+        return str(result["data"][0]["id"])
+
+    async def update_search(
+        self,
+        session_token: str,
+        search_id: str,
+        config: SearchConfig,
+    ) -> None:
+        user_id = await self.auth_client.get_user_id(session_token)
+        await self._get_own_search(user_id, search_id)
+
+        search_data = {
+            "name": config.name,
+            **self._convert_filters_to_db(config.filters),
+        }
+
+        result = await self.db_client.update(
+            "searches",
+            search_data,
+            filters=[["id", "=", search_id]],
+        )
+        if not result["success"]:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to update search configuration",
+            )
+
+    async def delete_search(
+        self,
+        session_token: str,
+        search_id: str,
+    ) -> None:
+        user_id = await self.auth_client.get_user_id(session_token)
+        await self._get_own_search(user_id, search_id)
+
+        result = await self.db_client.delete("searches", filters=[["id", "=", search_id]])
+        if not result["success"]:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to delete search configuration",
+            )
+
+    async def retrieve_all_searches(
+        self,
+        session_token: str,
+    ) -> List[Dict]:
+        user_id = await self.auth_client.get_user_id(session_token)
+
+        result = await self.db_client.select(
+            "searches",
+            filters=[["user_id", "=", user_id]],
+            fields=[
+                "id", "name", "location", "property_types", "rent_types", "date_range_start",
+                "date_range_end", "districts", "max_price", "min_size", "wg_types",
+                "gender_preference", "smoking_preference", "active", "total_found", "new_listings",
+                "last_run"
+            ],
+        )
+
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail="Failed to retrieve search configurations")
+
+        return [self._convert_db_to_filters(search) for search in result["data"]]
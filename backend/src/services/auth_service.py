@@ -34,8 +34,10 @@ auth_service = AuthService(db_service, browser_manager)
 """
 from fastapi import HTTPException
 from pydantic import BaseModel, EmailStr
-from cryptography.fernet import Fernet
-from typing import Optional, Dict, Any
+from cryptography.fernet import Fernet, InvalidToken
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 from openai import OpenAI
 import jwt
@@ -43,10 +45,15 @@ import secrets
 import os
 import requests
 import json
+import itertools
+import tempfile
+import threading
+import time
 from clients.database_client import DatabaseClient
 from pathlib import Path
 from utils import getenv
 from utils.browser_manager import BrowserManager
+from utils.session_revocations import SessionRevocations
 
 
 # Pydantic models for request/response validation
@@ -74,10 +81,26 @@ class AuthResponse(BaseModel):
     session_token: Optional[str] = None
 
 
+# Format version of the vault file, see `UserVault`
+VAULT_FORMAT_VERSION = 1
+
+
 class UserVault:
-    """Handles secure storage and retrieval of user secrets."""
+    """
+    Handles secure storage and retrieval of user secrets.
 
-    def __init__(self, user_id: str, base_dir: Optional[str] = None):
+    All secrets of a user are kept in one file, `vault.enc`, next to the user's
+    `master.key`. It holds the encrypted JSON map
+    `{"version": ..., "revision": ..., "secrets": {secret_type: secret}}`, where
+    `version` is the format version and `revision` counts the writes. Writes go to a
+    temporary file that is renamed over the vault file, so readers see either the
+    old or the new map, never a partial one.
+
+    Vaults of the older layouts, one `<secret_type>.enc` file per secret or a
+    `key_vault.enc` in the user directory, are migrated when opened.
+    """
+
+    def __init__(self, user_id: str, base_dir: Optional[str] = None, secret_ttl: float = 0):
         """
         Initialize the user's vault system.
         
@@ -87,16 +110,34 @@ class UserVault:
             The unique identifier for the user
         base_dir : str, optional
             Base directory for storing vault files
+        secret_ttl : float
+            Seconds the decrypted secrets are used without checking the vault file
+            for changes, 0 checks on every lookup. Secrets changed through this vault
+            are seen right away, changes by other processes after at most
+            `secret_ttl` seconds.
         """
         self.user_id = user_id
         self.base_dir = Path(base_dir or getenv("WORKDIR"))
         self.user_dir = Path(self.base_dir, "data", "users", user_id, "vault")
         self.user_dir.mkdir(parents=True, exist_ok=True)
+        self._vault_path = Path(self.user_dir, "vault.enc")
 
         # Initialize or load the master key
         self._master_key = self._initialize_master_key()
         self._cipher = Fernet(self._master_key)
 
+        self.secret_ttl = secret_ttl
+        self.revision = 0
+        self._secrets: Optional[Dict[str, str]] = None
+        # (inode, mtime, size) of the vault file the secrets were read from
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._fresh_until = 0.0
+        self._lock = threading.Lock()
+        self.secret_hits = 0
+        self.secret_misses = 0
+
+        self._migrate_legacy()
+
     def _initialize_master_key(self) -> bytes:
         """Initialize or load the master encryption key."""
         key_path = Path(self.user_dir, "master.key")
@@ -108,9 +149,114 @@ class UserVault:
 
         return key_path.read_bytes()
 
-    def _get_secret_path(self, secret_type: str) -> Path:
-        """Get path for a specific type of secret."""
-        return Path(self.user_dir, f"{secret_type}.enc")
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the current vault file, None if there is none."""
+        try:
+            stat = self._vault_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Tuple[Dict[str, str], int, Optional[Tuple[int, int, int]]]:
+        """
+        Read and decrypt the vault file.
+
+        Returns
+        -------
+        Tuple[Dict[str, str], int, Optional[Tuple[int, int, int]]]
+            The secrets, the revision and the stamp of the file. An empty map if
+            there is no vault file yet.
+
+        Raises
+        ------
+        ValueError
+            If the file cannot be decrypted or has an unknown format version.
+        """
+        try:
+            with open(self._vault_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                encrypted_data = f.read()
+        except FileNotFoundError:
+            return {}, 0, None
+
+        try:
+            data = json.loads(self._cipher.decrypt(encrypted_data))
+        except (InvalidToken, ValueError) as e:
+            raise ValueError(f"Vault of user {self.user_id} is corrupted") from e
+        if data.get("version") != VAULT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported vault format version {data.get('version')}")
+        return data["secrets"], data["revision"], (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _load(self) -> Dict[str, str]:
+        """Return the secrets, the vault file is only read again if it changed."""
+        if self._secrets is None or self._file_stamp() != self._stamp:
+            self._secrets, self.revision, self._stamp = self._read()
+        self._fresh_until = time.monotonic() + self.secret_ttl
+        return self._secrets
+
+    def _write(self, secrets: Dict[str, str]) -> None:
+        """Encrypt the secrets and atomically replace the vault file with them."""
+        revision = self.revision + 1
+        data = {"version": VAULT_FORMAT_VERSION, "revision": revision, "secrets": secrets}
+        encrypted_data = self._cipher.encrypt(json.dumps(data).encode())
+
+        # mkstemp creates the file readable by the owner only
+        fd, tmp_path = tempfile.mkstemp(dir=self.user_dir, prefix=".vault.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encrypted_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._vault_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._secrets, self.revision = secrets, revision
+        self._stamp = self._file_stamp()
+        self._fresh_until = time.monotonic() + self.secret_ttl
+
+    def _migrate_legacy(self) -> None:
+        """
+        Move the secrets of the older layouts into the vault file.
+
+        - `<secret_type>.enc` files in the vault directory, encrypted with the master
+          key. Secrets already in the vault file are newer and kept.
+        - `key_vault.enc` in the user directory, written by earlier versions of
+          `AuthService`. Its encryption key was stored in the same file and then
+          overwritten by the data, so it cannot be decrypted. A file that still
+          holds the key contains no secrets and is removed.
+
+        Files that cannot be decrypted are renamed to `<name>.legacy`.
+        """
+        legacy_files = [path for path in self.user_dir.glob("*.enc") if path != self._vault_path]
+        key_vault_path = Path(self.user_dir.parent, "key_vault.enc")
+
+        if legacy_files:
+            with self._lock:
+                secrets = dict(self._load())
+                migrated, unreadable = [], []
+                for path in legacy_files:
+                    try:
+                        secret = self._cipher.decrypt(path.read_bytes()).decode()
+                    except InvalidToken:
+                        unreadable.append(path)
+                        continue
+                    secrets.setdefault(path.stem, secret)
+                    migrated.append(path)
+                if migrated:
+                    self._write(secrets)
+                for path in migrated:
+                    path.unlink(missing_ok=True)
+                for path in unreadable:
+                    path.replace(path.with_name(f"{path.name}.legacy"))
+
+        if key_vault_path.exists():
+            try:
+                Fernet(key_vault_path.read_bytes())
+                key_vault_path.unlink(missing_ok=True)
+            except ValueError:
+                key_vault_path.replace(key_vault_path.with_name("key_vault.enc.legacy"))
 
     def store_secret(self, secret_type: str, secret_data: Any) -> None:
         """
@@ -127,10 +273,11 @@ class UserVault:
         if not isinstance(secret_data, str):
             secret_data = json.dumps(secret_data)
 
-        # Encrypt and save
-        encrypted_data = self._cipher.encrypt(secret_data.encode())
-        secret_path = self._get_secret_path(secret_type)
-        secret_path.write_bytes(encrypted_data)
+        with self._lock:
+            # based on the current file, so secrets stored by other processes are kept
+            secrets = dict(self._load())
+            secrets[secret_type] = secret_data
+            self._write(secrets)
 
     def get_secret(self, secret_type: str) -> Optional[str]:
         """
@@ -146,21 +293,28 @@ class UserVault:
         Optional[str]
             Decrypted secret if found, None otherwise
         """
-        secret_path = self._get_secret_path(secret_type)
-
-        if not secret_path.exists():
-            return None
+        with self._lock:
+            if self._secrets is not None and self._fresh_until > time.monotonic():
+                self.secret_hits += 1
+                return self._secrets.get(secret_type)
+            self.secret_misses += 1
+            try:
+                return self._load().get(secret_type)
+            except (OSError, ValueError):
+                return None
 
-        try:
-            encrypted_data = secret_path.read_bytes()
-            decrypted_data = self._cipher.decrypt(encrypted_data)
-            return decrypted_data.decode()
-        except Exception:
-            return None
+    def invalidate(self) -> None:
+        """Check the vault file for changes with the next lookup."""
+        with self._lock:
+            self._fresh_until = 0.0
 
     def list_secrets(self) -> list[str]:
         """List all available secret types."""
-        return [p.stem for p in self.user_dir.glob("*.enc")]
+        with self._lock:
+            try:
+                return list(self._load())
+            except (OSError, ValueError):
+                return []
 
     def delete_secret(self, secret_type: str) -> bool:
         """
@@ -171,11 +325,133 @@ class UserVault:
         bool
             True if secret was deleted, False if it didn't exist
         """
-        secret_path = self._get_secret_path(secret_type)
-        if secret_path.exists():
-            secret_path.unlink()
+        with self._lock:
+            secrets = dict(self._load())
+            if secret_type not in secrets:
+                return False
+            del secrets[secret_type]
+            self._write(secrets)
             return True
-        return False
+
+
+class VaultCache:
+    """
+    Keeps the vaults of recently active users in memory.
+
+    Opening a `UserVault` creates its directory, reads the master key and builds the
+    cipher, and a lookup reads and decrypts the vault file. The cache keeps the
+    opened vaults, least recently used first out, and their decrypted secrets, which
+    are checked against the vault file every `secret_ttl` seconds.
+
+    Parameters
+    ----------
+    secret_ttl : float
+        Seconds the decrypted secrets are used without checking, see `UserVault`.
+    max_users : int
+        Maximum number of cached vaults.
+    base_dir : str, optional
+        Base directory for storing vault files, see `UserVault`.
+    """
+
+    def __init__(self, secret_ttl: float = 60, max_users: int = 1024, base_dir: Optional[str] = None):
+        self.secret_ttl = secret_ttl
+        self.max_users = max_users
+        self.base_dir = base_dir
+        self._vaults: "OrderedDict[str, UserVault]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        # secret lookups of vaults that were evicted
+        self._evicted_secret_hits = 0
+        self._evicted_secret_misses = 0
+
+    def _add(self, user_id: str, vault: UserVault) -> UserVault:
+        """Cache an opened vault, unless another thread cached one in the meantime."""
+        with self._lock:
+            vault = self._vaults.setdefault(user_id, vault)
+            self._vaults.move_to_end(user_id)
+            while len(self._vaults) > self.max_users:
+                _, evicted = self._vaults.popitem(last=False)
+                self._evicted_secret_hits += evicted.secret_hits
+                self._evicted_secret_misses += evicted.secret_misses
+        return vault
+
+    def get(self, user_id: str) -> UserVault:
+        """Return the user's vault, opening it on first use."""
+        with self._lock:
+            vault = self._vaults.get(user_id)
+            if vault is not None:
+                self._vaults.move_to_end(user_id)
+                self._hits += 1
+                return vault
+            self._misses += 1
+
+        return self._add(user_id,
+                         UserVault(user_id, base_dir=self.base_dir, secret_ttl=self.secret_ttl))
+
+    def warm(self, user_ids: Optional[Iterable[str]] = None, workers: int = 8) -> int:
+        """
+        Open and read the vaults of many users at once, e.g. at startup.
+
+        Vaults of the older layouts are migrated on the way, see `UserVault`.
+
+        Parameters
+        ----------
+        user_ids : Iterable[str], optional
+            The users to load. By default all users with a vault directory, at most
+            `max_users` of them.
+        workers : int
+            Number of threads reading vault files in parallel.
+
+        Returns
+        -------
+        int
+            The number of loaded vaults.
+        """
+        if user_ids is None:
+            users_dir = Path(self.base_dir or getenv("WORKDIR"), "data", "users")
+            try:
+                with os.scandir(users_dir) as entries:
+                    user_ids = [entry.name for entry in entries
+                                if entry.is_dir() and Path(entry.path, "vault").is_dir()]
+            except FileNotFoundError:
+                return 0
+        user_ids = list(itertools.islice(user_ids, self.max_users))
+
+        def load(user_id: str) -> None:
+            vault = UserVault(user_id, base_dir=self.base_dir, secret_ttl=self.secret_ttl)
+            vault.list_secrets()
+            self._add(user_id, vault)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(load, user_ids))
+        return len(user_ids)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Check the vault files of a user, or of all users, with the next lookup."""
+        with self._lock:
+            vaults = list(self._vaults.values()) if user_id is None else \
+                [self._vaults[user_id]] if user_id in self._vaults else []
+        for vault in vaults:
+            vault.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cached vaults and the vault and secret hit rates."""
+        with self._lock:
+            vaults = list(self._vaults.values())
+            hits, misses = self._hits, self._misses
+            secret_hits = self._evicted_secret_hits + sum(v.secret_hits for v in vaults)
+            secret_misses = self._evicted_secret_misses + sum(v.secret_misses for v in vaults)
+        return {
+            "vaults": len(vaults),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "secret_hits": secret_hits,
+            "secret_misses": secret_misses,
+            "secret_hit_rate": secret_hits / (secret_hits + secret_misses)
+                               if secret_hits + secret_misses else 0.0,
+        }
 
 
 class AuthService:
@@ -185,6 +461,7 @@ class AuthService:
         browser_manager: BrowserManager,
         db_api_url: str = "http://localhost:7999",
         session_duration: int = 7,
+        vault_secret_ttl: float = 60,
     ):
         """
         Initialize AuthService with database API connection.
@@ -200,17 +477,48 @@ class AuthService:
             URL of the database API service.
         session_duration : int
             Duration of session in days.
+        vault_secret_ttl : float
+            Seconds decrypted credentials are kept in memory, see `VaultCache`.
         """
         self._browser_manager = browser_manager
         self._db_api_url = db_api_url.rstrip('/')
-        self._jwt_secret = os.getenv('JWT_SECRET', secrets.token_urlsafe(32))
-        self._jwt_algorithm = 'HS256'
+        self._jwt_algorithm = os.getenv('JWT_ALGORITHM', 'HS256')
+        if self._jwt_algorithm == 'RS256':
+            # clients can verify tokens locally with the public key
+            self._jwt_signing_key = os.environ['JWT_PRIVATE_KEY']
+            self._jwt_verification_key = os.environ['JWT_PUBLIC_KEY']
+        else:
+            self._jwt_signing_key = os.getenv('JWT_SECRET', secrets.token_urlsafe(32))
+            self._jwt_verification_key = self._jwt_signing_key
         self._session_duration = timedelta(days=session_duration)
         self._db_client = DatabaseClient(db_api_url=db_api_url)
+        self._revocations = SessionRevocations(self._db_client)
+        self._vaults = VaultCache(secret_ttl=vault_secret_ttl)
+
+    def start_session_sync(self, poll_interval: float = 5.0, purge_interval: float = 3600.0):
+        """
+        Load the revoked sessions and keep them in sync with the database.
+
+        Expired sessions are purged from the database every `purge_interval` seconds,
+        see `SessionRevocations.start`.
+        """
+        self._revocations.start(poll_interval=poll_interval, purge_interval=purge_interval)
+
+    def stop_session_sync(self):
+        """Stop syncing the revoked sessions."""
+        self._revocations.stop()
 
     def _get_user_vault(self, user_id: str) -> UserVault:
         """Get or create a vault for the user."""
-        return UserVault(user_id)
+        return self._vaults.get(user_id)
+
+    def warm_vaults(self, user_ids: Optional[Iterable[str]] = None) -> int:
+        """Load the vaults of many users into the vault cache, see `VaultCache.warm`."""
+        return self._vaults.warm(user_ids)
+
+    def vault_cache_stats(self) -> Dict[str, Any]:
+        """Return the hit rates of the vault cache, see `VaultCache.stats`."""
+        return self._vaults.stats()
 
     def _encrypt_data(self, data: str) -> str:
         """
@@ -259,126 +567,7 @@ class AuthService:
             JWT session token.
         """
         payload = {'user_id': user_id, 'exp': datetime.utcnow() + self._session_duration}
-        return jwt.encode(payload, self._jwt_secret, algorithm=self._jwt_algorithm)
-
-    def _initialize_vault(self, key_vault_path: Path) -> Fernet:
-        """
-        Initialize the encryption vault for a user.
-
-        This method ensures that a unique encryption key is generated and stored for each user.
-        If a key already exists in the vault file, it is loaded; otherwise, a new key is generated
-        and stored securely.
-
-        - The encryption key is essential for encrypting and decrypting sensitive user data.
-        - If the vault file is missing, a new key is created and saved to the file.
-
-        Parameters
-        ----------
-        session_token : str
-            JWT session token.
-
-        Returns
-        -------
-        bool
-            True if the token is valid, False otherwise.
-        """
-        if not key_vault_path.exists():
-            # Generate and save a new encryption key if the vault does not exist
-            key = Fernet.generate_key()
-            key_vault_path.write_bytes(key)
-        else:
-            # Read the existing key from the vault file
-            key = key_vault_path.read_bytes()
-        return Fernet(key)
-
-    def _save_to_vault(self, user_id: str, key: str, value: str):
-        """
-        Securely store a key-value pair in the user's encrypted vault.
-
-        This method encrypts and stores sensitive user data, such as passwords or API keys,
-        in an encrypted vault file specific to each user.
-
-        - The vault file is stored at a user-specific path.
-        - Only encrypted data is stored, ensuring security.
-        - This method overwrites existing data in the vault file.
-        Parameters
-        ----------
-        user_id : str
-            The unique identifier of the user.
-        key : str
-            The identifier for the credential being stored (e.g., "wg_password", "openai_key").
-        value : str
-            The sensitive data to be encrypted and saved.
-        """
-        vault_path = self._get_vault_path(user_id)
-        cipher = self._initialize_vault(vault_path)
-
-        # Save encrypted data
-        data = {key: value}
-        encrypted_data = cipher.encrypt(str(data).encode())
-        vault_path.write_bytes(encrypted_data)
-
-    def _load_from_vault(self, user_id: str, key: str) -> Optional[str]:
-        """
-        Retrieve a key-value pair from the user's encrypted vault.
-
-        This method decrypts and retrieves user credentials or API keys securely stored
-        in the vault.
-        - If the vault does not exist or does not contain the requested key, returns None.
-        - Only trusted data should be stored and accessed in the vault to prevent security risks.
-
-        Parameters
-        ----------
-        user_id : str
-            The unique identifier of the user.
-        key : str
-            The identifier of the credential to retrieve.
-
-        Returns
-        -------
-        Optional[str]
-            The decrypted value if found, otherwise None.
-
-        Raises
-        ------
-        ValueError
-            If the decryption process fails or stored data is corrupted.
-        """
-        vault_path = self._get_vault_path(user_id)
-        cipher = self._initialize_vault(vault_path)
-
-        if not vault_path.exists():
-            return None
-
-        encrypted_data = vault_path.read_bytes()
-        decrypted_data = cipher.decrypt(encrypted_data).decode()
-
-        # Parse stored data
-        data = eval(decrypted_data)  # Ensure no untrusted input is present
-        return data.get(key)
-
-    def _get_vault_path(self, user_id: str) -> Path:
-        """
-        Get the file path to the user's encrypted key vault.
-
-        This method ensures that a secure storage location is created for each user
-        before returning the vault path.
-        - The vault file is stored at `data/users/{user_id}/key_vault.enc`.
-        - If the user's directory does not exist, it is created automatically.
-
-        Parameters
-        ----------
-        user_id : str
-            The unique identifier of the user.
-
-        Returns
-        -------
-        Path
-            The file path to the user's encrypted vault.
-        """
-        user_dir = Path(os.getenv("WORKINGDIR", "."), "data", "users", user_id)
-        user_dir.mkdir(parents=True, exist_ok=True)
-        return Path(user_dir, "key_vault.enc")
+        return jwt.encode(payload, self._jwt_signing_key, algorithm=self._jwt_algorithm)
 
     def validate_session_token(self, session_token: str) -> bool:
         """
@@ -387,7 +576,7 @@ class AuthService:
         This method decodes and verifies the session token to ensure it is valid and has not expired.
 
         - If the token is valid, it returns `True`, allowing continued authentication.
-        - If the token is expired or invalid, it returns `False`.
+        - If the token is expired, invalid or its session was revoked, it returns `False`.
 
         Parameters
         ----------
@@ -400,10 +589,12 @@ class AuthService:
             True if the token is valid, False otherwise.
         """
         try:
-            jwt.decode(session_token, self._jwt_secret, algorithms=[self._jwt_algorithm])
-            return True
+            jwt.decode(session_token,
+                       self._jwt_verification_key,
+                       algorithms=[self._jwt_algorithm])
         except jwt.InvalidTokenError:
             return False
+        return not self._revocations.is_revoked(session_token)
 
     def get_user_id(self, session_token: str) -> str:
         """
@@ -412,7 +603,7 @@ class AuthService:
         This method decodes the JWT session token and extracts the `user_id` associated
         with the session.
 
-        - If the token is invalid or expired, an HTTP exception is raised.
+        - If the token is invalid, expired or revoked, an HTTP exception is raised.
 
         Parameters
         ----------
@@ -430,48 +621,69 @@ class AuthService:
             If the token is invalid.
         """
         try:
-            payload = jwt.decode(session_token, self._jwt_secret, algorithms=[self._jwt_algorithm])
-            return payload['user_id']
+            payload = jwt.decode(session_token,
+                                 self._jwt_verification_key,
+                                 algorithms=[self._jwt_algorithm])
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail="Invalid session token")
+        if self._revocations.is_revoked(session_token):
+            raise HTTPException(status_code=401, detail="Invalid session token")
+        return payload['user_id']
+
+    def revoke_session(self, session_token: str) -> bool:
+        """
+        Revoke a session, e.g. on logout, so its token is no longer accepted.
+
+        Parameters
+        ----------
+        session_token : str
+            JWT session token.
+
+        Returns
+        -------
+        bool
+            True if the session was revoked, False if it was revoked before.
+
+        Raises
+        ------
+        HTTPException
+            If the token is invalid or the session could not be revoked.
+        """
+        try:
+            payload = jwt.decode(session_token,
+                                 self._jwt_verification_key,
+                                 algorithms=[self._jwt_algorithm])
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid session token")
+        try:
+            return self._revocations.revoke(session_token,
+                                            datetime.fromtimestamp(payload['exp']))
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
     def _get_or_create_user(self, email: str):
         try:
             # Try to find existing user
             result = self._db_client.select(
                 table="users",
-                conditions=f"email = '{email}'",
+                filters=[["email", "=", email]],
             )
 
             if not result["success"]:
                 raise HTTPException(status_code=500, detail="Database error")
 
             if not result["data"]:
-                # Get max user ID for new user
-                id_result = self._db_client.select(
-                    table="users",
-                    fields=["id"],
-                )
-
-                # Handle case when there are no users yet
-                if not id_result["data"]:
-                    user_id = "1"
-                else:
-                    user_id = str(max([user["id"] for user in id_result["data"]]) + 1)
-
-                # Create new user
-                user_data = {
-                    "id": user_id,
-                    "email": email,
-                    "created_at": datetime.now().isoformat()
-                }
+                # Create new user, the id is generated by the database
+                user_data = {"email": email, "created_at": datetime.now().isoformat()}
                 create_result = self._db_client.insert(
                     table="users",
                     data=user_data,
+                    returning=["id"],
                 )
 
-                if not create_result["success"]:
+                if not create_result["success"] or not create_result.get("data"):
                     raise HTTPException(status_code=500, detail="Failed to create user")
+                user_id = str(create_result["data"][0]["id"])
             else:
                 user_id = str(result["data"][0]["id"])
 
@@ -548,7 +760,7 @@ class AuthService:
         try:
             result = self._db_client.select(
                 table="users",
-                conditions=f"id = '{user_id}'",
+                filters=[["id", "=", user_id]],
             )
 
             if not result["success"]:
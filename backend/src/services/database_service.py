@@ -34,16 +34,21 @@ result = db_service.insert("users", data)
 print(result)
 
 # 4. Selecting Records
-users = db_service.select("users", conditions="age > 21", fields=["id", "name"])
+users = db_service.select("users", conditions="age > %s", fields=["id", "name"], params=(21,))
 print(users)
 
+# Selecting the second page of a user's searches with a structured filter
+searches = db_service.select("searches", filters=[["user_id", "=", 1], ["active", "=", True]],
+                             order_by=["id desc"], limit=50, offset=50)
+print(searches)
+
 # 5. Updating a Record
 update_data = {"email": "newalice@example.com"}
-result = db_service.update("users", update_data, "id = 1")
+result = db_service.update("users", update_data, "id = %s", params=(1,))
 print(result)
 
 # 6. Deleting a Record
-result = db_service.delete("users", "id = 1")
+result = db_service.delete("users", "id = %s", params=(1,))
 print(result)
 
 # 7. Performing a Bulk Insert
@@ -53,33 +58,73 @@ users = [
 ]
 result = db_service.bulk_insert("users", users)
 print(result)
+
+# Upserting thousands of scraped listings with COPY
+result = db_service.bulk_insert("individual_listings", listings, method="copy",
+                                on_conflict="update", conflict_columns=["listing_id"])
+print(result)
+
+# Streaming a large table without loading it into memory
+for listing in db_service.stream_select("individual_listings", batch_size=500):
+    print(listing["listing_id"])
+
+# 8. Inspecting the Connection Pool and the Prepared Statements
+print(db_service.pool_stats())
+print(db_service.statement_cache_stats())
 ```
 
 Notes
 ------
 - This module requires PostgreSQL and `psycopg2` to be installed.
 - Ensure that the database service is running before executing queries.
+- Queries run on connections borrowed from a `utils.db_pool.ConnectionPool`, sized
+  by the `pool_*` fields of `DBConfig`.
+- `insert`, `select`, `update` and `delete` run as server-side prepared statements,
+  see `utils.statement_cache`. Rows are chosen by structured `filters`, compiled to
+  parameterised conditions, see `utils.filters`. Raw `conditions` are only accepted
+  together with the `params` of their placeholders, values are never written into
+  the SQL text.
 
 """
 
+import io
+import itertools
 import time
 import subprocess
 import psycopg2
-from typing import Dict, Any, List, Optional
-from psycopg2.extras import RealDictCursor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from psycopg2.extras import RealDictCursor, execute_values
 from dataclasses import dataclass
+from utils.db_pool import ConnectionPool
+from utils.filters import check_identifier, compile_filters, compile_order_by
+from utils.statement_cache import PreparedStatementConnection, StatementCache
+
+BULK_INSERT_METHODS = ("values", "copy")
+CONFLICT_ACTIONS = ("nothing", "update")
+# names of the server-side cursors of stream_select
+_cursor_ids = itertools.count()
 
 
 @dataclass
 class DBConfig:
     """
     Configuration for connecting to a PostgreSQL database.
+
+    The `pool_*` fields configure the connection pool of the `DatabaseService`, see
+    `utils.db_pool.ConnectionPool`. `statement_cache_size` bounds the number of
+    prepared statement shapes, see `utils.statement_cache.StatementCache`.
     """
     host: str
     port: int
     database: str
     user: str
     password: str
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    pool_max_lifetime: float = 1800.0
+    pool_validate_after: float = 30.0
+    pool_timeout: float = 5.0
+    statement_cache_size: int = 256
 
 
 class DatabaseService:
@@ -96,6 +141,15 @@ class DatabaseService:
         """
         self.config = config
         self._test_connection()
+        self.pool = ConnectionPool(
+            self._get_connection,
+            min_size=config.pool_min_size,
+            max_size=config.pool_max_size,
+            max_lifetime=config.pool_max_lifetime,
+            validate_after=config.pool_validate_after,
+            timeout=config.pool_timeout,
+        )
+        self.statements = StatementCache(config.statement_cache_size)
 
     def _start_postgres(self):
         """
@@ -153,8 +207,40 @@ class DatabaseService:
                                 database=self.config.database,
                                 user=self.config.user,
                                 password=self.config.password,
+                                connection_factory=PreparedStatementConnection,
                                 cursor_factory=RealDictCursor)
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Returns the size of the connection pool and its checkout metrics.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Pool size, idle and borrowed connections, number of checkouts, time
+            spent waiting for a connection, timeouts and recycled connections.
+        """
+        return self.pool.stats()
+
+    def statement_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit and miss counters of the prepared statements.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Number of statement shapes, executions of already prepared statements
+            (hits), statements prepared on a connection (misses) and statements run
+            unprepared.
+        """
+        return self.statements.stats()
+
+    def close(self):
+        """
+        Closes all pooled database connections.
+        """
+        self.pool.close()
+
     def execute_query(self, query: str, params: tuple = None) -> Dict[str, Any]:
         """
         Executes a SQL query on the database.
@@ -172,31 +258,95 @@ class DatabaseService:
             A dictionary containing query execution results.
         """
         try:
-            conn = self._get_connection()
-            cur = conn.cursor()
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                if params:
+                    cur.execute(query, params)
+                else:
+                    cur.execute(query)
+
+                if query.strip().upper().startswith('SELECT'):
+                    result = [dict(row) for row in cur.fetchall()]
+                    response = {"success": True, "data": result}
+                else:
+                    # rows of a RETURNING clause
+                    rows = [dict(row) for row in cur.fetchall()] if cur.description else None
+                    conn.commit()
+                    response = {"success": True, "affected_rows": cur.rowcount}
+                    if rows is not None:
+                        response["data"] = rows
 
-            if params:
-                cur.execute(query, params)
-            else:
-                cur.execute(query)
+            return response
 
-            if query.strip().upper().startswith('SELECT'):
-                result = [dict(row) for row in cur.fetchall()]
-                response = {"success": True, "data": result}
-            else:
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def _execute_statement(self, key: tuple, query: str, params: tuple) -> Dict[str, Any]:
+        """
+        Executes a CRUD statement as prepared statement of the borrowed connection.
+
+        Parameters
+        ----------
+        key : tuple
+            The shape of the statement, (operation, table, columns, conditions).
+        query : str
+            The SQL statement with `%s` placeholders.
+        params : tuple
+            The parameters to be used in the statement.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A dictionary containing query execution results.
+        """
+        try:
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                self.statements.execute(cur, key, query, params)
+                if key[0] == "select":
+                    return {"success": True, "data": [dict(row) for row in cur.fetchall()]}
+                rows = [dict(row) for row in cur.fetchall()] if cur.description else None
                 conn.commit()
                 response = {"success": True, "affected_rows": cur.rowcount}
-
-            return response
+                if rows is not None:
+                    response["data"] = rows
+                return response
 
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-        finally:
-            cur.close()
-            conn.close()
+    @staticmethod
+    def _check_identifiers(table: str, columns: Iterable[str] = ()) -> None:
+        """
+        Checks the table and column names that are written into a statement.
+
+        Raises
+        ------
+        ValueError
+            If a name is not a plain identifier, e.g. an expression.
+        """
+        check_identifier(table, "table")
+        for column in columns:
+            check_identifier(column)
 
-    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _returning_clause(returning: Optional[List[str]]) -> str:
+        """
+        Builds the RETURNING clause for the given columns.
+
+        Raises
+        ------
+        ValueError
+            If a column is not a plain column name.
+        """
+        if not returning:
+            return ""
+        return f" RETURNING {', '.join(check_identifier(col) for col in returning)}"
+
+    def insert(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        returning: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Inserts a record into the specified table.
 
@@ -206,22 +356,96 @@ class DatabaseService:
             The name of the table to insert data into.
         data : Dict[str, Any]
             A dictionary of column names and values to insert.
+        returning : List[str], optional
+            Columns of the inserted record to return, e.g. generated keys like ["id"].
 
         Returns
         -------
         Dict[str, Any]
-            A dictionary with the operation result.
+            A dictionary with the operation result, with the `returning` columns of
+            the inserted record as `data`.
         """
+        try:
+            self._check_identifiers(table, data)
+            returning_clause = self._returning_clause(returning)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
         columns = ", ".join(data.keys())
         placeholders = ", ".join(["%s"] * len(data))
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-        return self.execute_query(query, tuple(data.values()))
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}){returning_clause}"
+        key = ("insert", table, tuple(data), tuple(returning or ()))
+        return self._execute_statement(key, query, tuple(data.values()))
+
+    @staticmethod
+    def _where(
+        conditions: Optional[str],
+        params: Optional[tuple],
+        filters: Optional[list],
+    ) -> Tuple[Optional[str], tuple]:
+        """
+        Returns the WHERE clause and its parameters from either raw conditions or a
+        structured filter, see `utils.filters`.
+
+        Raises
+        ------
+        ValueError
+            If both conditions and filters are given, the conditions have no params
+            or the filter is malformed.
+        """
+        if filters is None:
+            if conditions and not params:
+                raise ValueError("Conditions without params are not supported, "
+                                 "use filters or pass the values as params")
+            return conditions, tuple(params or ())
+        if conditions:
+            raise ValueError("Pass either conditions or filters, not both")
+        return compile_filters(filters)
+
+    @staticmethod
+    def _select_query(
+        table: str,
+        fields: Optional[List[str]],
+        where: Optional[str],
+        order_by: Optional[List[str]],
+        limit: Optional[int],
+        offset: Optional[int],
+    ) -> Tuple[str, tuple]:
+        """
+        Builds a SELECT statement. LIMIT and OFFSET are parameters, so pages share one
+        statement.
+
+        Raises
+        ------
+        ValueError
+            If the table, a field or a page bound is invalid.
+        """
+        DatabaseService._check_identifiers(table, fields or ())
+        fields_str = "*" if not fields else ", ".join(fields)
+        query = f"SELECT {fields_str} FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {compile_order_by(order_by)}"
+        params = []
+        for clause, value in (("LIMIT", limit), ("OFFSET", offset)):
+            if value is None:
+                continue
+            if int(value) < 0:
+                raise ValueError(f"{clause} must not be negative")
+            query += f" {clause} %s"
+            params.append(int(value))
+        return query, tuple(params)
 
     def select(
         self,
         table: str,
         conditions: Optional[str] = None,
         fields: Optional[List[str]] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+        order_by: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Retrieves records from a table based on optional conditions.
@@ -231,26 +455,100 @@ class DatabaseService:
         table : str
             The name of the table to retrieve data from.
         conditions : str, optional
-            The WHERE clause conditions.
+            The WHERE clause conditions, with `%s` placeholders for `params`.
         fields : List[str], optional
             The specific fields to retrieve.
+        params : tuple, optional
+            The values of the placeholders in `conditions`, required with
+            `conditions`.
+        filters : list, optional
+            A structured filter instead of `conditions`, e.g. `[["user_id", "=", 1]]`,
+            see `utils.filters.compile_filters`.
+        order_by : List[str], optional
+            Columns to sort by, each optionally followed by "asc" or "desc".
+        limit : int, optional
+            The maximum number of records to return.
+        offset : int, optional
+            The number of records to skip, for paging through large results.
 
         Returns
         -------
         Dict[str, Any]
             A dictionary containing the query results.
         """
-        fields_str = "*" if not fields else ", ".join(fields)
-        query = f"SELECT {fields_str} FROM {table}"
-        if conditions:
-            query += f" WHERE {conditions}"
-        return self.execute_query(query)
+        try:
+            where, params = self._where(conditions, params, filters)
+            query, page_params = self._select_query(table, fields, where, order_by, limit,
+                                                    offset)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
+        key = ("select", table, tuple(fields or ()), where, tuple(order_by or ()),
+               limit is not None, offset is not None)
+        return self._execute_statement(key, query, params + page_params)
+
+    def stream_select(
+        self,
+        table: str,
+        conditions: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
+        order_by: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams records from a table, `batch_size` rows at a time.
+
+        The rows are read from a named server-side cursor, so only one batch is held
+        in memory no matter how large the result is. The connection stays borrowed
+        until the iterator is exhausted or closed.
+
+        Parameters
+        ----------
+        table, conditions, fields, params, filters, order_by, limit, offset
+            As for `select`.
+        batch_size : int
+            Number of rows fetched from the server per round trip.
+
+        Yields
+        ------
+        Dict[str, Any]
+            The records.
+
+        Raises
+        ------
+        ValueError
+            If the conditions or filters are invalid.
+        psycopg2.Error
+            If the query fails.
+        """
+        where, params = self._where(conditions, params, filters)
+        query, page_params = self._select_query(table, fields, where, order_by, limit, offset)
+        params += page_params
+
+        with self.pool.connection() as conn, \
+                conn.cursor(name=f"stream_select_{next(_cursor_ids)}") as cur:
+            if params:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
 
     def update(
         self,
         table: str,
         values: Dict[str, Any],
-        conditions: str,
+        conditions: Optional[str] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
     ) -> Dict[str, Any]:
         """
         Updates records in a table based on conditions.
@@ -261,22 +559,39 @@ class DatabaseService:
             The table name.
         values : Dict[str, Any]
             Dictionary of column-value pairs to update.
-        conditions : str
-            The WHERE clause specifying which records to update.
+        conditions : str, optional
+            The WHERE clause specifying which records to update, with `%s`
+            placeholders for `params`.
+        params : tuple, optional
+            The values of the placeholders in `conditions`, required with
+            `conditions`.
+        filters : list, optional
+            A structured filter instead of `conditions`, see `select`.
 
         Returns
         -------
         Dict[str, Any]
             A dictionary with the operation result.
         """
+        try:
+            self._check_identifiers(table, values)
+            where, params = self._where(conditions, params, filters)
+            if not where:
+                raise ValueError("Conditions required for update")
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
         set_values = ", ".join([f"{k} = %s" for k in values.keys()])
-        query = f"UPDATE {table} SET {set_values} WHERE {conditions}"
-        return self.execute_query(query, tuple(values.values()))
+        query = f"UPDATE {table} SET {set_values} WHERE {where}"
+        key = ("update", table, tuple(values), where)
+        return self._execute_statement(key, query, tuple(values.values()) + params)
 
     def delete(
         self,
         table: str,
-        conditions: str,
+        conditions: Optional[str] = None,
+        params: Optional[tuple] = None,
+        filters: Optional[list] = None,
     ) -> Dict[str, Any]:
         """
         Deletes records from a table based on conditions.
@@ -285,61 +600,215 @@ class DatabaseService:
         ----------
         table : str
             The table name.
-        conditions : str
-            The WHERE clause specifying which records to delete.
+        conditions : str, optional
+            The WHERE clause specifying which records to delete, with `%s`
+            placeholders for `params`.
+        params : tuple, optional
+            The values of the placeholders in `conditions`, required with
+            `conditions`.
+        filters : list, optional
+            A structured filter instead of `conditions`, see `select`.
 
         Returns
         -------
         Dict[str, Any]
             A dictionary with the operation result.
         """
-        query = f"DELETE FROM {table} WHERE {conditions}"
-        return self.execute_query(query)
+        try:
+            self._check_identifiers(table)
+            where, params = self._where(conditions, params, filters)
+            if not where:
+                raise ValueError("Conditions required for delete")
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
+        query = f"DELETE FROM {table} WHERE {where}"
+        return self._execute_statement(("delete", table, (), where), query, params)
+
+    @staticmethod
+    def _conflict_clause(
+        columns: List[str],
+        on_conflict: Optional[str],
+        conflict_columns: Optional[List[str]],
+    ) -> str:
+        """
+        Builds the ON CONFLICT clause of an upsert.
+
+        Parameters
+        ----------
+        columns : List[str]
+            The inserted columns.
+        on_conflict : str, optional
+            "nothing" to skip conflicting rows, "update" to overwrite them.
+        conflict_columns : List[str], optional
+            The columns of the unique constraint, required for "update".
+
+        Returns
+        -------
+        str
+            The clause, empty if `on_conflict` is None.
+
+        Raises
+        ------
+        ValueError
+            If the conflict action is unknown or the conflict columns are missing.
+        """
+        if on_conflict is None:
+            return ""
+        if on_conflict not in CONFLICT_ACTIONS:
+            raise ValueError(f"on_conflict must be one of {CONFLICT_ACTIONS}, got {on_conflict}")
+        for col in conflict_columns or ():
+            check_identifier(col)
+        target = f" ({', '.join(conflict_columns)})" if conflict_columns else ""
+        if on_conflict == "nothing":
+            return f" ON CONFLICT{target} DO NOTHING"
+
+        if not conflict_columns:
+            raise ValueError("conflict_columns are required to update conflicting rows")
+        updates = [col for col in columns if col not in conflict_columns]
+        if not updates:
+            return f" ON CONFLICT{target} DO NOTHING"
+        set_values = ", ".join(f"{col} = EXCLUDED.{col}" for col in updates)
+        return f" ON CONFLICT{target} DO UPDATE SET {set_values}"
+
+    @staticmethod
+    def _to_csv(data: List[Dict[str, Any]], columns: List[str]) -> io.StringIO:
+        """
+        Serializes rows for COPY ... (FORMAT csv).
+
+        None is written as an unquoted empty field, which CSV COPY reads as NULL. All
+        other values are quoted, so empty strings and any other text stay strings.
+        """
+
+        def field(value: Any) -> str:
+            if value is None:
+                return ""
+            return '"' + str(value).replace('"', '""') + '"'
+
+        buffer = io.StringIO()
+        for item in data:
+            buffer.write(",".join(field(item[col]) for col in columns) + "\n")
+        buffer.seek(0)
+        return buffer
 
     def bulk_insert(
         self,
         table: str,
         data: List[Dict[str, Any]],
+        method: str = "values",
+        page_size: int = 1000,
+        on_conflict: Optional[str] = None,
+        conflict_columns: Optional[List[str]] = None,
+        returning: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Performs a bulk insert into the specified table.
 
+        All rows are inserted in a single transaction. With `method="values"` the
+        rows are sent as multi-row `INSERT ... VALUES` statements of `page_size` rows
+        each. With `method="copy"` they are streamed with `COPY FROM STDIN`, which is
+        the fastest option for thousands of rows. Upserts and `returning` with `COPY`
+        go through a temporary staging table.
+
         Parameters
         ----------
         table : str
             The name of the table to insert data into.
         data : List[Dict[str, Any]]
             A list of dictionaries containing column-value pairs.
+        method : str
+            "values" or "copy".
+        page_size : int
+            Number of rows per INSERT statement for `method="values"`.
+        on_conflict : str, optional
+            "nothing" to skip rows that violate a unique constraint, "update" to
+            overwrite the existing rows with the new values.
+        conflict_columns : List[str], optional
+            The columns of the unique constraint, e.g. ["listing_id"]. Required
+            for `on_conflict="update"`.
+        returning : List[str], optional
+            Columns to return of every inserted or updated row, e.g. ["id"]. Rows
+            skipped with `on_conflict="nothing"` are not returned.
 
         Returns
         -------
         Dict[str, Any]
-            A dictionary with the operation result.
+            A dictionary with the operation result, with the `returning` columns as
+            `data`.
         """
         if not data:
-            return {"success": True, "affected_rows": 0}
+            return {"success": True, "affected_rows": 0, "data": []} if returning \
+                else {"success": True, "affected_rows": 0}
 
-        columns = data[0].keys()
+        columns = list(data[0].keys())
         columns_str = ", ".join(columns)
-        placeholders = ", ".join(["%s"] * len(columns))
-        query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
 
         try:
-            conn = self._get_connection()
-            cur = conn.cursor()
+            self._check_identifiers(table, columns)
+            if method not in BULK_INSERT_METHODS:
+                raise ValueError(f"method must be one of {BULK_INSERT_METHODS}, got {method}")
+            conflict = self._conflict_clause(columns, on_conflict, conflict_columns)
+            returning_clause = self._returning_clause(returning)
+
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                if method == "copy":
+                    rows_affected, rows = self._copy_insert(cur, table, data, columns,
+                                                            conflict, returning_clause)
+                else:
+                    query = (f"INSERT INTO {table} ({columns_str}) "
+                             f"VALUES %s{conflict}{returning_clause}")
+                    rows_affected, rows = 0, []
+                    for start in range(0, len(data), page_size):
+                        page = [tuple(item[col] for col in columns)
+                                for item in data[start:start + page_size]]
+                        page_rows = execute_values(cur, query, page, page_size=len(page),
+                                                   fetch=bool(returning))
+                        rows_affected += cur.rowcount
+                        if returning:
+                            rows.extend(dict(row) for row in page_rows)
 
-            rows_affected = 0
-            for item in data:
-                values = tuple(item[col] for col in columns)
-                cur.execute(query, values)
-                rows_affected += cur.rowcount
-
-            conn.commit()
-            return {"success": True, "affected_rows": rows_affected}
+                conn.commit()
+            response = {"success": True, "affected_rows": rows_affected}
+            if returning:
+                response["data"] = rows
+            return response
 
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-        finally:
-            cur.close()
-            conn.close()
+    def _copy_insert(
+        self,
+        cur,
+        table: str,
+        data: List[Dict[str, Any]],
+        columns: List[str],
+        conflict: str,
+        returning_clause: str = "",
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Streams rows into a table with COPY FROM STDIN.
+
+        COPY can neither resolve conflicts nor return rows, so for upserts and
+        `returning_clause` the rows are copied into a temporary table first and then
+        moved with INSERT ... SELECT ... ON CONFLICT ... RETURNING.
+
+        Returns
+        -------
+        Tuple[int, List[Dict[str, Any]]]
+            The number of inserted or updated rows and the returned rows.
+        """
+        columns_str = ", ".join(columns)
+        copy_options = "(FORMAT csv)"
+        buffer = self._to_csv(data, columns)
+        if not conflict and not returning_clause:
+            cur.copy_expert(f"COPY {table} ({columns_str}) FROM STDIN {copy_options}", buffer)
+            return cur.rowcount, []
+
+        staging = f"_bulk_insert_{table}"
+        cur.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) "
+                    f"ON COMMIT DROP")
+        cur.copy_expert(f"COPY {staging} ({columns_str}) FROM STDIN {copy_options}", buffer)
+        cur.execute(f"INSERT INTO {table} ({columns_str}) "
+                    f"SELECT {columns_str} FROM {staging}{conflict}{returning_clause}")
+        rows = [dict(row) for row in cur.fetchall()] if returning_clause else []
+        return cur.rowcount, rows
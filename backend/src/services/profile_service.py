@@ -86,7 +86,7 @@ class ProfileService:
 
         result = self.db_client.select(
             table="users",
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
             fields=["profile_photo"],
         )
         if result["success"] and result["data"][0].get("profile_photo"):
@@ -109,7 +109,7 @@ class ProfileService:
         self.db_client.update(
             table="users",
             data={"profile_photo": photo_url},
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
         )
 
         return photo_url
@@ -138,7 +138,7 @@ class ProfileService:
         # Check if the name exists in the database
         result = self.db_client.select(
             table="users",
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
             fields=["first_name", "last_name"],
         )
 
@@ -166,7 +166,7 @@ class ProfileService:
                 "first_name": first_name,
                 "last_name": last_name
             },
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
         )
 
         return {
@@ -198,7 +198,7 @@ class ProfileService:
         # Check if the address exists in the database
         result = self.db_client.select(
             table="users",
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
             fields=["city", "postal_code", "street_and_house_number"],
         )
 
@@ -232,7 +232,7 @@ class ProfileService:
                 "postal_code": postal_code,
                 "street_and_house_number": street_address
             },
-            conditions=f"id = '{user_id}'",
+            filters=[["id", "=", user_id]],
         )
         return {
             "city": city,
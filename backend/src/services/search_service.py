@@ -102,21 +102,11 @@ class SearchService:
         result = self.db_client.insert(
             "searches",
             search_data,
+            returning=["id"],
         )
-        if not result["success"]:
+        if not result["success"] or not result.get("data"):
             raise HTTPException(status_code=500, detail="Failed to create search configuration")
 
-        # Get the created search ID
-        result = self.db_client.execute_query(
-            """
-            SELECT id FROM searches 
-            WHERE user_id = %s AND name = %s
-            ORDER BY created_at DESC LIMIT 1
-            """, (user_id, config.name))
-
-        if not result["success"] or not result["data"]:
-            raise HTTPException(status_code=500, detail="Failed to retrieve created search ID")
-
         return str(result["data"][0]["id"])
 
     def update_search(
@@ -130,7 +120,7 @@ class SearchService:
         # Verify search belongs to user
         result = self.db_client.select(
             "searches",
-            conditions=f"id = {search_id} AND user_id = {user_id}",
+            filters=[["id", "=", search_id], ["user_id", "=", user_id]],
         )
         if not result["success"] or not result["data"]:
             raise HTTPException(status_code=404, detail="Search configuration not found")
@@ -144,7 +134,7 @@ class SearchService:
         result = self.db_client.update(
             "searches",
             search_data,
-            conditions=f"id = {search_id}",
+            filters=[["id", "=", search_id]],
         )
         if not result["success"]:
             raise HTTPException(
@@ -162,7 +152,7 @@ class SearchService:
         # Verify search belongs to user
         result = self.db_client.select(
             "searches",
-            conditions=f"id = {search_id} AND user_id = {user_id}",
+            filters=[["id", "=", search_id], ["user_id", "=", user_id]],
         )
         if not result["success"] or not result["data"]:
             raise HTTPException(
@@ -171,7 +161,7 @@ class SearchService:
             )
 
         # Delete search
-        result = self.db_client.delete("searches", f"id = {search_id}")
+        result = self.db_client.delete("searches", filters=[["id", "=", search_id]])
         if not result["success"]:
             raise HTTPException(
                 status_code=500,
@@ -186,7 +176,7 @@ class SearchService:
 
         result = self.db_client.select(
             "searches",
-            conditions=f"user_id = {user_id}",
+            filters=[["user_id", "=", user_id]],
             fields=[
                 "id", "name", "location", "property_types", "rent_types", "date_range_start",
                 "date_range_end", "districts", "max_price", "min_size", "wg_types",
@@ -1,56 +1,44 @@
 # in src folder
+import atexit
 import json
 import os
-import time
-
-from selenium import webdriver
-from selenium.common.exceptions import (
-    ElementNotInteractableException,
-    NoSuchElementException,
-    StaleElementReferenceException,
-    TimeoutException,
-)
-from selenium.webdriver.chrome.service import Service
+
+from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from src import OpenAIHelper
+from utils.browser_manager import BrowserManager
+from utils.browser_wrapper import BrowserWrapper
+from utils.wait import Waiter
 
+SUBMIT_BUTTON_XPATH = "//button[@data-ng-click='submit()' or contains(.,'Senden')]"
 
-def get_element(driver, by, id):
-    ignored_exceptions = (
-        StaleElementReferenceException,
-        NoSuchElementException,
-        ElementNotInteractableException,
-    )
-    remove_cookies_popup(driver)
-    try:
-        wait = WebDriverWait(driver, 10, poll_frequency=1)
-        element = wait.until(EC.visibility_of_element_located((by, id)))
-    except TimeoutException:
-        wait = WebDriverWait(driver, 30, poll_frequency=1)
-        element = wait.until(EC.presence_of_element_located((by, id)))
-    if isinstance(element, list):
-        element = element[0]
-    return element
+_browser_manager = None
 
 
-def click_button(driver, by, id):
-    remove_cookies_popup(driver)
-    driver.implicitly_wait(2)
-    try:
-        element = get_element(driver, by, id)
-        driver.implicitly_wait(2)
-        element.click()
-    except ElementNotInteractableException:
-        raise ElementNotInteractableException()
+def get_browser_manager() -> BrowserManager:
+    """Return the browser manager that keeps one logged in Chrome per account."""
+    global _browser_manager
+    if _browser_manager is None:
+        _browser_manager = BrowserManager()
+        atexit.register(_browser_manager.close_all)
+    return _browser_manager
+
+
+def get_element(driver, by, id, waiter=None):
+    waiter = waiter or Waiter(driver)
+    return waiter.element(by, id)
+
+
+def click_button(driver, by, id, waiter=None):
+    waiter = waiter or Waiter(driver)
+    waiter.click(by, id)
 
 
 def click_at_coordinates(driver, x, y):
     remove_cookies_popup(driver)
-    driver.implicitly_wait(2)
     action = ActionChains(driver)
     action.move_by_offset(x, y).click().perform()
 
@@ -63,13 +51,9 @@ def remove_cookies_popup(driver):
         driver.execute_script("arguments[0].remove();", div)
 
 
-def send_keys(driver, by, id, send_str):
-    driver.implicitly_wait(2)
-    try:
-        element = get_element(driver, by, id)
-        element.send_keys(send_str)
-    except ElementNotInteractableException:
-        raise ElementNotInteractableException(f"Could not enter: {send_str}")
+def send_keys(driver, by, id, send_str, waiter=None):
+    waiter = waiter or Waiter(driver)
+    waiter.send_keys(by, id, send_str)
 
 
 def gpt_get_language(config, logger) -> str:
@@ -138,42 +122,77 @@ def gpt_get_keyword(config, logger) -> str:
     return response_json.get("keyword", "")
 
 
+def login(driver, logger, waiter=None):
+    waiter = waiter or Waiter(driver)
+
+    # my account button
+    click_button(driver, By.XPATH, "//*[contains(text(), 'Mein Konto')]", waiter)
+
+    # enter email
+    send_keys(
+        driver, By.ID, "login_email_username", os.getenv("EMAIL"), waiter
+    )
+
+    # enter password
+    send_keys(
+        driver, By.ID, "login_password", os.getenv("PASSWORD"), waiter
+    )
+
+    # login button
+    click_button(driver, By.ID, "login_submit", waiter)
+
+    # the login form closes once the session is established
+    try:
+        waiter.until(EC.invisibility_of_element_located((By.ID, "login_submit")), "login")
+        logger.info("Logged in.")
+    except TimeoutException:
+        logger.info("Login form did not close, continuing anyway.")
+
+
 def submit_app(config, logger):
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument("--log-level=3")
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox") # <- this bad boi is needed when running in container
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")  # Optional for environments with no GPU
-    chrome_options.add_argument("--window-size=1920x1080")  # Ensures proper rendering
-
-
-    # add the argument to reuse an existing tab
-    if config["run_headless"]:
-        chrome_options.headless = True
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--reuse-tab")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-
-    # create the ChromeDriver object and log
+    """Send the application message to the listing in `config["ref"]`.
+
+    The browser of the account is kept open and logged in between calls. The login
+    is only repeated if the session of the already loaded message page expired.
+
+    Every step waits for an explicit condition, polled every
+    `config["wait_poll_interval"]` seconds (default 0.1) for at most
+    `config["wait_budget_seconds"]` (default 10). The time each step waited is
+    logged at the end.
+    """
+    account = os.getenv("EMAIL") or "default"
+    browser_manager = get_browser_manager()
     try:
-        service_log_path = "chromedriver.log"
-        service_args = ["--verbose"]
-        driver = webdriver.Chrome(
-            service=Service(executable_path=config["chromedriver_path"]),
-            options=chrome_options,
-            service_args=service_args,
-            service_log_path=service_log_path,
+        browser = browser_manager.get_browser_for_user(
+            account,
+            run_headless=config["run_headless"],
+            chromedriver_path=config["chromedriver_path"],
         )
-        if not config["run_headless"]:
-            driver.maximize_window()
-        driver.get("https://www.wg-gesucht.de/nachricht-senden" + config["ref"])
     except Exception as e:
         logger.info(
             "Chrome crashed! You might be trying to run it without a screen in terminal?"
         )
         raise e
 
+    waiter = Waiter(
+        browser.driver,
+        poll_interval=config.get("wait_poll_interval", 0.1),
+        budget=config.get("wait_budget_seconds", 10),
+    )
+    try:
+        return _submit_app(browser, waiter, config, logger)
+    except Exception:
+        # the page is in an unknown state, start over with a new browser next time
+        browser_manager.close_user_browser(account)
+        raise
+    finally:
+        logger.info(f"Submit {waiter.summary()}")
+
+
+def _submit_app(browser: BrowserWrapper, waiter: Waiter, config, logger):
+    driver = browser.driver
+    driver.get("https://www.wg-gesucht.de/nachricht-senden" + config["ref"])
+
     # # accept cookies button
     # click_button(driver, By.XPATH, "//*[contains(text(), 'Accept all')]")
     # click_button(driver, By.XPATH, "//*[contains(text(), 'Akzeptieren')]")
@@ -181,52 +200,44 @@ def submit_app(config, logger):
     # as "Akzeptieren" doesn't show on headless Firefox on Linux for some reason
     remove_cookies_popup(driver)
 
-    # my account button
-    click_button(driver, By.XPATH, "//*[contains(text(), 'Mein Konto')]")
-
-    # enter email
-    send_keys(
-        driver, By.ID, "login_email_username", os.getenv("EMAIL")
-    )
-
-    # enter password
-    send_keys(
-        driver, By.ID, "login_password", os.getenv("PASSWORD")
+    if browser.has_session():
+        logger.info("Reusing logged in session.")
+    else:
+        login(driver, logger, waiter)
+        remove_cookies_popup(driver)
+
+    # wait until either the message form or a previously sent message is shown
+    waiter.until(
+        EC.any_of(
+            EC.presence_of_element_located((By.ID, "message_input")),
+            EC.presence_of_element_located((By.ID, "message_timestamp")),
+        ),
+        "message page",
     )
 
-    # login button
-    click_button(driver, By.ID, "login_submit")
-    logger.info("Logged in.")
-
-    remove_cookies_popup(driver)
-
     # remove lightbox div that blocks attachments
     divs_to_remove = driver.find_elements(By.XPATH, "//div[@class='lightbox']")
     for div in divs_to_remove:
         driver.execute_script("arguments[0].remove();", div)
 
     # occasionally wg-gesucht gives you advice on how to stay safe.
-    try:
-        click_button(driver, By.ID, "sicherheit_bestaetigung")
-    except:
+    if waiter.exists(By.ID, "sicherheit_bestaetigung"):
+        try:
+            click_button(driver, By.ID, "sicherheit_bestaetigung", waiter)
+        except ElementNotInteractableException:
+            logger.info("Could not confirm security check.")
+    else:
         logger.info("No security check.")
 
-    driver.implicitly_wait(2)
-
     # checks if its possible to sent message to listing.
-    try:
-        _ = get_element(driver, By.ID, "message_timestamp")
+    if waiter.exists(By.ID, "message_timestamp"):
         logger.info("Message has already been sent previously. Will skip this offer.")
-        driver.quit()
         return False
-    except:
-        logger.info("No message has been sent. Will send now...")
+    logger.info("No message has been sent. Will send now...")
 
     logger.info(f"Sending to: {config['user_name']}, {config['address']}.")
 
-    driver.implicitly_wait(2)
-
-    text_area = get_element(driver, By.ID, "message_input")
+    text_area = get_element(driver, By.ID, "message_input", waiter)
     if text_area:
         text_area.clear()
 
@@ -266,22 +277,18 @@ def submit_app(config, logger):
         text_area.send_keys(message)
     except:
         logger.info(f"{message_file} file not found!")
-        driver.quit()
         return False
 
-    driver.implicitly_wait(2)
-
     try:
-        click_button(
-            driver,
-            By.XPATH,
-            "//button[@data-ng-click='submit()' or contains(.,'Senden')]",
-        )
-        logger.info(f">>>> Message sent to: {config['ref']} <<<<")
-        time.sleep(2)
-        driver.quit()
-        return True
+        click_button(driver, By.XPATH, SUBMIT_BUTTON_XPATH, waiter)
     except ElementNotInteractableException:
         logger.info("Cannot find submit button!")
-        driver.quit()
         return False
+    logger.info(f">>>> Message sent to: {config['ref']} <<<<")
+
+    # sent messages are shown with a timestamp
+    try:
+        waiter.until(EC.presence_of_element_located((By.ID, "message_timestamp")), "sent")
+    except TimeoutException:
+        logger.info("Could not confirm that the message was delivered.")
+    return True
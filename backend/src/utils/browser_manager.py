@@ -1,63 +1,332 @@
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
+import os
 import threading
 import time
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from utils.browser_wrapper import BrowserWrapper
 
+DEFAULT_CHROMEDRIVER_PATH = "/usr/local/bin/chromedriver"
+
 
 class BrowserManager:
+    """
+    Gives every user their own Chrome browser.
+
+    Launching Chrome takes seconds. The manager can therefore keep a pool of
+    `warm_size` launched headless browsers that are not assigned to a user yet. A
+    user's first request takes one of them, and the pool is refilled in the
+    background. At most `max_size` browsers run at once, assigned or not, requests
+    that need a new browser beyond that wait up to `acquire_timeout` seconds for
+    another one to be closed.
+
+    `lock` only guards the maps of browsers. Browsers are launched outside of it,
+    under a lock per user, so a cold start for one user does not block the others.
 
-    def __init__(self):
-        self.active_browsers: Dict[str, Tuple[BrowserWrapper, str]] = {}
+    Parameters
+    ----------
+    warm_size : int
+        Number of launched, unassigned browsers to keep ready.
+    max_size : int, optional
+        Maximum number of running browsers, unlimited if None.
+    acquire_timeout : float
+        Seconds to wait for a free browser when `max_size` browsers are running.
+    chromedriver_path : str
+        Chromedriver of the pooled browsers. Requests for browsers with another
+        driver or with a visible window always launch a new one.
+    """
+
+    def __init__(
+        self,
+        warm_size: int = 0,
+        max_size: Optional[int] = None,
+        acquire_timeout: float = 60.0,
+        chromedriver_path: str = DEFAULT_CHROMEDRIVER_PATH,
+    ):
+        if max_size is not None and max_size < max(warm_size, 1):
+            raise ValueError(f"max_size must be at least 1 and warm_size, got {max_size}")
+        self.warm_size = warm_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.chromedriver_path = chromedriver_path
+
+        self.active_browsers: Dict[str, Tuple[BrowserWrapper, float]] = {}
         # user_id -> (browser_wrapper, last_active_time)
         self.lock = threading.Lock()
+        # notified whenever a browser is closed, added to the pool or fails to launch
+        self._browsers_changed = threading.Condition(self.lock)
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._idle: List[BrowserWrapper] = []
+        # browsers being launched or handed to a user, counted against max_size
+        self._pending = 0
+        self._refilling = False
+        self._closed = False
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._last_error: Optional[str] = None
+
+        self._refill_async()
+
+    @classmethod
+    def from_env(cls) -> "BrowserManager":
+        """
+        Create a manager configured by `BROWSER_POOL_WARM_SIZE`, `BROWSER_POOL_MAX_SIZE`
+        and `BROWSER_ACQUIRE_TIMEOUT`. Without them, no browsers are pre-launched and
+        their number is not limited.
+        """
+        max_size = os.getenv("BROWSER_POOL_MAX_SIZE")
+        return cls(warm_size=int(os.getenv("BROWSER_POOL_WARM_SIZE", "0")),
+                   max_size=int(max_size) if max_size else None,
+                   acquire_timeout=float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "60")))
+
+    def get_browser_for_user(
+        self,
+        user_id: str,
+        run_headless: bool = True,
+        chromedriver_path: str = DEFAULT_CHROMEDRIVER_PATH,
+    ) -> BrowserWrapper:
+        """
+        Return the user's browser, assigning a pooled or new one on first use.
+
+        Raises
+        ------
+        TimeoutError
+            If `max_size` browsers are running and none was closed within
+            `acquire_timeout` seconds.
+        """
+        while True:
+            with self.lock:
+                user_lock = self._user_locks.setdefault(user_id, threading.Lock())
+            with user_lock:
+                with self.lock:
+                    # the lock is dropped once the user has no browser, take the new one
+                    if self._user_locks.get(user_id) is not user_lock:
+                        continue
+                return self._get_browser_locked(user_id, run_headless, chromedriver_path)
+
+    def _get_browser_locked(self, user_id: str, run_headless: bool,
+                            chromedriver_path: str) -> BrowserWrapper:
+        """Return the user's browser, called with the user's lock held."""
+        with self.lock:
+            entry = self.active_browsers.get(user_id)
+        if entry is not None:
+            browser_wrapper = entry[0]
+            if browser_wrapper.is_alive():
+                with self.lock:
+                    if user_id in self.active_browsers:
+                        self.active_browsers[user_id] = (browser_wrapper, time.time())
+                        return browser_wrapper
+            else:
+                # browser crashed or was closed, assign a new one below
+                self._remove(user_id, browser_wrapper)
+                self._quit_quietly(browser_wrapper)
 
-    def get_browser_for_user(self, user_id: str, run_headless: bool = True) -> BrowserWrapper:
-        with self.lock:
-            if user_id in self.active_browsers:
-                browser_wrapper, last_active = self.active_browsers[user_id]
-                self.active_browsers[user_id] = (browser_wrapper, time.time())
-                return browser_wrapper
-
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument("--log-level=3")
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument(
-                "--no-sandbox")  # <- this bad boi is needed when running in container
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")  # Optional for environments with no GPU
-            chrome_options.add_argument("--window-size=1920x1080")  # Ensures proper rendering
-
-            if run_headless:
-                chrome_options.headless = True
-                chrome_options.add_argument("--window-size=1920,1080")
-                chrome_options.add_argument("--reuse-tab")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            driver = webdriver.Chrome(
-                service=Service(executable_path="/usr/local/bin/chromedriver"),
-                options=chrome_options)
-
-            browser_wrapper = BrowserWrapper(driver)
+        browser_wrapper = self._acquire(
+            pooled=run_headless and chromedriver_path == self.chromedriver_path,
+            run_headless=run_headless,
+            chromedriver_path=chromedriver_path,
+        )
+        with self.lock:
+            self._pending -= 1
             self.active_browsers[user_id] = (browser_wrapper, time.time())
-            return browser_wrapper
+        self._refill_async()
+        return browser_wrapper
 
-    def cleanup_inactive_browsers(self, max_idle_time=3600):
+    def _has_slot(self) -> bool:
+        """Whether another browser may be launched, called with `lock` held."""
+        running = len(self.active_browsers) + len(self._idle) + self._pending
+        return self.max_size is None or running < self.max_size
+
+    def _acquire(self, pooled: bool, run_headless: bool, chromedriver_path: str) -> BrowserWrapper:
+        """
+        Take a browser from the pool or launch a new one.
+
+        The browser is counted in `_pending` until the caller assigns it.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self.lock:
+                if not self._idle and not self._has_slot():
+                    self._waits += 1
+                    if not self._browsers_changed.wait_for(
+                            lambda: self._idle or self._has_slot(),
+                            timeout=max(0.0, deadline - time.monotonic())):
+                        self._timeouts += 1
+                        raise TimeoutError(f"No browser available within {self.acquire_timeout} "
+                                           f"seconds, all {self.max_size} are in use")
+                # before counting this request, a last free slot is its own to launch in
+                has_slot = self._has_slot()
+                self._pending += 1
+                idle_browser = self._idle.pop() if self._idle and (pooled or not has_slot) \
+                    else None
+
+            if idle_browser is None:
+                with self.lock:
+                    self._pool_misses += 1
+                return self._launch_counted(run_headless, chromedriver_path)
+
+            if pooled and idle_browser.is_alive():
+                with self.lock:
+                    self._pool_hits += 1
+                return idle_browser
+
+            # a pooled browser that died, or one with other options that makes room
+            self._quit_quietly(idle_browser)
+            if not pooled:
+                with self.lock:
+                    self._pool_misses += 1
+                return self._launch_counted(run_headless, chromedriver_path)
+            with self.lock:
+                self._pending -= 1
+                self._browsers_changed.notify_all()
+
+    def _launch_counted(self, run_headless: bool, chromedriver_path: str) -> BrowserWrapper:
+        """Launch a browser that is counted in `_pending`, releasing the count on failure."""
+        try:
+            return self._launch(run_headless, chromedriver_path)
+        except BaseException as e:
+            with self.lock:
+                self._pending -= 1
+                self._last_error = str(e)
+                self._browsers_changed.notify_all()
+            raise
+
+    def _launch(self, run_headless: bool, chromedriver_path: str) -> BrowserWrapper:
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument("--log-level=3")
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument(
+            "--no-sandbox")  # <- this bad boi is needed when running in container
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")  # Optional for environments with no GPU
+        chrome_options.add_argument("--window-size=1920x1080")  # Ensures proper rendering
+
+        if run_headless:
+            chrome_options.headless = True
+            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument("--reuse-tab")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        driver = webdriver.Chrome(
+            service=Service(executable_path=chromedriver_path),
+            options=chrome_options)
+
+        return BrowserWrapper(driver)
+
+    def _refill_async(self):
+        """Start launching browsers in the background until `warm_size` are pooled."""
         with self.lock:
-            current_time = time.time()
-            to_remove = []
+            if self._refilling or not self._needs_refill():
+                return
+            self._refilling = True
+        threading.Thread(target=self._refill, name="browser-pool", daemon=True).start()
 
-            for user_id, (browser_wrapper, last_active) in self.active_browsers.items():
-                if current_time - last_active > max_idle_time:
-                    browser_wrapper.quit()
-                    to_remove.append(user_id)
+    def _needs_refill(self) -> bool:
+        """Whether the pool is short of browsers, called with `lock` held."""
+        return not self._closed and len(self._idle) < self.warm_size and self._has_slot()
 
-            for user_id in to_remove:
+    def _refill(self):
+        try:
+            while True:
+                with self.lock:
+                    if not self._needs_refill():
+                        return
+                    self._pending += 1
+                try:
+                    browser_wrapper = self._launch_counted(True, self.chromedriver_path)
+                except Exception:
+                    # the next assignment tries again, the error is reported by pool_stats
+                    return
+                with self.lock:
+                    self._pending -= 1
+                    closed = self._closed
+                    if not closed:
+                        self._idle.append(browser_wrapper)
+                        self._browsers_changed.notify_all()
+                if closed:
+                    self._quit_quietly(browser_wrapper)
+                    return
+        finally:
+            with self.lock:
+                self._refilling = False
+
+    def _remove(self, user_id: str, browser_wrapper: BrowserWrapper):
+        """Unassign a user's browser, unless it was replaced in the meantime."""
+        with self.lock:
+            entry = self.active_browsers.get(user_id)
+            if entry is not None and entry[0] is browser_wrapper:
                 del self.active_browsers[user_id]
+                self._browsers_changed.notify_all()
+
+    def _drop_user_lock(self, user_id: str):
+        """Forget the lock of a user without browser, called with `lock` held."""
+        user_lock = self._user_locks.get(user_id)
+        if user_lock is not None and user_id not in self.active_browsers \
+                and not user_lock.locked():
+            del self._user_locks[user_id]
+
+    def cleanup_inactive_browsers(self, max_idle_time=3600):
+        with self.lock:
+            current_time = time.time()
+            to_remove = [
+                user_id for user_id, (_, last_active) in self.active_browsers.items()
+                if current_time - last_active > max_idle_time
+            ]
+            removed = [self.active_browsers.pop(user_id)[0] for user_id in to_remove]
+            for user_id in to_remove:
+                self._drop_user_lock(user_id)
+            if removed:
+                self._browsers_changed.notify_all()
+
+        for browser_wrapper in removed:
+            browser_wrapper.quit()
+        self._refill_async()
 
     def close_user_browser(self, user_id: str):
         with self.lock:
-            if user_id in self.active_browsers:
-                browser_wrapper, _ = self.active_browsers[user_id]
-                browser_wrapper.quit()
-                del self.active_browsers[user_id]
+            entry = self.active_browsers.pop(user_id, None)
+            self._drop_user_lock(user_id)
+            if entry is not None:
+                self._browsers_changed.notify_all()
+
+        if entry is not None:
+            entry[0].quit()
+            self._refill_async()
+
+    def close_all(self):
+        """Quit all browsers, including the pooled ones, and stop refilling the pool."""
+        with self.lock:
+            self._closed = True
+            browsers = [browser_wrapper for browser_wrapper, _ in self.active_browsers.values()]
+            browsers += self._idle
+            self.active_browsers.clear()
+            self._idle.clear()
+            self._browsers_changed.notify_all()
+
+        for browser_wrapper in browsers:
+            self._quit_quietly(browser_wrapper)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return the number of assigned, pooled and launching browsers and pool metrics."""
+        with self.lock:
+            return {
+                "active": len(self.active_browsers),
+                "idle": len(self._idle),
+                "pending": self._pending,
+                "warm_size": self.warm_size,
+                "max_size": self.max_size,
+                "pool_hits": self._pool_hits,
+                "pool_misses": self._pool_misses,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "last_error": self._last_error,
+            }
+
+    @staticmethod
+    def _quit_quietly(browser_wrapper: BrowserWrapper):
+        try:
+            browser_wrapper.quit()
+        except WebDriverException:
+            pass
@@ -1,57 +1,38 @@
 import os
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from utils.wait import Waiter
+
+# only rendered in the account menu of a logged in user
+LOGOUT_XPATH = "//a[contains(@href, 'logout') or contains(text(), 'Abmelden')]"
 
 
 class BrowserWrapper:
 
-    def __init__(self, driver):
+    def __init__(self, driver, poll_interval: float = 0.1, budget: float = 10):
         self.driver = driver
         self.user_name = None
+        self.waiter = Waiter(driver, poll_interval=poll_interval, budget=budget)
 
-    def get_element(self, by, id, timeout=10):
-        self.remove_cookies_popup()
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            element = wait.until(EC.visibility_of_element_located((by, id)))
-            return element
-        except TimeoutException:
-            wait = WebDriverWait(self.driver, timeout)
-            element = wait.until(EC.presence_of_element_located((by, id)))
-            return element
+    def get_element(self, by, id, timeout=None):
+        return self.waiter.element(by, id, budget=timeout)
 
     def remove_cookies_popup(self):
-        divs_to_remove = self.driver.find_elements(By.XPATH, "//div[@id='cmpbox' or @id='cmpbox2']")
-        for div in divs_to_remove:
-            self.driver.execute_script("arguments[0].remove();", div)
+        self.waiter.remove_cookies_popup()
 
     def click_button(self, by, id):
-        self.remove_cookies_popup()
-        self.driver.implicitly_wait(2)
-        try:
-            element = self.get_element(by, id)
-            self.driver.implicitly_wait(2)
-            element.click()
-        except ElementNotInteractableException:
-            raise ElementNotInteractableException()
+        self.waiter.click(by, id)
 
     def click_at_coordinates(self, x, y):
         self.remove_cookies_popup()
-        self.driver.implicitly_wait(2)
         action = ActionChains(self.driver)
         action.move_by_offset(x, y).click().perform()
 
     def send_keys(self, by, id, send_str):
-        self.driver.implicitly_wait(2)
-        try:
-            element = self.get_element(by, id)
-            element.send_keys(send_str)
-        except ElementNotInteractableException:
-            raise ElementNotInteractableException(f"Could not enter: {send_str}")
+        self.waiter.send_keys(by, id, send_str)
 
     def navigate_to(self, url):
         self.driver.get(url)
@@ -64,20 +45,25 @@ class BrowserWrapper:
         self.send_keys(By.ID, "login_password", password)
         self.click_button(By.ID, "login_submit")
 
-        # Save screenshot for verification
-        import time
-        time.sleep(0.5)
-        self.screenshot("login_verification")
+        # Checking for the alert element:
+        # Bitte geben Sie eine gültige E-Mail-Adresse und/oder ein Passwort ein.
+        credentials_error = (By.CSS_SELECTOR, "#credentials_error > div > div")
+        try:
+            self.waiter.until(
+                EC.any_of(
+                    EC.invisibility_of_element_located((By.ID, "login_submit")),
+                    EC.visibility_of_element_located(credentials_error),
+                ),
+                "login",
+            )
+        except TimeoutException:
+            pass
         self.remove_cookies_popup()
 
         try:
-            # Checking for the alert element:
-            # Bitte geben Sie eine gültige E-Mail-Adresse und/oder ein Passwort ein.
-            error_element = self.driver.find_element(
-                By.CSS_SELECTOR,
-                "#credentials_error > div > div",
-            )
+            error_element = self.driver.find_element(*credentials_error)
             if error_element.is_displayed():
+                self.waiter.screenshot("login_failed")
                 return False
         except NoSuchElementException:
             pass
@@ -88,11 +74,36 @@ class BrowserWrapper:
         self.navigate_to("https://www.wg-gesucht.de/")
         self.click_button(By.XPATH, "//*[contains(text(), 'Mein Konto')]")
         try:
-            element = self.driver.find_element(By.ID, "login_email_username")
+            # the menu shows the login form to logged out users, the logout link otherwise
+            self.waiter.until(
+                EC.any_of(
+                    EC.visibility_of_element_located((By.ID, "login_email_username")),
+                    EC.presence_of_element_located((By.XPATH, LOGOUT_XPATH)),
+                ),
+                "account menu",
+                budget=2,
+                screenshot=False,
+            )
+        except TimeoutException:
+            # neither showed up, like before only a visible login form counts as logged out
+            return True
+        return self.has_session()
+
+    def has_session(self) -> bool:
+        """Check whether the current page belongs to a logged in session.
+
+        Only inspects the page that is already loaded and does not wait for elements,
+        so it is cheap enough to run before every action that requires a login.
+        """
+        return len(self.driver.find_elements(By.XPATH, LOGOUT_XPATH)) > 0
+
+    def is_alive(self) -> bool:
+        """Check whether the driver still has a working browser session."""
+        try:
+            _ = self.driver.current_url
+            return True
+        except WebDriverException:
             return False
-        except NoSuchElementException:
-            pass
-        return True
 
     def hover_and_click(self, hover_element_locator, click_element_locator):
         hover_element = self.get_element(*hover_element_locator)
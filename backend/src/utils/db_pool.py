@@ -0,0 +1,276 @@
+"""Bounded, thread-safe pool of PostgreSQL connections.
+
+Opening a PostgreSQL connection costs a TCP handshake, authentication and a backend
+fork on the server, which dwarfs the cost of the small queries the database API
+runs. The `ConnectionPool` keeps connections open between queries and lends them
+out to one thread at a time.
+
+Connections are validated before they are lent out: closed or broken connections
+are dropped, and connections that have been idle for a while are pinged with a
+`SELECT 1`. Connections older than `max_lifetime` are closed and replaced, so server
+side resources are released regularly. Time spent waiting for a free connection is
+recorded and reported by `ConnectionPool.stats`.
+
+Notes
+-----
+`psycopg2.pool.ThreadedConnectionPool` raises as soon as all connections are in use
+instead of waiting for one to be returned, and closes returned connections as soon
+as `minconn` are idle, so it does not keep a warm pool under bursts.
+
+Examples
+--------
+>>> pool = ConnectionPool(lambda: psycopg2.connect(...), min_size=1, max_size=10)
+>>> with pool.connection() as conn:
+>>>     with conn.cursor() as cur:
+>>>         cur.execute("SELECT 1")
+>>> pool.stats()
+{'size': 1, 'idle': 1, 'in_use': 0, 'checkouts': 1, 'wait_seconds_total': 0.0, ...}
+>>> pool.close()
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeout(Exception):
+    """Raised if no connection became available within the pool timeout."""
+
+
+class _PooledConnection:
+    """A connection together with its creation and last use time."""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            # the server might already have dropped the connection
+            pass
+
+
+class ConnectionPool:
+    """Pool of database connections with health checks and lifetime recycling.
+
+    Parameters
+    ----------
+    connect : Callable[[], psycopg2.extensions.connection]
+        Opens a new connection.
+    min_size : int
+        Number of connections opened up front and kept open while idle.
+    max_size : int
+        Maximum number of connections open at the same time.
+    max_lifetime : float
+        Seconds after which a connection is closed and replaced by a new one.
+    validate_after : float
+        Seconds a connection may be idle before it is pinged on checkout.
+    timeout : float
+        Maximum number of seconds to wait for a free connection.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        validate_after: float = 30.0,
+        timeout: float = 5.0,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Expected 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self.timeout = timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Condition()
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._discarded = 0
+
+        for _ in range(min_size):
+            self._idle.append(_PooledConnection(connect()))
+            self._size += 1
+
+    def _is_expired(self, entry: _PooledConnection, now: float) -> bool:
+        return now - entry.created_at >= self.max_lifetime
+
+    def _is_healthy(self, entry: _PooledConnection, now: float) -> bool:
+        """Check a connection before it is lent out.
+
+        Only connections that have been idle longer than `validate_after` are pinged,
+        so busy connections are validated without a round trip.
+        """
+        conn = entry.conn
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if now - entry.last_used < self.validate_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _acquire(self) -> _PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        with self._lock:
+            waited = False
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self._idle or self._size < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout}s")
+                waited = True
+                self._lock.wait(remaining)
+
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                # reserve the slot, the connection is opened outside of the lock
+                self._size += 1
+
+            wait_seconds = time.monotonic() - start
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            self._wait_seconds_total += wait_seconds
+            self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+
+        now = time.monotonic()
+        if entry is not None and self._is_expired(entry, now):
+            entry.close()
+            entry = None
+            with self._lock:
+                self._recycled += 1
+        elif entry is not None and not self._is_healthy(entry, now):
+            entry.close()
+            entry = None
+            with self._lock:
+                self._discarded += 1
+        if entry is None:
+            try:
+                entry = _PooledConnection(self._connect())
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._lock.notify()
+                raise
+
+        with self._lock:
+            self._in_use[id(entry.conn)] = entry
+        return entry
+
+    def _release(self, entry: _PooledConnection, broken: bool = False):
+        now = time.monotonic()
+        entry.last_used = now
+        conn = entry.conn
+        if not broken and not conn.closed:
+            try:
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+
+        expired = self._is_expired(entry, now)
+        close = broken or conn.closed or expired or self._closed
+        if close:
+            entry.close()
+
+        with self._lock:
+            self._in_use.pop(id(conn), None)
+            if close:
+                self._size -= 1
+                if expired and not broken:
+                    self._recycled += 1
+                else:
+                    self._discarded += 1
+            else:
+                self._idle.append(entry)
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Borrow a connection from the pool.
+
+        Open transactions are rolled back when the connection is returned. If an
+        exception is raised while the connection is borrowed and the connection is
+        no longer usable, it is closed instead of returned.
+
+        Yields
+        ------
+        psycopg2.extensions.connection
+            A validated connection
+
+        Raises
+        ------
+        PoolTimeout
+            If no connection became available within `timeout` seconds
+        """
+        entry = self._acquire()
+        broken = False
+        try:
+            yield entry.conn
+        except Exception:
+            broken = entry.conn.closed != 0
+            raise
+        finally:
+            # also when a generator holding the connection is closed early
+            self._release(entry, broken=broken)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current pool size and the accumulated checkout metrics."""
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "discarded": self._discarded,
+            }
+
+    def close(self):
+        """Close all idle connections, borrowed ones are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for entry in idle:
+            entry.close()
@@ -0,0 +1,146 @@
+"""Structured filters for the CRUD helpers of the database service.
+
+Instead of raw SQL condition strings, callers describe which rows to select, update
+or delete as JSON, which is compiled to a parameterised WHERE clause. Values never
+end up in the SQL text, so the statements can be prepared once and reused, and
+column names are checked to be plain identifiers.
+
+A filter is a list of conditions that all have to hold. A condition is either a
+`[column, operator, value]` triple or an `{"and": [...]}` / `{"or": [...]}` group of
+conditions. `is null` and `is not null` take no value, `in` and `not in` take a list.
+
+Examples
+--------
+>>> compile_filters([["user_id", "=", 1], {"or": [["active", "=", True], ["new_listings", ">", 0]]}])
+('user_id = %s AND (active = %s OR new_listings > %s)', (1, True, 0))
+>>> compile_filters([["id", "in", [1, 2, 3]], ["last_run", "is null"]])
+('id = ANY(%s) AND last_run IS NULL', ([1, 2, 3],))
+>>> compile_order_by(["created_at desc", "id"])
+'created_at DESC, id ASC'
+"""
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+OPERATORS = {
+    "=": "{} = %s",
+    "!=": "{} <> %s",
+    "<": "{} < %s",
+    "<=": "{} <= %s",
+    ">": "{} > %s",
+    ">=": "{} >= %s",
+    "like": "{} LIKE %s",
+    "ilike": "{} ILIKE %s",
+    # a single array parameter, so the statement does not depend on the list length
+    "in": "{} = ANY(%s)",
+    "not in": "NOT ({} = ANY(%s))",
+    "is null": "{} IS NULL",
+    "is not null": "{} IS NOT NULL",
+}
+NULL_OPERATORS = ("is null", "is not null")
+LIST_OPERATORS = ("in", "not in")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_ORDER_BY = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(?:\s+(asc|desc))?$", re.IGNORECASE)
+
+
+class FilterError(ValueError):
+    """Raised for filters that cannot be compiled to SQL."""
+
+
+def check_identifier(name: str, kind: str = "column") -> str:
+    """Return `name` if it is a plain SQL identifier.
+
+    Parameters
+    ----------
+    name : str
+        The table or column name
+    kind : str
+        What the name refers to, for the error message
+
+    Raises
+    ------
+    FilterError
+        If `name` is anything else, e.g. an expression
+    """
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise FilterError(f"Invalid {kind} name: {name!r}")
+    return name
+
+
+def _compile_condition(condition: Any, params: List[Any]) -> str:
+    if isinstance(condition, dict):
+        if len(condition) != 1 or next(iter(condition)).lower() not in ("and", "or"):
+            raise FilterError(f"Expected an 'and' or 'or' group, got {condition!r}")
+        junction, children = next(iter(condition.items()))
+        if not isinstance(children, (list, tuple)) or not children:
+            raise FilterError(f"'{junction}' needs a non-empty list of conditions")
+        parts = [_compile_condition(child, params) for child in children]
+        return parts[0] if len(parts) == 1 else \
+            "(" + f" {junction.upper()} ".join(parts) + ")"
+
+    if not isinstance(condition, (list, tuple)) or len(condition) not in (2, 3):
+        raise FilterError(f"Expected [column, operator, value], got {condition!r}")
+    column, operator = check_identifier(condition[0]), str(condition[1]).lower()
+    if operator not in OPERATORS:
+        raise FilterError(f"Unknown operator {condition[1]!r}, expected one of "
+                          f"{tuple(OPERATORS)}")
+    if operator in NULL_OPERATORS:
+        if len(condition) == 3 and condition[2] is not None:
+            raise FilterError(f"'{operator}' does not take a value")
+        return OPERATORS[operator].format(column)
+
+    if len(condition) != 3:
+        raise FilterError(f"'{operator}' needs a value")
+    value = condition[2]
+    if operator in LIST_OPERATORS:
+        if not isinstance(value, (list, tuple)):
+            raise FilterError(f"'{operator}' needs a list of values")
+        value = list(value)
+    elif value is None:
+        raise FilterError("Compare with None using 'is null' or 'is not null'")
+    params.append(value)
+    return OPERATORS[operator].format(column)
+
+
+def compile_filters(filters: Sequence[Any]) -> Tuple[str, tuple]:
+    """Compile a filter to a WHERE clause with `%s` placeholders.
+
+    Parameters
+    ----------
+    filters : Sequence
+        List of conditions, combined with AND
+
+    Returns
+    -------
+    Tuple[str, tuple]
+        The conditions and their parameters
+
+    Raises
+    ------
+    FilterError
+        If the filter is malformed
+    """
+    if isinstance(filters, dict):
+        filters = [filters]
+    if not isinstance(filters, (list, tuple)) or not filters:
+        raise FilterError("filters must be a non-empty list of conditions")
+    params: List[Any] = []
+    conditions = " AND ".join(_compile_condition(condition, params) for condition in filters)
+    return conditions, tuple(params)
+
+
+def compile_order_by(order_by: Optional[Sequence[str]]) -> str:
+    """Compile a list like `["created_at desc", "id"]` to an ORDER BY list.
+
+    Raises
+    ------
+    FilterError
+        If an entry is not a column name, optionally followed by asc or desc
+    """
+    terms = []
+    for term in order_by or ():
+        match = _ORDER_BY.match(term.strip()) if isinstance(term, str) else None
+        if match is None:
+            raise FilterError(f"Invalid order_by entry: {term!r}")
+        terms.append(f"{match.group(1)} {(match.group(2) or 'asc').upper()}")
+    return ", ".join(terms)
@@ -0,0 +1,371 @@
+"""Pooled keep-alive HTTP sessions for the clients of the internal APIs.
+
+Calling `requests.request` opens a new TCP connection for every call and waits
+forever if an API hangs. An `HttpSession` keeps up to `pool_size` connections to
+its API open between calls, applies a default timeout and retries idempotent
+requests with exponential backoff when the connection fails or the API answers
+with 502, 503 or 504. Requests that are not idempotent, like the POSTs of the
+database API, are only retried if the connection could not be established, i.e.
+when the request never reached the API.
+
+The latency of every call is recorded in a histogram per endpoint, see
+`HttpSession.latency_stats`.
+
+`AsyncHttpSession` does the same on top of an `httpx.AsyncClient` for async
+FastAPI handlers. Several sessions can share one client, and with it one connection
+pool, through a `SharedAsyncClient`.
+
+Examples
+--------
+>>> session = HttpSession("http://localhost:7999", pool_size=10, timeout=(3.05, 60))
+>>> session.request("GET", "/health").json()
+{'status': 'healthy', ...}
+>>> session.latency_stats()
+{'GET /health': {'count': 1, 'mean': 0.002, 'p50': 0.0025, 'p95': 0.0025, ...}}
+"""
+import asyncio
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 60.0)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = (502, 503, 504)
+# upper bounds in seconds, the last bucket takes everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of request latencies with fixed buckets.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        Ascending upper bounds of the buckets in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            self._max = max(self._max, seconds)
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls into."""
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self._max
+        return self._max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the number of calls, mean, max, estimated quantiles and buckets."""
+        with self._lock:
+            counts, count = list(self._counts), self._count
+            total, maximum = self._sum, self._max
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["inf"]
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+            "p50": self._quantile(counts, count, 0.5) if count else 0.0,
+            "p95": self._quantile(counts, count, 0.95) if count else 0.0,
+            "p99": self._quantile(counts, count, 0.99) if count else 0.0,
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+class _LatencyStats:
+    """Latency histograms per endpoint."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, seconds: float) -> None:
+        key = f"{method.upper()} {endpoint}"
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def snapshot(self, endpoint: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {
+            key: histogram.snapshot()
+            for key, histogram in sorted(histograms.items())
+            if endpoint is None or key.split(" ", 1)[1] == endpoint
+        }
+
+
+class HttpSession:
+    """A `requests.Session` bound to one API, with pooling, timeouts and retries.
+
+    Parameters
+    ----------
+    base_url : str
+        Base URL of the API, endpoints are appended to it.
+    pool_size : int
+        Maximum number of keep-alive connections kept open to the API.
+    timeout : float or Tuple[float, float]
+        Default timeout in seconds, or a (connect, read) tuple. Can be overridden
+        per request.
+    retries : int
+        Maximum number of retries of a failed request, 0 disables retries.
+    backoff_factor : float
+        Retries wait `backoff_factor * 2 ** (retry - 1)` seconds, the first retry is
+        sent right away.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            # hand the last response to raise_for_status instead of raising MaxRetryError
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._latency = _LatencyStats()
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request to an endpoint of the API.
+
+        The latency, including retries, is recorded for the endpoint whether the
+        request succeeds or not. For `stream=True` it is the time until the headers
+        arrived.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method
+        endpoint : str
+            Path of the endpoint, e.g. "/select"
+        **kwargs
+            Passed on to `requests.Session.request`
+
+        Raises
+        ------
+        requests.RequestException
+            If the request failed after all retries
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, f"{self.base_url}{endpoint}", **kwargs)
+        finally:
+            self._latency.record(method, endpoint, time.perf_counter() - start)
+
+    def latency_stats(self, endpoint: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms per endpoint, keyed like "GET /select".
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Only return the histograms of this endpoint
+        """
+        return self._latency.snapshot(endpoint)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+
+def _httpx_timeout(timeout: Union[float, Tuple[float, float]]) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def create_async_client(
+    pool_size: int = 10,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Create an `httpx.AsyncClient` that several `AsyncHttpSession`s can share.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of connections, over all APIs.
+    timeout : float or Tuple[float, float]
+        Default timeout in seconds, or a (connect, read) tuple.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=_httpx_timeout(timeout),
+    )
+
+
+class SharedAsyncClient:
+    """An `httpx.AsyncClient` shared by several `AsyncHttpSession`s.
+
+    Connections belong to the event loop they were opened on, so the client is
+    created on first use and created anew when used from another event loop, e.g.
+    by a `TestClient` that is not used as a context manager.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of connections, over all APIs.
+    timeout : float or Tuple[float, float]
+        Default timeout in seconds, or a (connect, read) tuple.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # the connections of a previous loop cannot be used, nor closed, anymore
+            self._client = create_async_client(self.pool_size, self.timeout)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+class AsyncHttpSession:
+    """An async session bound to one API, with pooling, timeouts and retries.
+
+    Retries follow `HttpSession`: idempotent requests are retried on transport
+    errors and 502/503/504 with exponential backoff, all other requests only if
+    the connection could not be established.
+
+    Parameters
+    ----------
+    base_url : str
+        Base URL of the API, endpoints are appended to it.
+    client : SharedAsyncClient, optional
+        Client shared with the sessions of other APIs. If not given, the session
+        creates and owns one.
+    pool_size : int
+        Maximum number of connections of a client created by the session.
+    timeout : float or Tuple[float, float]
+        Default timeout in seconds, or a (connect, read) tuple. Applies to the
+        requests of this session also if the client is shared.
+    retries : int
+        Maximum number of retries of a failed request, 0 disables retries.
+    backoff_factor : float
+        Retries wait `backoff_factor * 2 ** (retry - 1)` seconds, the first retry is
+        sent right away.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client: Optional[SharedAsyncClient] = None,
+        pool_size: int = 10,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_factor: float = 0.1,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._owns_client = client is None
+        self.client = SharedAsyncClient(pool_size, timeout) if client is None else client
+        self.timeout = _httpx_timeout(timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._latency = _LatencyStats()
+
+    def _backoff(self, retry: int) -> float:
+        return 0.0 if retry <= 1 else self.backoff_factor * 2**(retry - 1)
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request to an endpoint of the API, see `HttpSession.request`.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the request failed after all retries
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        url = f"{self.base_url}{endpoint}"
+        start = time.perf_counter()
+        try:
+            retry = 0
+            while True:
+                try:
+                    response = await self.client.get().request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    # the request never reached the API if the connection failed
+                    if retry >= self.retries or \
+                            not (idempotent or isinstance(e, httpx.ConnectError)):
+                        raise
+                else:
+                    if retry >= self.retries or not idempotent or \
+                            response.status_code not in RETRY_STATUSES:
+                        return response
+                    await response.aclose()
+                retry += 1
+                await asyncio.sleep(self._backoff(retry))
+        finally:
+            self._latency.record(method, endpoint, time.perf_counter() - start)
+
+    def stream(self, method: str, endpoint: str, **kwargs):
+        """Send a request whose body is read lazily, see `httpx.AsyncClient.stream`.
+
+        Streamed requests are not retried and their latency is not recorded.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.client.get().stream(method, f"{self.base_url}{endpoint}", **kwargs)
+
+    def latency_stats(self, endpoint: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the latency histograms per endpoint, see `HttpSession.latency_stats`."""
+        return self._latency.snapshot(endpoint)
+
+    async def aclose(self) -> None:
+        """Close the client, unless it is shared."""
+        if self._owns_client:
+            await self.client.aclose()
@@ -0,0 +1,111 @@
+"""Versioned schema migrations.
+
+`assets/sql/init.sql` creates the tables, every later schema change, e.g. a new
+index, is a numbered SQL file in `assets/sql/migrations`, like
+`001_hot_path_indexes.sql`. The applied versions are recorded in the
+`schema_migrations` table, so each file runs exactly once per database, in order and
+in its own transaction. An advisory lock keeps concurrent runs from applying the same
+migration twice.
+
+The runner is called from `etc/entrypoint.sh` after `init.sql`:
+
+    python backend/src/utils/migrations.py [migrations_dir]
+"""
+import re
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import psycopg2
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "assets" / "sql" / "migrations"
+_MIGRATION_FILE = re.compile(r"^(\d+)_[\w-]+\.sql$")
+# arbitrary key of the advisory lock held while migrating
+_LOCK_KEY = 7999
+
+
+def pending_migrations(directory: Path, applied: set) -> List[Tuple[str, Path]]:
+    """Return the migrations in `directory` that are not in `applied`, oldest first.
+
+    Raises
+    ------
+    ValueError
+        If two files share a version number
+    """
+    migrations = {}
+    for path in directory.glob("*.sql"):
+        match = _MIGRATION_FILE.match(path.name)
+        if match is None:
+            continue
+        version = match.group(1)
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: "
+                             f"{migrations[version].name}, {path.name}")
+        migrations[version] = path
+    return [(version, migrations[version])
+            for version in sorted(migrations, key=int)
+            if version not in applied]
+
+
+def migrate(conn, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """Apply all pending migrations.
+
+    Parameters
+    ----------
+    conn : psycopg2.extensions.connection
+        Connection to the database to migrate
+    directory : Path
+        Directory of the numbered migration files
+
+    Returns
+    -------
+    List[str]
+        The names of the applied migration files
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+        try:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )""")
+            conn.commit()
+            cur.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+
+            names = []
+            for version, path in pending_migrations(directory, applied):
+                cur.execute(path.read_text())
+                cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                            (version, path.name))
+                conn.commit()
+                names.append(path.name)
+            return names
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+            conn.commit()
+
+
+def main():
+    from utils import getenv
+
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else MIGRATIONS_DIR
+    conn = psycopg2.connect(host=getenv("POSTGRES_HOST", "localhost"),
+                            port=int(getenv("POSTGRES_PORT", "5432")),
+                            database="postgres",
+                            user=getenv("POSTGRES_ROLE"),
+                            password=getenv("POSTGRES_PWD"))
+    try:
+        applied = migrate(conn, directory)
+    finally:
+        conn.close()
+    print(f"Applied {len(applied)} migration(s)" + (f": {', '.join(applied)}" if applied else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Keeps a long-lived headless Chromium around and lends out pages from it.
+
+Launching Chromium is by far the most expensive part of scraping a search page, so
+instead of starting a fresh browser for every poll the `PagePool` starts it once and
+hands out pages, each living in its own browser context. Pages are health checked
+before they are lent out and recycled after a fixed number of navigations to keep
+the memory footprint of long running bots flat.
+
+Notes
+-----
+The sync Playwright API is bound to the thread that started it, so a pool must only
+be used from a single thread.
+
+Examples
+--------
+>>> pool = PagePool(size=2, max_navigations=50)
+>>> with pool.page() as page:
+>>>     page.goto("https://www.wg-gesucht.de/")
+>>>     html = page.inner_html("#main_column")
+>>> pool.close()
+"""
+import atexit
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from playwright.sync_api import sync_playwright
+
+
+class _PooledPage:
+    """A page together with its browser context and usage counter."""
+
+    __slots__ = ("context", "page", "navigations")
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+    def close(self):
+        try:
+            self.context.close()
+        except Exception:
+            # the browser might already be gone, nothing left to clean up then
+            pass
+
+
+class PagePool:
+    """Pool of Playwright pages backed by a single long-lived Chromium instance.
+
+    Parameters
+    ----------
+    headless : bool
+        Whether to run Chromium headless.
+    size : int
+        Maximum number of idle pages kept around between borrows.
+    max_navigations : int
+        Number of times a page can be borrowed before its context is closed and
+        replaced by a fresh one. Each borrow is counted as one navigation.
+    """
+
+    def __init__(self, headless: bool = True, size: int = 2, max_navigations: int = 50):
+        self.headless = headless
+        self.size = size
+        self.max_navigations = max_navigations
+        self._playwright = None
+        self._browser = None
+        self._idle: List[_PooledPage] = []
+
+    def _ensure_browser(self):
+        """Start Playwright and launch Chromium if it is not running (anymore)."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        # the browser crashed or was never started, idle pages are unusable
+        self._discard_idle()
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        try:
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+        except Exception:
+            # Playwright runs an event loop on this thread, don't leave it behind
+            self._playwright.stop()
+            self._playwright = None
+            raise
+        return self._browser
+
+    def _new_page(self) -> _PooledPage:
+        context = self._ensure_browser().new_context()
+        return _PooledPage(context, context.new_page())
+
+    def _is_healthy(self, entry: _PooledPage) -> bool:
+        """Check that a page can still be used without issuing a navigation."""
+        if entry.navigations >= self.max_navigations:
+            return False
+        if self._browser is None or not self._browser.is_connected():
+            return False
+        return not entry.page.is_closed()
+
+    def _acquire(self) -> _PooledPage:
+        while self._idle:
+            entry = self._idle.pop()
+            if self._is_healthy(entry):
+                return entry
+            entry.close()
+        return self._new_page()
+
+    def _release(self, entry: _PooledPage, broken: bool = False):
+        entry.navigations += 1
+        if broken or len(self._idle) >= self.size or not self._is_healthy(entry):
+            entry.close()
+            return
+        self._idle.append(entry)
+
+    def _discard_idle(self):
+        for entry in self._idle:
+            entry.close()
+        self._idle = []
+
+    @contextmanager
+    def page(self) -> Iterator:
+        """Borrow a page from the pool.
+
+        Yields
+        ------
+        playwright.sync_api.Page
+            A page ready for navigation. It is returned to the pool on exit, unless
+            an exception was raised while it was borrowed, in which case it is closed.
+        """
+        entry = self._acquire()
+        try:
+            yield entry.page
+        except Exception:
+            self._release(entry, broken=True)
+            raise
+        self._release(entry)
+
+    def close(self):
+        """Close all pages, the browser and stop Playwright."""
+        self._discard_idle()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+_default_pool: Optional[PagePool] = None
+
+
+def get_page_pool() -> PagePool:
+    """Return the process wide page pool, creating it on first use."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = PagePool()
+        atexit.register(_default_pool.close)
+    return _default_pool
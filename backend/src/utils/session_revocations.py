@@ -0,0 +1,253 @@
+"""In-memory set of revoked sessions, kept in sync with the `sessions` table.
+
+Session tokens are JWTs that stay valid until they expire. To log a session out
+before that, its row in `sessions` is marked as revoked. Looking the row up on
+every token validation would put a database round trip on every request, so the
+auth service keeps the revoked tokens that have not expired yet in memory. Checking
+a token is then a set lookup.
+
+The set is loaded from the database at startup and then kept fresh incrementally.
+Every revocation takes the next value of the `session_revocations_seq` sequence, and
+a background thread polls for rows above the highest value seen so far, the high
+water mark. Revocations made by this process are added to the set right away.
+
+The same thread purges expired rows from `sessions` in batches, so the table and
+its unique token index stay small.
+
+Examples
+--------
+>>> revocations = SessionRevocations(DatabaseClient("http://localhost:7999"))
+>>> revocations.start(poll_interval=5)
+>>> revocations.revoke(token, expires_at)
+>>> revocations.is_revoked(token)
+True
+>>> revocations.stop()
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+# revocation ids are handed out before the revoking transaction commits, so a
+# smaller id can become visible after a larger one. Polls therefore also re-read the
+# revocations of the last few seconds.
+POLL_LOOKBACK = timedelta(seconds=10)
+
+
+def _timestamp(value: Any) -> float:
+    """Seconds since the epoch of a timestamp from the database API."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+class SessionRevocations:
+    """Revoked session tokens, loaded from and synced with the `sessions` table.
+
+    Parameters
+    ----------
+    db_client : DatabaseClient
+        Client of the database API.
+    purge_batch_size : int
+        Number of expired session rows deleted per statement.
+    """
+
+    def __init__(self, db_client, purge_batch_size: int = 1000):
+        self._db_client = db_client
+        self.purge_batch_size = purge_batch_size
+        # token -> expiry as seconds since the epoch
+        self._revoked: Dict[str, float] = {}
+        self._high_water = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_poll: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._purged = 0
+
+    def is_revoked(self, token: str) -> bool:
+        """Check whether a session was revoked, without a database query."""
+        return token in self._revoked
+
+    def _add(self, token: str, expires_at: float, revocation_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._revoked[token] = expires_at
+            if revocation_id is not None:
+                self._high_water = max(self._high_water, revocation_id)
+
+    def revoke(self, token: str, expires_at: Optional[datetime] = None) -> bool:
+        """
+        Mark a session as revoked in the database and in memory.
+
+        Parameters
+        ----------
+        token : str
+            The session token.
+        expires_at : datetime, optional
+            Expiry of the token. Defaults to the expiry stored with the session.
+
+        Returns
+        -------
+        bool
+            True if the session was revoked, False if it is unknown or was already
+            revoked.
+
+        Raises
+        ------
+        RuntimeError
+            If the database update fails.
+        """
+        result = self._db_client.execute_query(
+            "UPDATE sessions SET revoked_at = %s, "
+            "revocation_id = nextval('session_revocations_seq') "
+            "WHERE token = %s AND revocation_id IS NULL "
+            "RETURNING revocation_id, expires_at",
+            (datetime.now().isoformat(), token),
+        )
+        if not result["success"]:
+            raise RuntimeError(f"Failed to revoke session: {result.get('error')}")
+        rows = result.get("data") or []
+        if rows:
+            row = rows[0]
+            self._add(token, _timestamp(expires_at or row["expires_at"]), row["revocation_id"])
+        elif expires_at is not None:
+            # already revoked, possibly by another process that was not polled yet
+            self._add(token, expires_at.timestamp())
+        return bool(rows)
+
+    def refresh(self) -> int:
+        """
+        Load the revocations above the high water mark and drop expired tokens.
+
+        The first call loads all revocations of unexpired sessions.
+
+        Returns
+        -------
+        int
+            The number of revocations read.
+
+        Raises
+        ------
+        RuntimeError
+            If the database query fails.
+        """
+        since = (datetime.now() - POLL_LOOKBACK).isoformat()
+        result = self._db_client.select(
+            "sessions",
+            fields=["token", "revocation_id", "expires_at"],
+            filters=[
+                ["expires_at", ">", datetime.now().isoformat()],
+                {"or": [["revocation_id", ">", self._high_water], ["revoked_at", ">", since]]},
+            ],
+            order_by=["revocation_id"],
+        )
+        if not result["success"]:
+            raise RuntimeError(f"Failed to load revoked sessions: {result.get('error')}")
+
+        now = time.time()
+        with self._lock:
+            for row in result["data"]:
+                self._revoked[row["token"]] = _timestamp(row["expires_at"])
+                self._high_water = max(self._high_water, row["revocation_id"])
+            # expired tokens fail validation anyway
+            for token in [token for token, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[token]
+            self._last_poll = now
+        return len(result["data"])
+
+    def purge_expired(self, max_batches: Optional[int] = None) -> int:
+        """
+        Delete expired session rows in batches of `purge_batch_size`.
+
+        Small batches keep each statement short, so the purge does not hold locks
+        on `sessions` that would block logins.
+
+        Parameters
+        ----------
+        max_batches : int, optional
+            Stop after this many batches, the rest is purged on the next call.
+
+        Returns
+        -------
+        int
+            The number of deleted rows.
+
+        Raises
+        ------
+        RuntimeError
+            If a delete fails.
+        """
+        cutoff = datetime.now().isoformat()
+        deleted = batches = 0
+        while max_batches is None or batches < max_batches:
+            result = self._db_client.execute_query(
+                "DELETE FROM sessions WHERE id IN ("
+                "SELECT id FROM sessions WHERE expires_at <= %s LIMIT %s "
+                "FOR UPDATE SKIP LOCKED)",
+                (cutoff, self.purge_batch_size),
+            )
+            if not result["success"]:
+                raise RuntimeError(f"Failed to purge expired sessions: {result.get('error')}")
+            deleted += result["affected_rows"]
+            batches += 1
+            if result["affected_rows"] < self.purge_batch_size:
+                break
+        with self._lock:
+            self._purged += deleted
+        return deleted
+
+    def _run(self, poll_interval: float, purge_interval: float) -> None:
+        next_purge = time.monotonic()
+        while not self._stop.wait(poll_interval):
+            try:
+                self.refresh()
+                if time.monotonic() >= next_purge:
+                    self.purge_expired()
+                    next_purge = time.monotonic() + purge_interval
+                self._last_error = None
+            except Exception as e:
+                # keep the last known revocations and try again with the next poll
+                self._last_error = str(e)
+
+    def start(self, poll_interval: float = 5.0, purge_interval: float = 3600.0) -> None:
+        """
+        Load the revocations and start the background thread that keeps them fresh.
+
+        If the database API is not reachable yet, the thread retries the load with
+        every poll, the error is reported by `stats`.
+
+        Parameters
+        ----------
+        poll_interval : float
+            Seconds between two polls for new revocations.
+        purge_interval : float
+            Seconds between two purges of expired session rows.
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            self._last_error = str(e)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        args=(poll_interval, purge_interval),
+                                        name="session-revocations",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of revoked tokens, the high water mark and the sync state."""
+        with self._lock:
+            return {
+                "revoked": len(self._revoked),
+                "high_water": self._high_water,
+                "last_poll": self._last_poll,
+                "last_error": self._last_error,
+                "purged": self._purged,
+            }
@@ -0,0 +1,183 @@
+"""Server-side prepared statements for the generic CRUD helpers of `DatabaseService`.
+
+The CRUD helpers run the same few statement shapes over and over, e.g. a user lookup
+by id or a session insert. The `StatementCache` gives every shape, identified by its
+operation, table and columns, a statement name. The first time a shape runs on a
+pooled connection it is sent as `PREPARE`, afterwards only `EXECUTE` with the
+parameter values is sent, so PostgreSQL parses and plans it once per connection.
+
+Prepared statements live in a server session, so the names prepared on a connection
+are tracked on the connection itself, see `PreparedStatementConnection`. Connections
+without that attribute run the statements unprepared.
+
+Examples
+--------
+>>> cache = StatementCache(max_size=256)
+>>> with pool.connection() as conn, conn.cursor() as cur:
+>>>     cache.execute(cur, ("select", "users", ("id",)), "SELECT * FROM users WHERE id = %s", (1,))
+>>> cache.stats()
+{'statements': 1, 'hits': 0, 'misses': 1, 'unprepared': 0, 'hit_rate': 0.0}
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import psycopg2
+from psycopg2 import errors, extensions
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+def numbered_placeholders(query: str, start: int = 1) -> str:
+    """Translate psycopg2 `%s` placeholders to numbered `$1, $2, ...` placeholders.
+
+    Parameters
+    ----------
+    query : str
+        The query with `%s` placeholders, literal percent signs written as `%%`
+    start : int
+        Number of the first placeholder
+
+    Returns
+    -------
+    str
+        The query with numbered placeholders
+    """
+    counter = start - 1
+
+    def replace(match: re.Match) -> str:
+        nonlocal counter
+        if match.group() == "%%":
+            return "%"
+        counter += 1
+        return f"${counter}"
+
+    return _PLACEHOLDER.sub(replace, query)
+
+
+def _run(cur, query: str, params: Sequence[Any]) -> None:
+    # without parameters, psycopg2 leaves percent signs in the query alone
+    if params:
+        cur.execute(query, params)
+    else:
+        cur.execute(query)
+
+
+def _prepare(cur, name: str, query: str, params: Sequence[Any]) -> None:
+    cur.execute(f"PREPARE {name} AS {numbered_placeholders(query) if params else query}")
+
+
+class PreparedStatementConnection(extensions.connection):
+    """A psycopg2 connection that remembers the statements prepared on it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+class StatementCache:
+    """Names statement shapes and prepares them once per connection.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of statement shapes. The least recently used shape is dropped
+        when a new one is added, and a connection deallocates all of its prepared
+        statements once it holds more than `max_size`. 0 disables prepared statements.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._names: "OrderedDict[Hashable, Optional[str]]" = OrderedDict()
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._unprepared = 0
+
+    def _name(self, key: Hashable) -> Optional[str]:
+        """The statement name of a shape, None if the shape cannot be prepared."""
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            if key in self._names:
+                self._names.move_to_end(key)
+                return self._names[key]
+            self._counter += 1
+            name = self._names[key] = f"crud_{self._counter}"
+            if len(self._names) > self.max_size:
+                self._names.popitem(last=False)
+            return name
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def execute(self, cur, key: Hashable, query: str, params: Sequence[Any] = ()) -> None:
+        """Run a statement on a cursor, as prepared statement if possible.
+
+        Parameters
+        ----------
+        cur : psycopg2.extensions.cursor
+            Cursor of a connection borrowed from the pool
+        key : Hashable
+            Identifies the shape of the statement, e.g. `("select", "users", ("id",))`.
+            Statements with the same key must have the same query.
+        query : str
+            The statement with psycopg2 `%s` placeholders
+        params : Sequence
+            The parameter values
+        """
+        conn = cur.connection
+        prepared = getattr(conn, "prepared", None)
+        name = None if prepared is None else self._name(key)
+        if name is None:
+            self._count("_unprepared")
+            _run(cur, query, params)
+            return
+
+        if name in prepared:
+            self._count("_hits")
+        else:
+            if len(prepared) >= self.max_size:
+                cur.execute("DEALLOCATE ALL")
+                prepared.clear()
+            try:
+                _prepare(cur, name, query, params)
+            except psycopg2.Error:
+                # e.g. parameters whose type PostgreSQL cannot infer, the shape is run
+                # unprepared from now on
+                conn.rollback()
+                with self._lock:
+                    if key in self._names:
+                        self._names[key] = None
+                    self._unprepared += 1
+                _run(cur, query, params)
+                return
+            prepared.add(name)
+            self._count("_misses")
+
+        execute = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params \
+            else f"EXECUTE {name}"
+        try:
+            _run(cur, execute, params)
+        except errors.InvalidSqlStatementName:
+            # the statements were deallocated behind our back, e.g. by a DISCARD ALL
+            conn.rollback()
+            prepared.clear()
+            _prepare(cur, name, query, params)
+            prepared.add(name)
+            _run(cur, execute, params)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of statement shapes and the prepared statement hit rate."""
+        with self._lock:
+            executions = self._hits + self._misses
+            return {
+                "statements": sum(1 for name in self._names.values() if name is not None),
+                "hits": self._hits,
+                "misses": self._misses,
+                "unprepared": self._unprepared,
+                "hit_rate": self._hits / executions if executions else 0.0,
+            }
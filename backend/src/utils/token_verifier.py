@@ -0,0 +1,162 @@
+"""Local verification of session tokens for the clients of the auth API.
+
+Services that only need the user id of a session token would otherwise ask the auth
+API for every request, which just decodes the JWT. A `TokenVerifier` checks the
+signature and expiry locally, with the shared secret for HS256 or the public key for
+RS256, and keeps recently verified tokens in a small LRU cache. Cached tokens are
+dropped once they expire.
+
+Signature and expiry cannot tell whether a session was revoked, so a token is
+checked with the auth API when it is first seen and again every `revalidate_after`
+seconds, see `AuthClient.get_user_id`.
+
+Examples
+--------
+>>> verifier = TokenVerifier(os.environ["JWT_SECRET"], revalidate_after=60)
+>>> verifier.verify(token)
+('42', True)
+>>> verifier.confirm(token)  # the auth API still accepts the token
+>>> verifier.verify(token)
+('42', False)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+
+ALGORITHMS = ("HS256", "RS256")
+
+
+class TokenVerifier:
+    """Verifies session tokens locally and caches the verified ones.
+
+    Parameters
+    ----------
+    key : str
+        Shared secret for HS256, PEM encoded public key for RS256.
+    algorithm : str
+        Signing algorithm of the tokens, HS256 or RS256.
+    max_size : int
+        Maximum number of cached tokens, the least recently used one is dropped.
+    revalidate_after : float, optional
+        Seconds after which a cached token is checked with the auth API again. If
+        None, tokens are never checked remotely and revoked sessions stay valid
+        until they expire.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        algorithm: str = "HS256",
+        max_size: int = 1024,
+        revalidate_after: Optional[float] = 60.0,
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {ALGORITHMS}, got {algorithm}")
+        self.key = key
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self.revalidate_after = revalidate_after
+        # token -> [user_id, exp, time of the last remote check or None]
+        self._cache: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["TokenVerifier"]:
+        """
+        Create a verifier if `JWT_VERIFY_LOCALLY` is enabled.
+
+        The key is taken from `JWT_PUBLIC_KEY` for RS256 and from `JWT_SECRET` for
+        HS256, the algorithm from `JWT_ALGORITHM`. `JWT_REVALIDATE_AFTER` sets the
+        seconds between remote checks, "none" disables them.
+
+        Raises
+        ------
+        ValueError
+            If local verification is enabled but the key is missing.
+        """
+        if os.getenv("JWT_VERIFY_LOCALLY", "false").lower() not in ("1", "true", "yes"):
+            return None
+        algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+        key = os.getenv("JWT_PUBLIC_KEY" if algorithm == "RS256" else "JWT_SECRET")
+        if not key:
+            raise ValueError(f"Local token verification with {algorithm} needs "
+                             f"{'JWT_PUBLIC_KEY' if algorithm == 'RS256' else 'JWT_SECRET'}")
+        revalidate_after = os.getenv("JWT_REVALIDATE_AFTER", "60")
+        return cls(key,
+                   algorithm=algorithm,
+                   revalidate_after=None
+                   if revalidate_after.lower() == "none" else float(revalidate_after))
+
+    def _check_due(self, checked_at: Optional[float], now: float) -> bool:
+        if self.revalidate_after is None:
+            return False
+        return checked_at is None or now - checked_at >= self.revalidate_after
+
+    def verify(self, token: str) -> Tuple[str, bool]:
+        """
+        Verify a token and return its user id.
+
+        Returns
+        -------
+        Tuple[str, bool]
+            The user id and whether the token is due for a check with the auth API.
+
+        Raises
+        ------
+        jwt.InvalidTokenError
+            If the signature is invalid, the token expired or has no user id.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is not None and entry[1] > now:
+                self._cache.move_to_end(token)
+                self._hits += 1
+                return entry[0], self._check_due(entry[2], now)
+            self._misses += 1
+            if entry is not None:
+                del self._cache[token]
+
+        payload = jwt.decode(token,
+                             self.key,
+                             algorithms=[self.algorithm],
+                             options={"require": ["exp"]})
+        if "user_id" not in payload:
+            raise jwt.InvalidTokenError("Token has no user_id")
+        user_id = payload["user_id"]
+
+        with self._lock:
+            self._cache[token] = [user_id, payload["exp"], None]
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return user_id, self._check_due(None, now)
+
+    def confirm(self, token: str) -> None:
+        """Record that the auth API accepted a cached token just now."""
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is not None:
+                entry[2] = time.time()
+
+    def forget(self, token: str) -> None:
+        """Drop a token from the cache, e.g. after the auth API rejected it."""
+        with self._lock:
+            self._cache.pop(token, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cached tokens and the cache hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "tokens": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,210 @@
+"""Explicit-condition waits for the Selenium helpers.
+
+Every step of a browser flow waits for a concrete condition (an element becoming
+visible or clickable, a page element going stale, ...) which is polled at a
+configurable interval and bounded by a per-action latency budget. Nothing relies on
+implicit waits or fixed sleeps, so a step returns as soon as the page is ready.
+
+The time each step waited is recorded, so the latency of a whole flow can be
+reported. A screenshot is only taken when a step runs out of budget.
+
+Examples
+--------
+>>> waiter = Waiter(driver, poll_interval=0.1, budget=10)
+>>> waiter.click(By.XPATH, "//*[contains(text(), 'Mein Konto')]")
+>>> waiter.send_keys(By.ID, "login_email_username", "user@example.com")
+>>> waiter.summary()
+'waited 0.42s in 2 steps: click //*[contains(text(), 'Mein Konto')] 0.31s, ...'
+"""
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+COOKIE_POPUP_XPATH = "//div[@id='cmpbox' or @id='cmpbox2']"
+
+IGNORED_EXCEPTIONS = (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+)
+
+
+class Waiter:
+    """Runs browser actions as soon as an explicit condition is met.
+
+    Parameters
+    ----------
+    driver : selenium.webdriver.remote.webdriver.WebDriver
+        The driver to wait on
+    poll_interval : float
+        Seconds between two checks of a condition
+    budget : float
+        Default maximum number of seconds a single action may wait
+    screenshot_dir : str, optional
+        Directory for screenshots taken when an action runs out of budget, the
+        working directory by default. If None, no screenshots are taken.
+    """
+
+    def __init__(
+        self,
+        driver,
+        poll_interval: float = 0.1,
+        budget: float = 10,
+        screenshot_dir: Optional[str] = ".",
+    ):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.budget = budget
+        self.screenshot_dir = screenshot_dir
+        self.timings: List[Tuple[str, float]] = []
+        # all waiting happens explicitly, implicit waits would stretch every lookup
+        self.driver.implicitly_wait(0)
+
+    def until(
+        self,
+        condition: Callable[[Any], Any],
+        step: str,
+        budget: Optional[float] = None,
+        screenshot: bool = True,
+    ) -> Any:
+        """Wait until `condition` returns a truthy value and return it.
+
+        Parameters
+        ----------
+        condition : Callable
+            Called with the driver, e.g. one of `expected_conditions`
+        step : str
+            Name under which the waiting time is recorded
+        budget : float, optional
+            Maximum number of seconds to wait, defaults to the waiter's budget
+        screenshot : bool
+            Take a screenshot if the condition is not met. Disable this for
+            conditions that are expected to time out, e.g. optional dialogs.
+
+        Raises
+        ------
+        TimeoutException
+            If the condition is not met within the budget
+        """
+        budget = self.budget if budget is None else budget
+        start = time.monotonic()
+        try:
+            return WebDriverWait(
+                self.driver,
+                budget,
+                poll_frequency=self.poll_interval,
+                ignored_exceptions=IGNORED_EXCEPTIONS,
+            ).until(condition)
+        except TimeoutException:
+            if screenshot:
+                self.screenshot(step)
+            raise
+        finally:
+            self.timings.append((step, time.monotonic() - start))
+
+    def remove_cookies_popup(self) -> None:
+        for div in self.driver.find_elements(By.XPATH, COOKIE_POPUP_XPATH):
+            self.driver.execute_script("arguments[0].remove();", div)
+
+    def exists(self, by: str, id: str) -> bool:
+        """Check whether an element is on the current page, without waiting."""
+        try:
+            self.driver.find_element(by, id)
+            return True
+        except NoSuchElementException:
+            return False
+
+    def element(self, by: str, id: str, budget: Optional[float] = None):
+        """Wait for an element to become visible.
+
+        Elements that are on the page but still hidden once the budget is used up
+        are returned as well, like the previous presence fallback did.
+
+        Raises
+        ------
+        TimeoutException
+            If the element is not on the page at all
+        """
+        self.remove_cookies_popup()
+        step = f"visible {id}"
+        try:
+            # no screenshot yet, a hidden element is still returned below
+            return self.until(EC.visibility_of_element_located((by, id)), step, budget,
+                              screenshot=False)
+        except TimeoutException as e:
+            try:
+                return self.driver.find_element(by, id)
+            except NoSuchElementException:
+                self.screenshot(step)
+                raise e
+
+    def click(self, by: str, id: str, budget: Optional[float] = None) -> None:
+        """Click an element as soon as it accepts the click.
+
+        Clicks on elements that are missing, not yet interactable or covered, e.g. by
+        an overlay that is still fading out, are retried until the budget is used up.
+
+        Raises
+        ------
+        ElementNotInteractableException
+            If the element could not be clicked within the budget
+        """
+        self.remove_cookies_popup()
+
+        def click_when_ready(driver):
+            driver.find_element(by, id).click()
+            return True
+
+        try:
+            self.until(click_when_ready, f"click {id}", budget)
+        except TimeoutException:
+            raise ElementNotInteractableException(f"Could not click: {id}")
+
+    def send_keys(self, by: str, id: str, send_str: str, budget: Optional[float] = None) -> None:
+        """Wait for an input to become visible and type into it.
+
+        Raises
+        ------
+        ElementNotInteractableException
+            If the input does not accept the keys
+        """
+        element = self.element(by, id, budget)
+        try:
+            element.send_keys(send_str)
+        except ElementNotInteractableException:
+            raise ElementNotInteractableException(f"Could not enter: {send_str}")
+
+    def screenshot(self, step: str) -> None:
+        """Save a screenshot of the page after a step ran out of budget."""
+        if self.screenshot_dir is None:
+            return
+        name = "".join(c if c.isalnum() else "_" for c in step).strip("_")[:80]
+        try:
+            self.driver.save_screenshot(f"{self.screenshot_dir}/wait_failure_{name}.png")
+        except WebDriverException:
+            pass
+
+    @property
+    def total(self) -> float:
+        """Seconds waited over all recorded steps."""
+        return sum(seconds for _, seconds in self.timings)
+
+    def summary(self) -> str:
+        """Describe how long each recorded step waited."""
+        steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.timings)
+        return f"waited {self.total:.2f}s in {len(self.timings)} steps: {steps}"
+
+    def reset(self) -> None:
+        self.timings = []
@@ -59,7 +59,7 @@ def test_select_users():
     # Test selection
     response = client.get("/select", params={
         "table": "users",
-        "conditions": "email = 'test@example.com'",
+        "filters": '[["email", "=", "test@example.com"]]',
         "fields": "name,email"
     })
     
@@ -90,7 +90,8 @@ def test_update_user():
             "name": "Updated",
             "surname": "Name"
         },
-        "conditions": "email = 'test@example.com'"
+        "conditions": "email = %s",
+        "params": ["test@example.com"]
     }
     
     response = client.put("/update", json=update_data)
@@ -116,7 +117,7 @@ def test_delete_user():
     # Delete user
     response = client.delete("/delete", params={
         "table": "users",
-        "conditions": "email = 'test@example.com'"
+        "filters": '[["email", "=", "test@example.com"]]'
     })
     
     assert response.status_code == 200
@@ -160,6 +161,11 @@ def test_error_handling():
     response = client.post("/query", json={"query": "INVALID SQL"})
     assert response.status_code == 400
     
+    # Test values written into the conditions
+    response = client.delete("/delete", params={"table": "users",
+                                                "conditions": "email = 'test@example.com'"})
+    assert response.status_code == 400
+
     # Test missing required conditions
     response = client.delete("/delete", params={"table": "users"})
     assert response.status_code == 422
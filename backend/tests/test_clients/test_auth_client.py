@@ -4,9 +4,13 @@ import subprocess
 import signal
 import time
 import requests
+import jwt
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 from fastapi import HTTPException
 from clients.auth_client import AuthClient
+from utils.token_verifier import TokenVerifier
 from tests.logger import TestLogger
 
 logger = TestLogger("AuthClientTests")
@@ -278,5 +282,30 @@ def test_connection_error_handling(auth_client: AuthClient):
     assert "failed" in str(exc_info.value.detail).lower()
 
 
+
+def test_local_verification_checks_revocation_remotely():
+    """Test that locally verified tokens only go to the auth API for revocation checks."""
+    exp = datetime.now(timezone.utc) + timedelta(hours=1)
+    token = jwt.encode({"user_id": "42", "exp": exp}, "secret", algorithm="HS256")
+    client = AuthClient("http://auth", verifier=TokenVerifier("secret", revalidate_after=60))
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"valid": True}
+    with patch.object(client._session.session, "request", return_value=response) as request:
+        assert [client.get_user_id(token) for _ in range(3)] == ["42"] * 3
+        assert request.call_count == 1
+        assert request.call_args.args == ("GET", "http://auth/validate-token")
+
+        with pytest.raises(HTTPException) as exc_info:
+            client.get_user_id(token + "x")
+        assert exc_info.value.status_code == 401
+        assert request.call_count == 1
+
+    # revoked sessions are rejected once the auth API is asked again
+    client.verifier.revalidate_after = 0
+    response.json.return_value = {"valid": False}
+    with patch.object(client._session.session, "request", return_value=response):
+        assert client.validate_session_token(token) is False
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
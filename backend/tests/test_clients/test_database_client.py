@@ -5,8 +5,10 @@ import subprocess
 import signal
 import requests
 from datetime import datetime
+from unittest.mock import MagicMock, patch
 from fastapi import HTTPException
 from clients.database_client import DatabaseClient
+from utils.http_session import DEFAULT_TIMEOUT
 from services.database_service import DatabaseService, DBConfig
 from tests.logger import TestLogger
 
@@ -112,7 +114,7 @@ def test_insert_user(db_client: DatabaseClient):
     assert result["affected_rows"] == 1
 
     # Verify through select
-    select_result = db_client.select("users", f"email = '{user_data['email']}'")
+    select_result = db_client.select("users", filters=[["email", "=", user_data['email']]])
     assert select_result["success"] is True
     assert len(select_result["data"]) == 1
     assert select_result["data"][0]["email"] == user_data["email"]
@@ -139,7 +141,7 @@ def test_bulk_insert(db_client: DatabaseClient):
     assert result["affected_rows"] == 2
 
     # Verify through select
-    select_result = db_client.select("users", "email LIKE 'bulk%@test.com'")
+    select_result = db_client.select("users", filters=[["email", "like", "bulk%@test.com"]])
     assert select_result["success"] is True
     assert len(select_result["data"]) == 2
 
@@ -158,11 +160,12 @@ def test_select_with_conditions(db_client: DatabaseClient):
     db_client.insert("users", user)
 
     # Test different select scenarios
-    result1 = db_client.select("users", f"email = '{user['email']}'")
+    result1 = db_client.select("users", filters=[["email", "=", user['email']]])
     assert result1["success"] is True
     assert len(result1["data"]) == 1
 
-    result2 = db_client.select("users", f"email = '{user['email']}'", ["name", "email"])
+    result2 = db_client.select("users", filters=[["email", "=", user['email']]],
+                                fields=["name", "email"])
     assert result2["success"] is True
     assert set(result2["data"][0].keys()) == {"name", "email"}
 
@@ -182,12 +185,12 @@ def test_update_user(db_client: DatabaseClient):
 
     # Update user
     update_data = {"name": "Updated", "surname": "New"}
-    result = db_client.update("users", update_data, f"email = '{user['email']}'")
+    result = db_client.update("users", update_data, filters=[["email", "=", user['email']]])
     assert result["success"] is True
     assert result["affected_rows"] == 1
 
     # Verify update
-    select_result = db_client.select("users", f"email = '{user['email']}'")
+    select_result = db_client.select("users", filters=[["email", "=", user['email']]])
     assert select_result["data"][0]["name"] == "Updated"
     assert select_result["data"][0]["surname"] == "New"
 
@@ -206,12 +209,12 @@ def test_delete_user(db_client: DatabaseClient):
     db_client.insert("users", user)
 
     # Delete user
-    result = db_client.delete("users", f"email = '{user['email']}'")
+    result = db_client.delete("users", filters=[["email", "=", user['email']]])
     assert result["success"] is True
     assert result["affected_rows"] == 1
 
     # Verify deletion
-    select_result = db_client.select("users", f"email = '{user['email']}'")
+    select_result = db_client.select("users", filters=[["email", "=", user['email']]])
     assert len(select_result["data"]) == 0
 
 
@@ -230,7 +233,7 @@ def test_execute_raw_query(db_client: DatabaseClient):
     assert result["success"] is True
 
     # Verify using select
-    select_result = db_client.select("users", "email = 'raw@test.com'")
+    select_result = db_client.select("users", filters=[["email", "=", "raw@test.com"]])
     assert len(select_result["data"]) == 1
 
 
@@ -277,5 +280,27 @@ def test_connection_error_handling(db_client: DatabaseClient):
     assert "Connection" in str(exc_info.value.detail)
 
 
+
+def test_iter_select_parses_ndjson():
+    """Test that streamed selects are parsed line by line."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_lines.return_value = iter([b'{"id": 1}', b'', b'{"id": 2}'])
+    client = DatabaseClient("http://db")
+    with patch.object(client._session.session, "request", return_value=response) as request:
+        rows = client.iter_select("individual_listings",
+                                  filters=[["contacted", "=", False]],
+                                  batch_size=100)
+        assert list(rows) == [{"id": 1}, {"id": 2}]
+
+    args, kwargs = request.call_args
+    assert args == ("GET", "http://db/select")
+    assert kwargs["stream"] is True
+    assert kwargs["timeout"] == DEFAULT_TIMEOUT
+    assert kwargs["params"]["stream"] == "true"
+    assert kwargs["params"]["filters"] == '[["contacted", "=", false]]'
+    response.__exit__.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
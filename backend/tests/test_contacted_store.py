@@ -0,0 +1,47 @@
+import pytest
+from contacted_store import ContactedStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "contacted_listings.sqlite3")
+
+
+def test_add_and_contains(db_path):
+    store = ContactedStore(db_path)
+    identifier = ContactedStore.identifier("John Doe", "Mitte, Berlin")
+    assert identifier == "John Doe: Mitte, Berlin"
+    assert identifier not in store
+
+    store.add(identifier, listing_id=123)
+    store.add(identifier, listing_id=123)
+    assert identifier in store
+    assert len(store) == 1
+
+
+def test_persisted_between_runs(db_path):
+    store = ContactedStore(db_path)
+    store.add(ContactedStore.identifier("John Doe", "Mitte, Berlin"))
+    store.close()
+
+    reopened = ContactedStore(db_path)
+    assert "John Doe: Mitte, Berlin" in reopened
+    assert "Jane Smith: Wedding, Berlin" not in reopened
+
+
+def test_import_legacy_file(db_path, tmp_path):
+    legacy_file = tmp_path / "past_listings.txt"
+    legacy_file.write_text("John Doe: Mitte, Berlin\nJane Smith: Wedding, Berlin\n"
+                           "John Doe: Mitte, Berlin\n")
+    store = ContactedStore(db_path)
+    store.add("Jane Smith: Wedding, Berlin")
+
+    assert store.import_legacy_file(str(legacy_file)) == 1
+    assert "John Doe: Mitte, Berlin" in store
+    assert len(store) == 2
+
+    # the legacy file is moved out of the way so the import only runs once
+    assert not legacy_file.exists()
+    assert (tmp_path / "past_listings.txt.imported").exists()
+    assert store.import_legacy_file(str(legacy_file)) == 0
+    assert "John Doe: Mitte, Berlin" in ContactedStore(db_path)
@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from detail_fetcher import DetailFetcher, _HostRateLimiter
+
+
+def make_response(status_code=200, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return response
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = DetailFetcher(max_workers=4, requests_per_second=0, backoff=0)
+    yield fetcher
+    fetcher.close()
+
+
+def test_prefetch_and_get(fetcher):
+    fetcher._session.get = MagicMock(
+        side_effect=lambda url, timeout: make_response(text=f"<html>{url}</html>"))
+    refs = [f"/wg-zimmer-in-Berlin-Mitte.{i}.html" for i in range(5)]
+    fetcher.prefetch(refs)
+
+    assert fetcher.get(refs[3]) == "<html>https://www.wg-gesucht.de" + refs[3] + "</html>"
+    # pages that were not prefetched are downloaded on demand
+    assert "999" in fetcher.get("/wg-zimmer-in-Berlin-Mitte.999.html")
+    # the other prefetches may still be running, wait for all of them
+    fetcher.wait()
+    assert fetcher._session.get.call_count == 6
+
+
+def test_downloads_concurrently(fetcher):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_get(url, timeout):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return make_response(text="<html></html>")
+
+    fetcher._session.get = MagicMock(side_effect=slow_get)
+    refs = [f"/wg-zimmer-in-Berlin-Mitte.{i}.html" for i in range(8)]
+    fetcher.prefetch(refs)
+    for ref in refs:
+        fetcher.get(ref)
+
+    assert 1 < peak <= 4
+
+
+def test_retry_with_backoff(fetcher):
+    fetcher._session.get = MagicMock(side_effect=[
+        requests.ConnectionError(),
+        make_response(503),
+        make_response(text="<html>ok</html>"),
+    ])
+    assert fetcher.get("/wg-zimmer-in-Berlin-Mitte.123.html") == "<html>ok</html>"
+    assert fetcher._session.get.call_count == 3
+
+
+def test_gives_up_after_retries(fetcher):
+    fetcher._session.get = MagicMock(return_value=make_response(503))
+    with pytest.raises(requests.HTTPError):
+        fetcher.get("/wg-zimmer-in-Berlin-Mitte.123.html")
+    assert fetcher._session.get.call_count == fetcher.retries + 1
+
+
+def test_client_errors_are_not_retried(fetcher):
+    fetcher._session.get = MagicMock(return_value=make_response(404))
+    fetcher.prefetch(["/wg-zimmer-in-Berlin-Mitte.123.html"])
+    with pytest.raises(requests.HTTPError):
+        fetcher.get("/wg-zimmer-in-Berlin-Mitte.123.html")
+    assert fetcher._session.get.call_count == 1
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = _HostRateLimiter(requests_per_second=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("www.wg-gesucht.de")
+    # first request is immediate, the following four are 50ms apart
+    assert time.monotonic() - start >= 0.19
+
+    start = time.monotonic()
+    limiter.wait("img.wg-gesucht.de")
+    assert time.monotonic() - start < 0.05
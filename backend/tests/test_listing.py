@@ -0,0 +1,73 @@
+import dataclasses
+import pytest
+from datetime import datetime
+from listing import Listing
+
+
+@pytest.fixture
+def listing_fields():
+    return {
+        "user_name": "John Doe",
+        "address": "Mitte, Berlin",
+        "wg_type": "2er WG",
+        "rental_length_months": 3,
+        "rental_start": datetime(2024, 5, 1),
+        "verified_business": False,
+    }
+
+
+def test_parse_id():
+    assert Listing.parse_id("/wg-zimmer-in-Berlin-Mitte.123.html") == 123
+    assert Listing.parse_id("/wg-zimmer-in-Berlin-Charlottenburg.9848754.html") == 9848754
+    assert Listing.parse_id("/wg-zimmer-in-Berlin-Mitte.html") is None
+
+
+def test_from_ref(listing_fields):
+    listing = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.123.html", **listing_fields)
+    assert listing.listing_id == 123
+    assert listing.url == "https://www.wg-gesucht.de/wg-zimmer-in-Berlin-Mitte.123.html"
+
+    with pytest.raises(ValueError):
+        Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.html", **listing_fields)
+
+
+def test_identity_by_ad_id(listing_fields):
+    listing = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.123.html", **listing_fields)
+    # same ad, but e.g. the user edited the rental dates in between two polls
+    edited = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.123.html",
+                              **{
+                                  **listing_fields, "rental_length_months": 6
+                              })
+    other = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.456.html", **listing_fields)
+
+    assert listing == edited
+    assert hash(listing) == hash(edited)
+    assert listing != other
+    assert {listing, edited, other} == {listing, other}
+
+
+def test_immutable_and_slotted(listing_fields):
+    listing = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.123.html", **listing_fields)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        listing.user_name = "Jane Smith"
+    assert not hasattr(listing, "__dict__")
+
+
+def test_to_dict_and_row(listing_fields):
+    listing = Listing.from_ref("/wg-zimmer-in-Berlin-Mitte.123.html", **listing_fields)
+
+    assert listing.to_dict() == {
+        "ref": "/wg-zimmer-in-Berlin-Mitte.123.html",
+        "user_name": "John Doe",
+        "address": "Mitte, Berlin",
+        "wg_type": "2er WG",
+        "rental_length_months": 3,
+        "rental_start": datetime(2024, 5, 1),
+    }
+    assert listing.to_row(search_config_id=7) == {
+        "listing_id": "123",
+        "listing_url": "https://www.wg-gesucht.de/wg-zimmer-in-Berlin-Mitte.123.html",
+        "location": "Mitte, Berlin",
+        "rental_start_date": "2024-05-01",
+        "search_config_id": 7,
+    }
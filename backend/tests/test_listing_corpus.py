@@ -0,0 +1,101 @@
+import gzip
+import json
+import pytest
+from listing_corpus import ListingCorpus
+
+
+def test_append_and_stream(tmp_path):
+    corpus = ListingCorpus(str(tmp_path / "listing_texts.jsonl"))
+    corpus.append("First text\n\nwith paragraphs", ref="/wg-zimmer-in-Berlin.123.html")
+    corpus.append("Zweiter Text mit Umlauten: äöü")
+
+    records = list(corpus)
+    assert [record["text"] for record in records] == [
+        "First text\n\nwith paragraphs", "Zweiter Text mit Umlauten: äöü"
+    ]
+    assert records[0]["ref"] == "/wg-zimmer-in-Berlin.123.html"
+    assert len((tmp_path / "listing_texts.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_empty_corpus(tmp_path):
+    assert list(ListingCorpus(str(tmp_path / "listing_texts.jsonl"))) == []
+
+
+def test_segments(tmp_path):
+    path = tmp_path / "listing_texts.jsonl"
+    corpus = ListingCorpus(str(path), segment_size=2)
+    for i in range(5):
+        corpus.append(f"text {i}")
+
+    segments = sorted(tmp_path.glob("listing_texts.*.jsonl.gz"))
+    assert [segment.name for segment in segments] == [
+        "listing_texts.000001.jsonl.gz", "listing_texts.000002.jsonl.gz"
+    ]
+    with gzip.open(segments[0], "rt") as f:
+        assert [json.loads(line)["text"] for line in f] == ["text 0", "text 1"]
+
+    # a new writer picks up the number of records in the active file
+    corpus = ListingCorpus(str(path), segment_size=2)
+    corpus.append("text 5")
+    assert not path.exists()
+    assert list(corpus.texts()) == [f"text {i}" for i in range(6)]
+
+
+def test_interrupted_roll_over_is_finished_once(tmp_path):
+    path = tmp_path / "listing_texts.jsonl"
+    corpus = ListingCorpus(str(path), segment_size=2)
+    for i in range(2):
+        corpus.append(f"text {i}")
+    segment = tmp_path / "listing_texts.000001.jsonl.gz"
+
+    # crashed after the segment was written, before its snapshot was removed
+    pending = tmp_path / "listing_texts.000001.jsonl.pending"
+    with gzip.open(segment, "rb") as f:
+        pending.write_bytes(f.read())
+    # crashed right after the active file was renamed
+    (tmp_path / "listing_texts.000002.jsonl.pending").write_text(
+        json.dumps({"text": "text 2"}) + "\n", encoding="utf-8")
+
+    corpus = ListingCorpus(str(path), segment_size=2)
+    assert list(corpus.texts()) == ["text 0", "text 1", "text 2"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "listing_texts.000001.jsonl.gz", "listing_texts.000002.jsonl.gz"
+    ]
+
+
+def test_import_legacy_json(tmp_path):
+    legacy_file = tmp_path / "listing_texts.json"
+    legacy_file.write_text(json.dumps({"texts": ["old text", "older text"]}))
+    corpus = ListingCorpus(str(tmp_path / "listing_texts.jsonl"))
+
+    assert corpus.import_legacy_json(str(legacy_file)) == 2
+    assert list(corpus.texts()) == ["old text", "older text"]
+    assert not legacy_file.exists()
+    assert corpus.import_legacy_json(str(legacy_file)) == 0
+
+
+def test_interrupted_import_resumes_once(tmp_path, monkeypatch):
+    legacy_file = tmp_path / "listing_texts.json"
+    legacy_file.write_text(json.dumps({"texts": ["text 0", "text 1", "text 2"]}))
+    corpus = ListingCorpus(str(tmp_path / "listing_texts.jsonl"), segment_size=1)
+
+    append = ListingCorpus.append
+    calls = []
+
+    def crash_on_second_append(self, text, **metadata):
+        calls.append(text)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        append(self, text, **metadata)
+
+    monkeypatch.setattr(ListingCorpus, "append", crash_on_second_append)
+    with pytest.raises(KeyboardInterrupt):
+        corpus.import_legacy_json(str(legacy_file))
+    monkeypatch.undo()
+    assert not legacy_file.exists()
+
+    corpus = ListingCorpus(str(tmp_path / "listing_texts.jsonl"), segment_size=1)
+    assert corpus.import_legacy_json(str(legacy_file)) == 2
+    assert list(corpus.texts()) == ["text 0", "text 1", "text 2"]
+    assert corpus.import_legacy_json(str(legacy_file)) == 0
+    assert (tmp_path / "listing_texts.json.imported").exists()
@@ -1,10 +1,13 @@
 import os
 import pytest
+import requests
+from contextlib import contextmanager
 from utils import getenv
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 from datetime import datetime
 from pathlib import Path
 from listing_getter import ListingGetter
+from utils.page_pool import PagePool
 
 
 @pytest.fixture
@@ -63,9 +66,35 @@ class MockPlaywright:
         pass
 
 
+class MockPagePool:
+
+    def __init__(self, html_content):
+        self.html_content = html_content
+        self.borrowed = 0
+
+    @contextmanager
+    def page(self):
+        self.borrowed += 1
+        yield MockPlaywright(self.html_content)
+
+
 @pytest.fixture
-def listing_getter(sample_html):
-    return ListingGetter(sample_html)
+def mock_http():
+    with patch("listing_getter._http_session") as mock_session:
+        yield mock_session
+
+
+@pytest.fixture
+def page_pool():
+    # an own pool instead of the process wide one, so Playwright is stopped after the test
+    pool = PagePool()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def listing_getter(sample_html, page_pool):
+    return ListingGetter(sample_html, page_pool=page_pool)
 
 
 def test_reference_urls(listing_getter):
@@ -141,19 +170,107 @@ def test_convert_to_datetime():
     assert result == datetime(2024, 5, 1)
 
 
-def test_empty_and_single_listing(create_test_html):
+def test_empty_and_single_listing(create_test_html, page_pool):
     # Test empty HTML
     empty_url = create_test_html("<div id='main_column'></div>")
-    empty_getter = ListingGetter(empty_url)
+    empty_getter = ListingGetter(empty_url, page_pool=page_pool)
     assert len(empty_getter.listings) == 0
 
     # Test single listing HTML
     single_url = create_test_html(
         "<div id='main_column'><div id='liste-details-ad-12345'></div></div>")
-    single_getter = ListingGetter(single_url)
+    single_getter = ListingGetter(single_url, page_pool=page_pool)
     assert len(single_getter.listings) == 1
 
 
+def test_http_fast_path(mock_http):
+    mock_http.get.return_value.text = (
+        "<html><body><div id='main_column'><div id='liste-details-ad-12345'></div>"
+        "</div></body></html>")
+    page_pool = MockPagePool("")
+
+    getter = ListingGetter("https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+                           page_pool=page_pool)
+
+    assert len(getter.listings) == 1
+    assert getter.fetched_via == "http"
+    assert page_pool.borrowed == 0
+
+
+def test_browser_fallback_without_listings(mock_http):
+    # e.g. a captcha page or a page that only renders the listings with javascript
+    mock_http.get.return_value.text = "<html><body><div id='main_column'></div></body></html>"
+    page_pool = MockPagePool("<div id='liste-details-ad-12345'></div>")
+
+    getter = ListingGetter("https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+                           page_pool=page_pool)
+
+    assert len(getter.listings) == 1
+    assert getter.fetched_via == "browser"
+    assert page_pool.borrowed == 1
+
+
+def test_browser_fallback_on_request_error(mock_http):
+    mock_http.get.side_effect = requests.ConnectionError()
+    page_pool = MockPagePool("<div id='liste-details-ad-12345'></div>")
+
+    getter = ListingGetter("https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+                           page_pool=page_pool)
+
+    assert len(getter.listings) == 1
+    assert page_pool.borrowed == 1
+
+
+def test_fetch_modes(mock_http):
+    mock_http.get.return_value.text = "<html><body></body></html>"
+    page_pool = MockPagePool("<div id='liste-details-ad-12345'></div>")
+    url = "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html"
+
+    http_getter = ListingGetter(url, page_pool=page_pool, fetch_mode="http")
+    assert len(http_getter.listings) == 0
+    assert page_pool.borrowed == 0
+
+    browser_getter = ListingGetter(url, page_pool=page_pool, fetch_mode="browser")
+    assert len(browser_getter.listings) == 1
+    mock_http.get.assert_called_once()
+
+    with pytest.raises(ValueError):
+        ListingGetter(url, page_pool=page_pool, fetch_mode="selenium")
+
+
+def test_single_pass_records(mock_http):
+    mock_http.get.return_value.text = (Path(__file__).parent / "data" /
+                                       "search_results.html").read_text()
+    getter = ListingGetter("https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+                           page_pool=MockPagePool(""))
+
+    assert len(getter.records) == 30
+    info_dict = getter.all_infos
+    # one verified business and one letting agency are filtered out
+    assert len(info_dict) == 28
+    assert info_dict[0]["ref"] == "/wg-zimmer-in-Berlin-Neukoelln.9848700.html"
+    assert info_dict[0]["rental_length_months"] == -1
+
+    listings = getter.all_listings
+    assert len(listings) == 28
+    assert listings[0].listing_id == 9848700
+    assert [listing.to_dict() for listing in listings] == list(info_dict.values())
+
+
+def test_malformed_listing_is_skipped(mock_http):
+    mock_http.get.return_value.text = (Path(__file__).parent / "data" / "sample.html").read_text()
+    # the first listing loses its rental dates
+    mock_http.get.return_value.text = mock_http.get.return_value.text.replace(
+        "01.05.2024 - 01.08.2024", "", 1)
+    getter = ListingGetter("https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+                           page_pool=MockPagePool(""))
+
+    assert len(getter.listings) == 2
+    assert list(getter.records) == [1]
+    assert getter.user_names == ["Jane Smith"]
+    assert getter.all_infos == {}
+
+
 def test_malformed_date_handling():
     # Should raise ValueError for malformed date
     with pytest.raises(ValueError):
@@ -1,9 +1,11 @@
+import lxml.html
 import pytest
 import json
 import os
 from unittest.mock import patch
 from pathlib import Path
 from src.listing_info_getter import ListingInfoGetter
+from listing_corpus import ListingCorpus
 
 @pytest.fixture
 def listing_html():
@@ -53,26 +55,22 @@ def test_compute_rental_duration():
     assert ListingInfoGetter._compute_rental_duration("01.05.2024") == -1
 
 def test_save_listing_text(tmp_path):
-    file_path = tmp_path / "test_listings.json"
+    file_path = tmp_path / "test_listings.jsonl"
     test_text = "Sample listing text"
     
     # Test creating new file
     ListingInfoGetter.save_listing_text(str(file_path), test_text)
     
     with open(file_path) as f:
-        data = json.load(f)
-        assert "texts" in data
-        assert test_text in data["texts"]
+        lines = f.readlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["text"] == test_text
     
     # Test appending to existing file
     new_text = "Another listing text"
     ListingInfoGetter.save_listing_text(str(file_path), new_text)
     
-    with open(file_path) as f:
-        data = json.load(f)
-        assert len(data["texts"]) > 1
-        assert test_text in data["texts"]
-        assert new_text in data["texts"]
+    assert list(ListingCorpus(str(file_path)).texts()) == [test_text, new_text]
 
 def test_rental_duration_no_dates():
     html_without_dates = """
@@ -113,4 +111,61 @@ def test_different_text_formats(html, expected_text):
     with patch('requests.get') as mock_get:
         mock_get.return_value.text = html
         getter = ListingInfoGetter("/test.html")
-        assert getter.listing_text == expected_text
\ No newline at end of file
+        assert getter.listing_text == expected_text
+
+def test_prefetched_html(listing_html):
+    with patch('requests.get') as mock_get:
+        getter = ListingInfoGetter("/wg-zimmer-test.html", html=listing_html)
+        assert getter.rental_duration_months == 3
+        mock_get.assert_not_called()
+
+DATA_DIR = Path(__file__).parent / "data"
+
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_details_from_saved_page(fast_path):
+    html = (DATA_DIR / "listing_detail.html").read_text()
+    details = ListingInfoGetter("/wg-zimmer-in-Berlin-Charlottenburg.9848754.html",
+                                html=html, fast_path=fast_path).details
+
+    assert details.title == "Helles Zimmer in Charlottenburg"
+    assert details.text.startswith("Zimmer\n\nDas Zimmer ist 18 m² groß und hell.\n\n")
+    assert details.rental_dates == ("01.05.2024", "01.08.2024")
+    assert (details.price, details.size, details.rent) == (550, 18, 450)
+    assert (details.utilities, details.other_costs, details.deposit) == (70, 30, 1200)
+    assert details.buyout is None
+    assert details.to_row() == {
+        "listing_title": "Helles Zimmer in Charlottenburg",
+        "price": 550,
+        "size": 18,
+        "utilities": 70,
+        "other_costs": 30,
+        "deposit": 1200,
+        "rental_start_date": "2024-05-01",
+    }
+
+@pytest.mark.parametrize("name", ["listing_detail.html", "listing_detail_unlimited.html"])
+def test_fast_path_matches_soup(name):
+    html = (DATA_DIR / name).read_text()
+    fast = ListingInfoGetter("/test.1.html", html=html).details
+    soup = ListingInfoGetter("/test.1.html", html=html, fast_path=False).details
+    assert fast == soup
+
+def test_unlimited_listing():
+    html = (DATA_DIR / "listing_detail_unlimited.html").read_text()
+    getter = ListingInfoGetter("/test.1.html", html=html)
+    assert getter.rental_duration_months == -1
+    assert getter.details.utilities is None
+    assert getter.details.price == 420
+
+def test_page_is_parsed_once(listing_html):
+    getter = ListingInfoGetter("/wg-zimmer-test.html", html=listing_html)
+    with patch('lxml.html.fromstring', wraps=lxml.html.fromstring) as mock_parse:
+        _ = getter.listing_text
+        _ = getter.rental_duration_months
+        _ = getter.details.price
+    assert mock_parse.call_count == 1
+
+def test_missing_description():
+    getter = ListingInfoGetter("/test.html", html="<html><body><p>Nothing</p></body></html>")
+    with pytest.raises(ValueError, match="Could not get listing text!"):
+        _ = getter.listing_text
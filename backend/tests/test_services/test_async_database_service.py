@@ -0,0 +1,194 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.async_database_service import (
+    _NUMBER_CODECS,
+    AsyncDatabaseService,
+    _affected_rows,
+    _decode_date,
+    _decode_timestamp,
+    _decode_timestamptz,
+    _encode_date,
+    _encode_timestamp,
+    to_asyncpg_query,
+)
+from services.database_service import DBConfig
+from tests.logger import TestLogger
+
+logger = TestLogger(Path(__file__).stem)
+
+
+def mock_async_db_service():
+    """Creates an `AsyncDatabaseService` whose pool hands out a mocked connection."""
+    db_service = AsyncDatabaseService(DBConfig(host="localhost", port=5432, database="postgres",
+                                               user="user", password="password"))
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=lambda query, *params:
+                             f"INSERT 0 {query.count('(') - 1}")
+    conn.fetch = AsyncMock(return_value=[{"id": 1}])
+    conn.copy_records_to_table = AsyncMock(side_effect=lambda table, records, columns:
+                                           f"COPY {len(records)}")
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    db_service.pool = MagicMock()
+    db_service.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    db_service.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return db_service, conn
+
+
+def test_placeholders_are_numbered():
+    """Test psycopg2 placeholders are translated to asyncpg placeholders."""
+    logger.info("Testing placeholder translation")
+    assert to_asyncpg_query("SELECT * FROM users WHERE id = %s AND name LIKE %s") == \
+        "SELECT * FROM users WHERE id = $1 AND name LIKE $2"
+    assert to_asyncpg_query("SELECT '100%%' WHERE x = %s") == "SELECT '100%' WHERE x = $1"
+
+
+def test_affected_rows():
+    """Test the row count is parsed from the command status."""
+    assert _affected_rows("INSERT 0 3") == 3
+    assert _affected_rows("UPDATE 2") == 2
+    assert _affected_rows("CREATE TABLE") == 0
+
+
+def test_temporal_codecs_accept_iso_strings():
+    """Test dates and timestamps from the JSON API round trip through the codecs."""
+    logger.info("Testing date and timestamp codecs")
+    assert _decode_date(_encode_date("2024-05-01")) == date(2024, 5, 1)
+    assert _encode_date(date(2000, 1, 2)) == (1,)
+    assert _decode_timestamp(_encode_timestamp("2024-05-01T12:30:00.500000")) == \
+        datetime(2024, 5, 1, 12, 30, 0, 500000)
+    aware = datetime(2024, 5, 1, 14, tzinfo=timezone(timedelta(hours=2)))
+    assert _decode_timestamptz(_encode_timestamp(aware)) == aware
+    assert _decode_timestamptz(_encode_timestamp(aware.isoformat())) == aware
+
+
+def test_query_keeps_literal_percent_signs():
+    """Test queries without parameters are sent unchanged, like with psycopg2."""
+    db_service, conn = mock_async_db_service()
+    query = "SELECT * FROM users WHERE email LIKE '%@example.com'"
+    result = asyncio.run(db_service.execute_query(query))
+    assert result == {"success": True, "data": [{"id": 1}]}
+    conn.fetch.assert_awaited_once_with(query)
+
+
+def test_conditions_without_params_are_rejected():
+    """Test values have to be passed as params or filters, not written into conditions."""
+    db_service, conn = mock_async_db_service()
+    for result in (
+            asyncio.run(db_service.select("users", conditions="email LIKE '%@example.com'")),
+            asyncio.run(db_service.update("users", {"name": "Alice"}, "id = 1")),
+            asyncio.run(db_service.delete("users", "id = 1"))):
+        assert result["success"] is False
+        assert "params" in result["error"]
+    db_service.pool.acquire.assert_not_called()
+
+
+def test_bulk_insert_pages():
+    """Test bulk inserts are sent as multi-row statements of at most page_size rows."""
+    logger.info("Testing async bulk insert paging")
+    db_service, conn = mock_async_db_service()
+    data = [{"name": f"User{i}", "email": f"user{i}@example.com"} for i in range(5)]
+
+    result = asyncio.run(db_service.bulk_insert("users", data, page_size=2))
+
+    assert result == {"success": True, "affected_rows": 5}
+    assert conn.execute.await_count == 3
+    query, *params = conn.execute.await_args_list[0].args
+    assert query == "INSERT INTO users (name, email) VALUES ($1, $2), ($3, $4)"
+    assert params == ["User0", "user0@example.com", "User1", "user1@example.com"]
+
+
+def test_bulk_insert_copy_upsert():
+    """Test COPY upserts go through a staging table."""
+    db_service, conn = mock_async_db_service()
+    data = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+
+    result = asyncio.run(db_service.bulk_insert("users", data, method="copy",
+                                                on_conflict="update", conflict_columns=["id"]))
+
+    assert result["success"] is True
+    conn.copy_records_to_table.assert_awaited_once_with(
+        "_bulk_insert_users", records=[(1, "Alice"), (2, "Bob")], columns=["id", "name"])
+    upsert = conn.execute.await_args_list[-1].args[0]
+    assert upsert.startswith("INSERT INTO users (id, name) SELECT id, name FROM _bulk_insert_users")
+    assert "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name" in upsert
+
+
+def test_insert_returning():
+    """Test inserts with a RETURNING clause fetch the returned rows."""
+    db_service, conn = mock_async_db_service()
+    conn.fetch = AsyncMock(return_value=[{"id": 7}])
+
+    result = asyncio.run(db_service.insert("users", {"email": "a@example.com"},
+                                           returning=["id"]))
+
+    assert result == {"success": True, "affected_rows": 1, "data": [{"id": 7}]}
+    conn.fetch.assert_awaited_once_with(
+        "INSERT INTO users (email) VALUES ($1) RETURNING id", "a@example.com")
+    conn.execute.assert_not_awaited()
+
+
+def test_cte_query_returns_rows():
+    """Test statements that are not a plain SELECT return their rows, like with psycopg2."""
+    db_service, conn = mock_async_db_service()
+    prepared = MagicMock()
+    prepared.fetch = AsyncMock(return_value=[{"id": 1}, {"id": 2}])
+    prepared.get_statusmsg.return_value = "SELECT 2"
+    prepared.get_attributes.return_value = (MagicMock(name="id"),)
+    conn.prepare = AsyncMock(return_value=prepared)
+
+    query = "WITH recent AS (SELECT id FROM users WHERE id > %s) SELECT id FROM recent"
+    result = asyncio.run(db_service.execute_query(query, (0,)))
+
+    assert result == {"success": True, "affected_rows": 2, "data": [{"id": 1}, {"id": 2}]}
+    conn.prepare.assert_awaited_once_with(
+        "WITH recent AS (SELECT id FROM users WHERE id > $1) SELECT id FROM recent")
+    prepared.fetch.assert_awaited_once_with(0)
+
+    prepared.get_statusmsg.return_value = "CREATE INDEX"
+    prepared.get_attributes.return_value = ()
+    result = asyncio.run(db_service.execute_query("CREATE INDEX idx ON users (email)"))
+    assert result == {"success": True, "affected_rows": 0}
+
+
+def test_invalid_identifiers_are_reported():
+    """Test table and column names are checked before they are written into SQL."""
+    db_service, conn = mock_async_db_service()
+    result = asyncio.run(db_service.select("users u", fields=["id"]))
+    assert result == {"success": False, "error": "Invalid table name: 'users u'"}
+    result = asyncio.run(db_service.insert("users", {"id) --": 1}))
+    assert result == {"success": False, "error": "Invalid column name: 'id) --'"}
+    result = asyncio.run(db_service.bulk_insert("users u", [{"id": 1}]))
+    assert result == {"success": False, "error": "Invalid table name: 'users u'"}
+    db_service.pool.acquire.assert_not_called()
+
+
+def test_bulk_insert_invalid_method():
+    """Test an unknown bulk insert method is reported as a failed result."""
+    db_service, conn = mock_async_db_service()
+    result = asyncio.run(db_service.bulk_insert("users", [{"id": 1}], method="binary"))
+    assert result["success"] is False
+    conn.execute.assert_not_awaited()
+
+
+def test_numbers_from_json_strings():
+    """Test ids passed as strings bind to integer and boolean columns."""
+    encode, decode = _NUMBER_CODECS["int4"]
+    assert decode(encode("42")) == 42
+    encode, decode = _NUMBER_CODECS["bool"]
+    assert decode(encode("false")) is False and decode(encode(True)) is True
+
+
+def test_select_with_filters():
+    """Test structured filters are compiled to numbered placeholders."""
+    db_service, conn = mock_async_db_service()
+    result = asyncio.run(db_service.select("searches", filters=[["user_id", "=", "1"]],
+                                           order_by=["id desc"], limit=10))
+    assert result["success"] is True
+    conn.fetch.assert_awaited_once_with(
+        "SELECT * FROM searches WHERE user_id = $1 ORDER BY id DESC LIMIT $2", "1", 10)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from services.async_search_service import AsyncSearchService
+from services.search_service import SearchConfig, SearchFilters
+from tests.logger import TestLogger
+
+logger = TestLogger(Path(__file__).stem)
+
+
+def mock_search_service(handler) -> AsyncSearchService:
+    """Creates an `AsyncSearchService` whose API requests are answered by `handler`."""
+    service = AsyncSearchService(auth_api_url="http://auth", db_api_url="http://db")
+
+    def get():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    service.client.get = get
+    return service
+
+
+@pytest.fixture
+def sample_search_config() -> SearchConfig:
+    return SearchConfig(
+        name="Berlin - Mitte Test",
+        filters=SearchFilters(
+            location="Mitte, Berlin",
+            maxPrice=800,
+            minSize=15,
+            dateRange="01.03.2024 - 01.04.2024",
+            propertyTypes=["0"],
+            rentTypes=["2"],
+            wgTypes=["6", "12"],
+            districts=["2114"],
+        ),
+    )
+
+
+def test_update_search(sample_search_config: SearchConfig):
+    """Test a search update checks ownership and updates by id."""
+    logger.info("Testing async search update")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/get-user-id":
+            return httpx.Response(200, json={"user_id": "1"})
+        if request.url.path == "/select":
+            return httpx.Response(200, json={"success": True, "data": [{"id": 5}]})
+        return httpx.Response(200, json={"success": True, "affected_rows": 1})
+
+    service = mock_search_service(handler)
+    asyncio.run(service.update_search("token", "5", sample_search_config))
+
+    assert [(r.method, r.url.host, r.url.path) for r in requests] == [
+        ("GET", "auth", "/get-user-id"),
+        ("GET", "db", "/select"),
+        ("PUT", "db", "/update"),
+    ]
+    # unset query parameters are left out instead of sent empty
+    assert "conditions" not in requests[1].url.params
+    assert json.loads(requests[1].url.params["filters"]) == [["id", "=", "5"],
+                                                             ["user_id", "=", "1"]]
+    update = json.loads(requests[2].content)
+    assert update["filters"] == [["id", "=", "5"]]
+    assert update["data"]["max_price"] == 800
+
+
+def test_create_search_returns_generated_id(sample_search_config: SearchConfig):
+    """Test the id of a new search is taken from the insert."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/get-user-id":
+            return httpx.Response(200, json={"user_id": "1"})
+        assert json.loads(request.content)["returning"] == ["id"]
+        return httpx.Response(200, json={"success": True, "data": [{"id": 42}]})
+
+    service = mock_search_service(handler)
+    assert asyncio.run(service.create_search("token", sample_search_config)) == "42"
+
+
+def test_api_errors_keep_status_code(sample_search_config: SearchConfig):
+    """Test errors of the auth API are raised with their status code and detail."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"detail": "Invalid session token"})
+
+    service = mock_search_service(handler)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.delete_search("token", "5"))
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Invalid session token"
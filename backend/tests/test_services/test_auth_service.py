@@ -146,7 +146,7 @@ def test_wg_gesucht_authentication_flow(
     # Verify user was created in database
     user_result = db_service.select(
         "users",
-        conditions=f"email = '{wg_credentials['email']}'",
+        filters=[["email", "=", wg_credentials['email']]],
     )
     assert user_result["success"]
     assert len(user_result["data"]) == 1
@@ -154,7 +154,7 @@ def test_wg_gesucht_authentication_flow(
     # Verify session was created
     session_result = db_service.select(
         "sessions",
-        conditions=f"user_id = '{response.user_id}'",
+        filters=[["user_id", "=", response.user_id]],
     )
     assert session_result["success"]
     assert len(session_result["data"]) == 1
@@ -185,7 +185,7 @@ def test_wg_gesucht_authentication_invalid_credentials(
     # Ensure no user was created in the database
     user_result = db_service.select(
         "users",
-        conditions=f"email = '{invalid_credentials['email']}'",
+        filters=[["email", "=", invalid_credentials['email']]],
     )
     assert user_result["success"]
     assert len(user_result["data"]) == 0
@@ -193,7 +193,7 @@ def test_wg_gesucht_authentication_invalid_credentials(
     # Ensure no session was created
     session_result = db_service.select(
         "sessions",
-        conditions=f"user_id = '{invalid_credentials['email']}'",
+        filters=[["user_id", "=", invalid_credentials['email']]],
     )
     assert session_result["success"]
     assert len(session_result["data"]) == 0
@@ -286,10 +286,40 @@ def test_session_management(
     # Verify both sessions exist in database
     sessions = db_service.select(
         "sessions",
-        conditions=f"user_id = '{response1.user_id}'",
+        filters=[["user_id", "=", response1.user_id]],
     )
     assert len(sessions["data"]) == 2
 
 
+def test_session_revocation(
+    auth_service: AuthService,
+    wg_credentials: dict,
+    db_service: DatabaseService,
+):
+    """Test revoked sessions are rejected, also by a freshly started service."""
+    token1 = auth_service.authenticate_wg_gesucht(wg_credentials).session_token
+    token2 = auth_service.authenticate_wg_gesucht(wg_credentials).session_token
+
+    assert auth_service.revoke_session(token1) is True
+    assert auth_service.revoke_session(token1) is False
+    assert auth_service.validate_session_token(token1) is False
+    with pytest.raises(HTTPException) as exc_info:
+        auth_service.get_user_id(token1)
+    assert exc_info.value.status_code == 401
+    assert auth_service.validate_session_token(token2) is True
+
+    # another process loads the revocation from the sessions table
+    other_service = AuthService(browser_manager=auth_service._browser_manager,
+                                db_api_url=auth_service._db_api_url)
+    other_service._jwt_signing_key = other_service._jwt_verification_key = \
+        auth_service._jwt_verification_key
+    other_service.start_session_sync(poll_interval=0.1)
+    try:
+        assert other_service.validate_session_token(token1) is False
+        assert other_service.validate_session_token(token2) is True
+    finally:
+        other_service.stop_session_sync()
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
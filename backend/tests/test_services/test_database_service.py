@@ -5,6 +5,8 @@ from datetime import datetime
 from pathlib import Path
 from services.database_service import DatabaseService, DBConfig
 from typing import Generator, Dict
+from unittest.mock import MagicMock, patch
+from utils.statement_cache import StatementCache
 from tests.logger import TestLogger
 
 logger = TestLogger(Path(__file__).stem)
@@ -71,7 +73,7 @@ def test_insert_user(db_service: DatabaseService, clean_users_table):
     assert result["affected_rows"] == 1
 
     # Verify insertion
-    select_result = db_service.select("users", "email = 'test@example.com'")
+    select_result = db_service.select("users", filters=[["email", "=", "test@example.com"]])
     assert select_result["success"] is True
     assert len(select_result["data"]) == 1
     assert select_result["data"][0]["email"] == user_data["email"]
@@ -124,11 +126,23 @@ def test_select_users(db_service: DatabaseService, clean_users_table):
     assert len(result["data"]) == 2
 
     # Test selecting with condition
-    result = db_service.select("users", "email LIKE '%john%'")
+    result = db_service.select("users", filters=[["email", "like", "%john%"]])
     assert result["success"] is True
     assert len(result["data"]) == 1
     assert result["data"][0]["email"] == "john@example.com"
 
+    # Test selecting with parameterised condition, prepared on first use
+    for email in ("john@example.com", "jane@example.com"):
+        result = db_service.select("users", "email = %s", params=(email,))
+        assert result["success"] is True
+        assert [user["email"] for user in result["data"]] == [email]
+
+    # Test selecting with a structured filter
+    result = db_service.select("users", filters=[["email", "in", ["john@example.com"]]],
+                               order_by=["name"], limit=1)
+    assert result["success"] is True
+    assert [user["email"] for user in result["data"]] == ["john@example.com"]
+
     # Test selecting specific fields
     result = db_service.select("users", fields=["email", "name"])
     assert result["success"] is True
@@ -151,12 +165,12 @@ def test_update_user(db_service: DatabaseService, clean_users_table):
 
     # Update user
     update_data = {"name": "Updated", "surname": "Name"}
-    result = db_service.update("users", update_data, "email = 'test@example.com'")
+    result = db_service.update("users", update_data, filters=[["email", "=", "test@example.com"]])
     assert result["success"] is True
     assert result["affected_rows"] == 1
 
     # Verify update
-    select_result = db_service.select("users", "email = 'test@example.com'")
+    select_result = db_service.select("users", filters=[["email", "=", "test@example.com"]])
     assert select_result["success"] is True
     assert select_result["data"][0]["name"] == "Updated"
     assert select_result["data"][0]["surname"] == "Name"
@@ -176,12 +190,12 @@ def test_delete_user(db_service: DatabaseService, clean_users_table):
     db_service.insert("users", user_data)
 
     # Delete user
-    result = db_service.delete("users", "email = 'test@example.com'")
+    result = db_service.delete("users", filters=[["email", "=", "test@example.com"]])
     assert result["success"] is True
     assert result["affected_rows"] == 1
 
     # Verify deletion
-    select_result = db_service.select("users", "email = 'test@example.com'")
+    select_result = db_service.select("users", filters=[["email", "=", "test@example.com"]])
     assert select_result["success"] is True
     assert len(select_result["data"]) == 0
     logger.info("User deletion successful")
@@ -213,6 +227,281 @@ def test_bulk_insert(db_service: DatabaseService, clean_users_table):
     logger.info("Bulk insertion successful")
 
 
+@pytest.mark.parametrize("method", ["values", "copy"])
+def test_bulk_insert_upsert(db_service: DatabaseService, clean_users_table, method: str):
+    """Test bulk upserts with both insert methods."""
+    logger.info(f"Testing bulk upsert with {method}")
+    users = [{
+        "name": f"User{i}",
+        "surname": "Test",
+        "email": f"user{i}@example.com",
+        "created_at": datetime.now()
+    } for i in range(5)]
+
+    result = db_service.bulk_insert("users", users, method=method, page_size=2)
+    assert result["success"] is True
+    assert result["affected_rows"] == 5
+
+    # conflicting rows are skipped
+    result = db_service.bulk_insert("users", users[:2], method=method, on_conflict="nothing")
+    assert result["success"] is True
+    assert result["affected_rows"] == 0
+
+    # conflicting rows are overwritten
+    users[0]["name"] = "Renamed"
+    result = db_service.bulk_insert("users",
+                                    users[:2],
+                                    method=method,
+                                    on_conflict="update",
+                                    conflict_columns=["email"])
+    assert result["success"] is True
+    assert result["affected_rows"] == 2
+
+    select_result = db_service.select("users", filters=[["email", "=", "user0@example.com"]])
+    assert select_result["data"][0]["name"] == "Renamed"
+    logger.info("Bulk upsert successful")
+
+
+def mock_db_service() -> DatabaseService:
+    """A service whose pool hands out a mocked connection."""
+    service = DatabaseService.__new__(DatabaseService)
+    service.pool = MagicMock()
+    conn = service.pool.connection.return_value.__enter__.return_value
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.rowcount = 2
+    # statements without a RETURNING clause have no result description
+    cur.description = None
+    return service
+
+
+def test_crud_helpers_use_prepared_statements():
+    """Test that CRUD statements with parameterised conditions share prepared statements."""
+    service = mock_db_service()
+    service.statements = StatementCache()
+    cur = service.pool.connection.return_value.__enter__.return_value \
+        .cursor.return_value.__enter__.return_value
+    cur.connection.prepared = set()
+    cur.fetchall.return_value = [{"id": 1}]
+
+    for user_id in (1, 2):
+        result = service.select("users", "id = %s", params=(user_id,))
+        assert result == {"success": True, "data": [{"id": 1}]}
+    result = service.update("users", {"name": "Alice"}, "id = %s", params=(1,))
+    assert result == {"success": True, "affected_rows": 2}
+
+    queries = [call.args[0] for call in cur.execute.call_args_list]
+    assert queries == [
+        "PREPARE crud_1 AS SELECT * FROM users WHERE id = $1",
+        "EXECUTE crud_1 (%s)",
+        "EXECUTE crud_1 (%s)",
+        "PREPARE crud_2 AS UPDATE users SET name = $1 WHERE id = $2",
+        "EXECUTE crud_2 (%s, %s)",
+    ]
+    assert cur.execute.call_args_list[-1].args[1] == ("Alice", 1)
+    assert service.statement_cache_stats()["hits"] == 1
+
+
+def test_conditions_without_params_are_rejected():
+    """Test that values have to be passed as params or filters, not inlined in conditions."""
+    service = mock_db_service()
+    service.statements = StatementCache()
+    error = "Conditions without params are not supported, use filters or pass the values " \
+            "as params"
+
+    assert service.select("users", "email LIKE '%john%'") == {"success": False, "error": error}
+    assert service.update("users", {"name": "Alice"}, "id = 1") == \
+        {"success": False, "error": error}
+    assert service.delete("users", "id = 1") == {"success": False, "error": error}
+    with pytest.raises(ValueError, match="Conditions without params"):
+        next(service.stream_select("users", "id = 1"))
+    service.pool.connection.assert_not_called()
+
+
+def test_select_with_filters_and_paging():
+    """Test that structured filters are compiled to a parameterised, prepared statement."""
+    service = mock_db_service()
+    service.statements = StatementCache()
+    cur = service.pool.connection.return_value.__enter__.return_value \
+        .cursor.return_value.__enter__.return_value
+    cur.connection.prepared = set()
+    cur.fetchall.return_value = []
+
+    for offset in (0, 50):
+        result = service.select("searches",
+                                filters=[["user_id", "=", 1], ["active", "=", True]],
+                                order_by=["id desc"],
+                                limit=50,
+                                offset=offset)
+        assert result == {"success": True, "data": []}
+
+    queries = [call.args[0] for call in cur.execute.call_args_list]
+    assert queries[0] == ("PREPARE crud_1 AS SELECT * FROM searches WHERE user_id = $1 "
+                          "AND active = $2 ORDER BY id DESC LIMIT $3 OFFSET $4")
+    assert queries[1:] == ["EXECUTE crud_1 (%s, %s, %s, %s)"] * 2
+    assert cur.execute.call_args_list[-1].args[1] == (1, True, 50, 50)
+
+
+def test_invalid_filters_are_reported():
+    """Test that malformed filters fail without running a statement."""
+    service = mock_db_service()
+    service.statements = StatementCache()
+
+    result = service.delete("users", filters=[["id = 1 OR 1 = 1", "=", 1]])
+    assert result["success"] is False
+    assert "Invalid column name" in result["error"]
+    result = service.update("users", {"name": "Alice"}, "id = 1", filters=[["id", "=", 1]])
+    assert result == {"success": False, "error": "Pass either conditions or filters, not both"}
+    assert service.delete("users") == {"success": False,
+                                       "error": "Conditions required for delete"}
+    service.pool.connection.assert_not_called()
+
+
+def test_invalid_identifiers_are_reported():
+    """Test that table and column names are checked before they are written into SQL."""
+    service = mock_db_service()
+    service.statements = StatementCache()
+
+    result = service.select("users; DROP TABLE users", filters=[["id", "=", 1]])
+    assert result == {"success": False,
+                      "error": "Invalid table name: 'users; DROP TABLE users'"}
+    result = service.select("users", fields=["id", "password FROM sessions --"])
+    assert result == {"success": False,
+                      "error": "Invalid column name: 'password FROM sessions --'"}
+    assert service.insert("users", {"id = 1) --": 1})["success"] is False
+    assert service.update("users u", {"name": "Alice"}, filters=[["id", "=", 1]])["success"] \
+        is False
+    assert service.delete("users u", filters=[["id", "=", 1]])["success"] is False
+    assert service.bulk_insert("users", [{"id": 1}], on_conflict="nothing",
+                               conflict_columns=["id) --"])["success"] is False
+    with pytest.raises(ValueError):
+        next(service.stream_select("users u"))
+    service.pool.connection.assert_not_called()
+
+
+def test_stream_select_reads_batches_from_named_cursor():
+    """Test that streamed selects fetch from a server-side cursor batch by batch."""
+    service = mock_db_service()
+    conn = service.pool.connection.return_value.__enter__.return_value
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchmany.side_effect = [[{"id": 1}, {"id": 2}], [{"id": 3}], []]
+
+    rows = service.stream_select("individual_listings", filters=[["contacted", "=", False]],
+                                 batch_size=2)
+    assert list(rows) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    assert conn.cursor.call_args.kwargs["name"].startswith("stream_select_")
+    cur.execute.assert_called_once_with(
+        "SELECT * FROM individual_listings WHERE contacted = %s", (False,))
+    cur.fetchmany.assert_called_with(2)
+
+
+def test_bulk_insert_pages_rows():
+    """Test that rows are sent in pages of multi-row inserts."""
+    service = mock_db_service()
+    rows = [{"listing_id": str(i), "price": i} for i in range(5)]
+    with patch("services.database_service.execute_values") as mock_execute_values:
+        result = service.bulk_insert("individual_listings", rows, page_size=2)
+
+    assert result == {"success": True, "affected_rows": 6}
+    pages = [c.args[2] for c in mock_execute_values.call_args_list]
+    assert pages == [[("0", 0), ("1", 1)], [("2", 2), ("3", 3)], [("4", 4)]]
+    assert mock_execute_values.call_args.args[1] == \
+        "INSERT INTO individual_listings (listing_id, price) VALUES %s"
+
+
+def test_insert_returning_generated_keys():
+    """Test that inserts return the requested columns of the new record."""
+    service = mock_db_service()
+    service.statements = StatementCache(max_size=0)
+    cur = service.pool.connection.return_value.__enter__.return_value \
+        .cursor.return_value.__enter__.return_value
+    cur.rowcount = 1
+    cur.description = [("id",)]
+    cur.fetchall.return_value = [{"id": 7}]
+
+    result = service.insert("searches", {"user_id": 1, "name": "Berlin"}, returning=["id"])
+
+    assert result == {"success": True, "affected_rows": 1, "data": [{"id": 7}]}
+    cur.execute.assert_called_once_with(
+        "INSERT INTO searches (user_id, name) VALUES (%s, %s) RETURNING id", (1, "Berlin"))
+
+    result = service.insert("searches", {"user_id": 1}, returning=["id; DROP TABLE users"])
+    assert result["success"] is False
+    assert cur.execute.call_count == 1
+
+
+def test_bulk_insert_returning():
+    """Test that bulk inserts return the requested columns of every row."""
+    service = mock_db_service()
+    rows = [{"listing_id": str(i)} for i in range(3)]
+    with patch("services.database_service.execute_values") as mock_execute_values:
+        mock_execute_values.side_effect = lambda cur, query, page, page_size, fetch: \
+            [{"id": int(listing_id)} for listing_id, in page]
+        result = service.bulk_insert("individual_listings", rows, page_size=2,
+                                     returning=["id"])
+
+    assert result["data"] == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert mock_execute_values.call_args.args[1] == \
+        "INSERT INTO individual_listings (listing_id) VALUES %s RETURNING id"
+    assert mock_execute_values.call_args.kwargs["fetch"] is True
+
+    cur = service.pool.connection.return_value.__enter__.return_value \
+        .cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [{"id": 0}]
+    result = service.bulk_insert("individual_listings", rows[:1], method="copy",
+                                 returning=["id"])
+    assert result["data"] == [{"id": 0}]
+    # COPY cannot return rows, so they are moved over from a staging table
+    assert cur.copy_expert.call_args.args[0].startswith("COPY _bulk_insert_individual_listings")
+    assert cur.execute.call_args.args[0].endswith(
+        "SELECT listing_id FROM _bulk_insert_individual_listings RETURNING id")
+
+
+def test_bulk_insert_conflict_clauses():
+    """Test the generated ON CONFLICT clauses."""
+    columns = ["listing_id", "price", "size"]
+    assert DatabaseService._conflict_clause(columns, None, None) == ""
+    assert DatabaseService._conflict_clause(columns, "nothing", None) == \
+        " ON CONFLICT DO NOTHING"
+    assert DatabaseService._conflict_clause(columns, "update", ["listing_id"]) == \
+        " ON CONFLICT (listing_id) DO UPDATE SET price = EXCLUDED.price, size = EXCLUDED.size"
+
+    service = mock_db_service()
+    result = service.bulk_insert("individual_listings", [{"listing_id": "1"}],
+                                 on_conflict="update")
+    assert result["success"] is False
+    assert "conflict_columns" in result["error"]
+
+    result = service.bulk_insert("individual_listings", [{"listing_id": "1"}], method="rows")
+    assert result["success"] is False
+
+
+def test_bulk_insert_copy_upsert():
+    """Test that COPY upserts go through a staging table."""
+    service = mock_db_service()
+    rows = [
+        {"listing_id": "1", "listing_title": None},
+        {"listing_id": "2", "listing_title": ""},
+        {"listing_id": "3", "listing_title": 'say "\\N"'},
+    ]
+    result = service.bulk_insert("individual_listings",
+                                 rows,
+                                 method="copy",
+                                 on_conflict="update",
+                                 conflict_columns=["listing_id"])
+    assert result["success"] is True
+
+    cur = service.pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    copy_sql, buffer = cur.copy_expert.call_args.args
+    assert copy_sql.startswith("COPY _bulk_insert_individual_listings (listing_id, listing_title)")
+    # only None is written unquoted, which CSV COPY reads as NULL
+    assert buffer.getvalue() == '"1",\n"2",""\n"3","say ""\\N"""\n'
+    assert cur.execute.call_args.args[0] == (
+        "INSERT INTO individual_listings (listing_id, listing_title) "
+        "SELECT listing_id, listing_title FROM _bulk_insert_individual_listings "
+        "ON CONFLICT (listing_id) DO UPDATE SET listing_title = EXCLUDED.listing_title")
+
+
 def test_database_startup(credentials: Dict[str, str]):
     """Test database startup when down."""
     logger.info("Testing database startup")
@@ -255,7 +255,7 @@ def test_caching_behavior(
     user_id = profile_service.auth_client.get_user_id(authenticated_session)
     result = db_client.select(
         table="users",
-        conditions=f"id = '{user_id}'",
+        filters=[["id", "=", user_id]],
         fields=["profile_photo", "first_name", "last_name"],
     )
 
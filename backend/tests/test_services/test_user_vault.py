@@ -0,0 +1,110 @@
+import json
+import time
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+from services.auth_service import VAULT_FORMAT_VERSION, UserVault, VaultCache
+
+
+def vault_dir(base_dir, user_id="42") -> Path:
+    return Path(base_dir, "data", "users", user_id, "vault")
+
+
+def test_secrets_are_cached_until_they_change(tmp_path):
+    vault = UserVault("42", base_dir=str(tmp_path), secret_ttl=60)
+    vault.store_secret("openai_credentials", {"api_key": "sk-1"})
+
+    assert vault.get_secret("openai_credentials") == '{"api_key": "sk-1"}'
+    assert vault.get_secret("openai_credentials") == '{"api_key": "sk-1"}'
+    assert (vault.secret_hits, vault.secret_misses) == (2, 0)
+
+    vault.store_secret("openai_credentials", {"api_key": "sk-2"})
+    assert vault.get_secret("openai_credentials") == '{"api_key": "sk-2"}'
+
+    assert vault.delete_secret("openai_credentials")
+    assert not vault.delete_secret("openai_credentials")
+    assert vault.get_secret("openai_credentials") is None
+
+
+def test_cached_secrets_expire(tmp_path):
+    vault = UserVault("42", base_dir=str(tmp_path), secret_ttl=0.05)
+    vault.store_secret("wg_gesucht_credentials", "secret")
+    assert vault.get_secret("wg_gesucht_credentials") == "secret"
+
+    # written by another process, only seen once the cached secrets expired
+    UserVault("42", base_dir=str(tmp_path)).store_secret("wg_gesucht_credentials", "changed")
+    assert vault.get_secret("wg_gesucht_credentials") == "secret"
+    time.sleep(0.1)
+    assert vault.get_secret("wg_gesucht_credentials") == "changed"
+
+
+def test_secrets_are_stored_in_one_versioned_file(tmp_path):
+    vault = UserVault("42", base_dir=str(tmp_path))
+    vault.store_secret("wg_password", "pw")
+    vault.store_secret("openai_key", "sk")
+
+    assert sorted(p.name for p in vault_dir(tmp_path).iterdir()) == ["master.key", "vault.enc"]
+    assert sorted(vault.list_secrets()) == ["openai_key", "wg_password"]
+
+    cipher = Fernet(Path(vault_dir(tmp_path), "master.key").read_bytes())
+    data = json.loads(cipher.decrypt(Path(vault_dir(tmp_path), "vault.enc").read_bytes()))
+    assert data == {
+        "version": VAULT_FORMAT_VERSION,
+        "revision": 2,
+        "secrets": {"wg_password": "pw", "openai_key": "sk"},
+    }
+
+
+def test_legacy_layouts_are_migrated(tmp_path):
+    directory = vault_dir(tmp_path)
+    directory.mkdir(parents=True)
+    key = Fernet.generate_key()
+    Path(directory, "master.key").write_bytes(key)
+    Path(directory, "wg_password.enc").write_bytes(Fernet(key).encrypt(b"pw"))
+    Path(directory, "openai_key.enc").write_bytes(b"not encrypted with the master key")
+    # key_vault.enc of the old AuthService, holding only its key
+    Path(directory.parent, "key_vault.enc").write_bytes(Fernet.generate_key())
+
+    vault = UserVault("42", base_dir=str(tmp_path))
+
+    assert vault.get_secret("wg_password") == "pw"
+    assert vault.get_secret("openai_key") is None
+    assert sorted(p.name for p in directory.iterdir()) == [
+        "master.key", "openai_key.enc.legacy", "vault.enc"
+    ]
+    assert not Path(directory.parent, "key_vault.enc").exists()
+
+
+def test_vaults_are_reused_and_evicted(tmp_path):
+    cache = VaultCache(secret_ttl=60, max_users=2, base_dir=str(tmp_path))
+    vault = cache.get("1")
+    vault.store_secret("openai_credentials", "secret")
+    vault.get_secret("openai_credentials")
+
+    assert cache.get("1") is vault
+    assert cache.get("1").get_secret("openai_credentials") == "secret"
+    cache.get("2")
+    cache.get("3")
+
+    stats = cache.stats()
+    assert stats["vaults"] == 2
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 3, 0.4)
+    assert (stats["secret_hits"], stats["secret_misses"]) == (2, 0)
+    assert cache.get("1") is not vault
+    assert cache.get("1").get_secret("openai_credentials") == "secret"
+
+
+def test_warm_loads_all_vaults(tmp_path):
+    for user_id in ["1", "2", "3"]:
+        UserVault(user_id, base_dir=str(tmp_path)).store_secret("openai_key", f"sk-{user_id}")
+    # users without a vault are skipped
+    Path(tmp_path, "data", "users", "4").mkdir()
+
+    cache = VaultCache(secret_ttl=60, base_dir=str(tmp_path))
+    assert cache.warm(workers=2) == 3
+
+    assert [cache.get(user_id).get_secret("openai_key") for user_id in ["1", "2", "3"]] == [
+        "sk-1", "sk-2", "sk-3"
+    ]
+    stats = cache.stats()
+    assert (stats["vaults"], stats["misses"], stats["secret_misses"]) == (3, 0, 0)
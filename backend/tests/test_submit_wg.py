@@ -4,17 +4,29 @@ import os
 from unittest.mock import Mock, patch, MagicMock
 from selenium.common.exceptions import ElementNotInteractableException
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+import submit_wg
 from submit_wg import submit_app
+from utils.browser_wrapper import LOGOUT_XPATH
 
 # Mock logging setup
 logger = logging.getLogger("test_logger")
 
+@pytest.fixture(autouse=True)
+def browser_manager():
+    """Start every test without cached browsers."""
+    submit_wg._browser_manager = None
+    yield
+    submit_wg._browser_manager = None
+
 @pytest.fixture
 def mock_config():
     os.environ["PASSWORD"] = "test123"
     return {
         "run_headless": True,
         "chromedriver_path": "/fake/path/chromedriver",
+        "wait_poll_interval": 0.01,
+        "wait_budget_seconds": 0.5,
         "ref": "/wg-zimmer-in-Berlin.123.html",
         "wg_gesucht_credentials": {
             "email": "test@example.com",
@@ -135,6 +147,60 @@ def test_driver_creation_failure(mock_config):
             submit_app(mock_config, logger)
         assert "Driver failed" in str(exc_info.value)
 
+def count_logins(mock_driver):
+    return sum(1 for c in mock_driver.find_element.call_args_list
+               if c.args == (By.ID, "login_email_username"))
+
+def mock_browser(mock_driver, logged_in):
+    mock_driver.find_element.return_value.is_displayed.return_value = True
+    mock_driver.find_elements.side_effect = find_elements_with_session(logged_in)
+
+def find_elements_with_session(logged_in):
+    def find_elements(by, xpath):
+        return [MagicMock()] if logged_in and xpath == LOGOUT_XPATH else []
+    return find_elements
+
+def test_session_is_reused(mock_config, mock_file):
+    """The browser is started and logged in once for several messages"""
+    with patch('selenium.webdriver.Chrome') as mock_chrome:
+        mock_driver = mock_chrome.return_value
+        mock_browser(mock_driver, logged_in=False)
+        submit_app(mock_config, logger)
+        assert count_logins(mock_driver) == 1
+
+        mock_driver.find_elements.side_effect = find_elements_with_session(True)
+        submit_app(mock_config, logger)
+        submit_app(mock_config, logger)
+
+    assert mock_chrome.call_count == 1
+    assert count_logins(mock_driver) == 1
+    mock_driver.quit.assert_not_called()
+
+def test_expired_session_logs_in_again(mock_config, mock_file):
+    with patch('selenium.webdriver.Chrome') as mock_chrome:
+        mock_driver = mock_chrome.return_value
+        mock_browser(mock_driver, logged_in=False)
+        submit_app(mock_config, logger)
+        submit_app(mock_config, logger)
+
+    assert mock_chrome.call_count == 1
+    assert count_logins(mock_driver) == 2
+
+def test_crashed_browser_is_replaced(mock_config, mock_file):
+    with patch('selenium.webdriver.Chrome') as mock_chrome:
+        crashed, fresh = MagicMock(), MagicMock()
+        for mock_driver in (crashed, fresh):
+            mock_browser(mock_driver, logged_in=True)
+        mock_chrome.side_effect = [crashed, fresh]
+
+        submit_app(mock_config, logger)
+        type(crashed).current_url = property(Mock(side_effect=WebDriverException()))
+        submit_app(mock_config, logger)
+
+    assert mock_chrome.call_count == 2
+    fresh.get.assert_called_once_with(
+        "https://www.wg-gesucht.de/nachricht-senden" + mock_config["ref"])
+
 # Additional test ideas:
 # - Test cookie popup handling
 # - Test security confirmation popup handling
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+from utils.browser_manager import BrowserManager
+
+
+class FakeBrowser:
+
+    def __init__(self, run_headless: bool):
+        self.run_headless = run_headless
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def quit(self):
+        self.alive = False
+
+
+class FakeBrowserManager(BrowserManager):
+    """Launches fake browsers, optionally blocking until `release` is set."""
+
+    def __init__(self, *args, launch_delay: float = 0, **kwargs):
+        self.launch_delay = launch_delay
+        self.launched = []
+        super().__init__(*args, **kwargs)
+
+    def _launch(self, run_headless, chromedriver_path):
+        time.sleep(self.launch_delay)
+        browser = FakeBrowser(run_headless)
+        self.launched.append(browser)
+        return browser
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_pooled_browsers_are_assigned_and_refilled():
+    manager = FakeBrowserManager(warm_size=2)
+    wait_for(lambda: manager.pool_stats()["idle"] == 2)
+
+    browser = manager.get_browser_for_user("1")
+    assert browser in manager.launched[:2]
+    assert manager.get_browser_for_user("1") is browser
+
+    wait_for(lambda: manager.pool_stats()["idle"] == 2)
+    stats = manager.pool_stats()
+    assert (stats["active"], stats["pool_hits"], stats["pool_misses"]) == (1, 1, 0)
+
+    manager.close_all()
+    assert not any(browser.alive for browser in manager.launched)
+
+
+def test_dead_browsers_are_replaced():
+    manager = FakeBrowserManager()
+    browser = manager.get_browser_for_user("1")
+    browser.alive = False
+
+    assert manager.get_browser_for_user("1") is not browser
+    assert manager.pool_stats()["active"] == 1
+
+
+def test_requests_wait_for_a_free_browser():
+    manager = FakeBrowserManager(max_size=1, acquire_timeout=2)
+    manager.get_browser_for_user("1")
+    result = {}
+    waiter = threading.Thread(target=lambda: result.update(browser=manager.get_browser_for_user("2")))
+    waiter.start()
+
+    wait_for(lambda: manager.pool_stats()["waits"] == 1)
+    manager.close_user_browser("1")
+    waiter.join()
+
+    assert result["browser"].alive
+    assert list(manager.active_browsers) == ["2"]
+
+
+def test_requests_time_out_when_all_browsers_are_in_use():
+    manager = FakeBrowserManager(max_size=1, acquire_timeout=0.05)
+    manager.get_browser_for_user("1")
+
+    with pytest.raises(TimeoutError):
+        manager.get_browser_for_user("2")
+    assert manager.pool_stats()["timeouts"] == 1
+
+
+def test_launches_do_not_block_other_users():
+    manager = FakeBrowserManager()
+    browser = manager.get_browser_for_user("1")
+    manager.launch_delay = 0.5
+    slow = threading.Thread(target=manager.get_browser_for_user, args=("2",))
+    slow.start()
+    wait_for(lambda: manager.pool_stats()["pending"] == 1)
+
+    start = time.monotonic()
+    assert manager.get_browser_for_user("1") is browser
+    assert time.monotonic() - start < 0.25
+    slow.join()
+
+
+def test_pooled_browsers_make_room_for_other_options():
+    manager = FakeBrowserManager(warm_size=1, max_size=1)
+    wait_for(lambda: manager.pool_stats()["idle"] == 1)
+    pooled = manager.launched[0]
+
+    browser = manager.get_browser_for_user("1", run_headless=False)
+    assert not browser.run_headless
+    assert not pooled.alive
+    assert manager.pool_stats()["idle"] == 0
+
+
+def test_free_slots_are_used_before_pooled_browsers():
+    manager = FakeBrowserManager(warm_size=1, max_size=2)
+    wait_for(lambda: manager.pool_stats()["idle"] == 1)
+    pooled = manager.launched[0]
+
+    browser = manager.get_browser_for_user("1", run_headless=False)
+    assert browser is not pooled
+    assert pooled.alive
+    assert manager.pool_stats()["idle"] == 1
+
+
+def test_user_locks_are_dropped_with_the_browser():
+    manager = FakeBrowserManager()
+    manager.get_browser_for_user("1")
+    manager.get_browser_for_user("2")
+
+    manager.close_user_browser("1")
+    manager.cleanup_inactive_browsers(max_idle_time=-1)
+
+    assert manager._user_locks == {}
+    assert manager.get_browser_for_user("1").alive
@@ -3,16 +3,44 @@ import selenium
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import ElementNotInteractableException
-from utils.browser_wrapper import BrowserWrapper
+from selenium.common.exceptions import ElementNotInteractableException, NoSuchElementException
+from unittest.mock import MagicMock
+from utils.browser_wrapper import LOGOUT_XPATH, BrowserWrapper
 from utils.browser_manager import BrowserManager
 from tests.logger import TestLogger 
 from pathlib import Path
 import os
+import time
 
 logger = TestLogger(Path(__file__).stem)
 
 
+def mock_account_menu(logged_in: bool):
+    """A driver showing the account menu of a logged in or logged out user."""
+    element = MagicMock()
+    element.is_displayed.return_value = True
+    shown = {LOGOUT_XPATH} if logged_in else {"login_email_username"}
+
+    def find_element(by, value):
+        if value in shown or "Mein Konto" in value:
+            return element
+        raise NoSuchElementException()
+
+    driver = MagicMock()
+    driver.find_element.side_effect = find_element
+    driver.find_elements.side_effect = lambda by, value: [element] if value in shown else []
+    return driver
+
+
+@pytest.mark.parametrize("logged_in", [True, False])
+def test_is_logged_in_does_not_wait_for_the_login_form(logged_in):
+    browser = BrowserWrapper(mock_account_menu(logged_in), poll_interval=0.01)
+
+    start = time.monotonic()
+    assert browser.is_logged_in() is logged_in
+    assert time.monotonic() - start < 1
+
+
 def test_navigation(browser: BrowserWrapper):
     browser.navigate_to("https://www.wg-gesucht.de")
     assert "WG-Gesucht.de" in browser.get_title()
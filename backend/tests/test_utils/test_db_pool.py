@@ -0,0 +1,138 @@
+import threading
+import time
+import pytest
+import psycopg2
+from unittest.mock import MagicMock
+from psycopg2 import extensions
+from utils.db_pool import ConnectionPool, PoolTimeout
+
+
+def make_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def connect():
+    return MagicMock(side_effect=lambda: make_connection())
+
+
+def test_connections_are_reused(connect):
+    pool = ConnectionPool(connect, min_size=1, max_size=4)
+    for _ in range(10):
+        with pool.connection() as conn:
+            conn.cursor()
+
+    assert connect.call_count == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 10
+    assert stats["size"] == 1 and stats["idle"] == 1 and stats["in_use"] == 0
+
+
+def test_grows_up_to_max_size_and_waits(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=2, timeout=2)
+    release = threading.Event()
+
+    def borrow():
+        with pool.connection():
+            release.wait()
+
+    threads = [threading.Thread(target=borrow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    while pool.stats()["in_use"] < 2:
+        time.sleep(0.01)
+
+    threading.Timer(0.1, release.set).start()
+    with pool.connection():
+        pass
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert connect.call_count == 2
+    assert stats["waits"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+
+
+def test_timeout_when_exhausted(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            with pool.connection():
+                pass
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_closed_connections_are_replaced(connect):
+    pool = ConnectionPool(connect, min_size=1, max_size=1)
+    with pool.connection() as conn:
+        first = conn
+    first.closed = 1
+
+    with pool.connection() as conn:
+        assert conn is not first
+    assert pool.stats()["discarded"] == 1
+
+
+def test_idle_connections_are_validated(connect):
+    pool = ConnectionPool(connect, min_size=1, max_size=1, validate_after=0)
+    with pool.connection() as conn:
+        first = conn
+    first.cursor.return_value.__enter__.return_value.execute.side_effect = \
+        psycopg2.OperationalError("server closed the connection")
+
+    with pool.connection() as conn:
+        assert conn is not first
+    assert connect.call_count == 2
+
+
+def test_connections_are_recycled_after_max_lifetime(connect):
+    pool = ConnectionPool(connect, min_size=1, max_size=1, max_lifetime=0.05)
+    with pool.connection() as conn:
+        first = conn
+    time.sleep(0.06)
+    with pool.connection() as conn:
+        assert conn is not first
+
+    first.close.assert_called_once()
+    assert pool.stats()["recycled"] == 1
+
+
+def test_open_transactions_are_rolled_back(connect):
+    pool = ConnectionPool(connect, min_size=1, max_size=1)
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            conn.info.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+            raise ValueError("query failed")
+
+    conn.rollback.assert_called_once()
+    assert pool.stats()["idle"] == 1
+
+
+def test_close(connect):
+    pool = ConnectionPool(connect, min_size=2, max_size=2)
+    pool.close()
+    assert pool.stats()["size"] == 0
+    with pytest.raises(PoolTimeout):
+        with pool.connection():
+            pass
+
+
+def test_connection_released_when_generator_is_closed(connect):
+    pool = ConnectionPool(connect, min_size=0, max_size=1)
+
+    def rows():
+        with pool.connection():
+            yield 1
+            yield 2
+
+    stream = rows()
+    next(stream)
+    assert pool.stats()["in_use"] == 1
+    stream.close()
+
+    stats = pool.stats()
+    assert stats["in_use"] == 0 and stats["idle"] == 1
@@ -0,0 +1,56 @@
+import pytest
+from utils.filters import FilterError, compile_filters, compile_order_by
+
+
+def test_conditions_are_combined_with_and():
+    assert compile_filters([["id", "=", 5], ["user_id", "!=", "7"]]) == \
+        ("id = %s AND user_id <> %s", (5, "7"))
+
+
+def test_nested_groups():
+    conditions, params = compile_filters([
+        ["user_id", "=", 1],
+        {"or": [["active", "=", True], {"and": [["max_price", "<=", 600], ["min_size", ">", 12]]}]},
+    ])
+    assert conditions == "user_id = %s AND (active = %s OR (max_price <= %s AND min_size > %s))"
+    assert params == (1, True, 600, 12)
+
+
+def test_list_and_null_operators():
+    conditions, params = compile_filters([["id", "IN", [1, 2, 3]], ["email", "not in", ()],
+                                          ["last_run", "is null"],
+                                          ["profile_photo", "is not null", None]])
+    assert conditions == ("id = ANY(%s) AND NOT (email = ANY(%s)) AND last_run IS NULL "
+                          "AND profile_photo IS NOT NULL")
+    assert params == ([1, 2, 3], [])
+
+
+def test_statement_does_not_depend_on_values():
+    assert compile_filters([["id", "in", [1]]])[0] == compile_filters([["id", "in", [1, 2]]])[0]
+    assert compile_filters([["email", "like", "%@example.com"]]) == \
+        ("email LIKE %s", ("%@example.com",))
+
+
+@pytest.mark.parametrize("filters", [
+    [],
+    "id = 1",
+    [["id = 1 OR 1 = 1", "=", 1]],
+    [["id", "==", 1]],
+    [["id", "="]],
+    [["id", "=", None]],
+    [["id", "in", 1]],
+    [["id", "is null", 1]],
+    [{"xor": [["id", "=", 1]]}],
+    [{"or": []}],
+])
+def test_invalid_filters(filters):
+    with pytest.raises(FilterError):
+        compile_filters(filters)
+
+
+def test_order_by():
+    assert compile_order_by(["created_at desc", "id", " name ASC "]) == \
+        "created_at DESC, id ASC, name ASC"
+    assert compile_order_by(None) == ""
+    with pytest.raises(FilterError):
+        compile_order_by(["id; DROP TABLE users"])
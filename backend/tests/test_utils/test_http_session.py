@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from utils.http_session import AsyncHttpSession, HttpSession, LatencyHistogram, SharedAsyncClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first `failures` requests, 200 afterwards."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.ports.add(self.client_address[1])
+            status = 503 if server.requests <= server.failures else 200
+        body = b'{"status": "ok"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.failures = 0
+    server.ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_connections_are_kept_alive(server):
+    session = HttpSession(url(server))
+    for _ in range(5):
+        assert session.request("GET", "/health").status_code == 200
+    # all requests went over the same connection
+    assert len(server.ports) == 1
+    assert session.latency_stats()["GET /health"]["count"] == 5
+    session.close()
+
+
+def test_idempotent_requests_are_retried(server):
+    server.failures = 2
+    session = HttpSession(url(server), retries=3, backoff_factor=0)
+    assert session.request("GET", "/select").status_code == 200
+    assert server.requests == 3
+
+
+def test_posts_are_not_retried(server):
+    server.failures = 2
+    session = HttpSession(url(server), retries=3, backoff_factor=0)
+    assert session.request("POST", "/insert").status_code == 503
+    assert server.requests == 1
+
+
+def test_failed_requests_are_recorded():
+    session = HttpSession("http://127.0.0.1:9", retries=0, timeout=1)
+    with pytest.raises(requests.ConnectionError):
+        session.request("GET", "/health")
+    assert session.latency_stats("/health")["GET /health"]["count"] == 1
+    assert session.latency_stats("/select") == {}
+
+
+def test_async_idempotent_requests_are_retried(server):
+    server.failures = 2
+
+    async def run():
+        session = AsyncHttpSession(url(server), retries=3, backoff_factor=0)
+        get = await session.request("GET", "/select")
+        post = await session.request("POST", "/insert")
+        await session.aclose()
+        return get.status_code, post.status_code
+
+    assert asyncio.run(run()) == (200, 200)
+    # two failed GETs, the retried GET and the POST
+    assert server.requests == 4
+
+
+def test_async_posts_are_not_retried(server):
+    server.failures = 1
+
+    async def run():
+        session = AsyncHttpSession(url(server), retries=3, backoff_factor=0)
+        response = await session.request("POST", "/insert")
+        await session.aclose()
+        return response.status_code, session.latency_stats()
+
+    status_code, stats = asyncio.run(run())
+    assert status_code == 503
+    assert server.requests == 1
+    assert stats["POST /insert"]["count"] == 1
+
+
+def test_shared_client_per_event_loop(server):
+    shared = SharedAsyncClient()
+    db = AsyncHttpSession(url(server), client=shared)
+    auth = AsyncHttpSession(url(server), client=shared)
+
+    async def run():
+        await db.request("GET", "/select")
+        await auth.request("GET", "/get-user-id")
+        return shared.get()
+
+    first = asyncio.run(run())
+    # a new event loop gets a new client, the connections of the old loop are gone
+    second = asyncio.run(run())
+    assert first is not second
+    assert server.requests == 4
+    asyncio.run(auth.aclose())
+    assert shared._client is second
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 90 + [0.05] * 9 + [3.0]:
+        histogram.record(seconds)
+
+    stats = histogram.snapshot()
+    assert stats["count"] == 100
+    assert stats["buckets"] == {"le_0.01": 90, "le_0.1": 9, "le_1": 0, "inf": 1}
+    assert stats["p50"] == 0.01
+    assert stats["p95"] == 0.1
+    assert stats["p99"] == 0.1
+    assert stats["max"] == 3.0
+
+    # quantiles in the last bucket are estimated as the slowest call
+    histogram.record(2.0)
+    assert histogram.snapshot()["p99"] == 3.0
+    assert LatencyHistogram().snapshot()["p95"] == 0.0
@@ -0,0 +1,67 @@
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+from utils.migrations import MIGRATIONS_DIR, migrate, pending_migrations
+
+
+@pytest.fixture
+def migrations_dir(tmp_path: Path) -> Path:
+    (tmp_path / "002_add_column.sql").write_text("ALTER TABLE users ADD COLUMN x INT;")
+    (tmp_path / "010_add_index.sql").write_text("CREATE INDEX idx_x ON users (x);")
+    (tmp_path / "001_create_table.sql").write_text("CREATE TABLE t (id INT);")
+    (tmp_path / "README.md").write_text("not a migration")
+    return tmp_path
+
+
+def make_connection(applied: list):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [(version,) for version in applied]
+    return conn, cur
+
+
+def test_pending_migrations_in_version_order(migrations_dir: Path):
+    pending = pending_migrations(migrations_dir, applied={"002"})
+    assert [(version, path.name) for version, path in pending] == [
+        ("001", "001_create_table.sql"),
+        ("010", "010_add_index.sql"),
+    ]
+
+
+def test_duplicate_versions_are_rejected(migrations_dir: Path):
+    (migrations_dir / "002_other.sql").write_text("SELECT 1;")
+    with pytest.raises(ValueError, match="Duplicate migration version 002"):
+        pending_migrations(migrations_dir, applied=set())
+
+
+def test_migrate_applies_and_records_pending_files(migrations_dir: Path):
+    conn, cur = make_connection(applied=["001"])
+    assert migrate(conn, migrations_dir) == ["002_add_column.sql", "010_add_index.sql"]
+
+    statements = [call.args for call in cur.execute.call_args_list]
+    assert ("ALTER TABLE users ADD COLUMN x INT;",) in statements
+    assert ("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+            ("010", "010_add_index.sql")) in statements
+    assert ("CREATE TABLE t (id INT);",) not in statements
+    assert statements[-1] == ("SELECT pg_advisory_unlock(%s)", (7999,))
+
+
+def test_failed_migration_is_rolled_back(migrations_dir: Path):
+    conn, cur = make_connection(applied=[])
+
+    def execute(query, *args):
+        if query.startswith("ALTER"):
+            raise RuntimeError("syntax error")
+
+    cur.execute.side_effect = execute
+
+    with pytest.raises(RuntimeError):
+        migrate(conn, migrations_dir)
+    conn.rollback.assert_called_once()
+    recorded = [call.args[1] for call in cur.execute.call_args_list
+                if call.args[0].startswith("INSERT INTO schema_migrations")]
+    assert recorded == [("001", "001_create_table.sql")]
+
+
+def test_shipped_migrations_are_valid():
+    assert [version for version, _ in pending_migrations(MIGRATIONS_DIR, set())][0] == "001"
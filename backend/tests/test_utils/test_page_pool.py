@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from utils.page_pool import PagePool
+
+
+@pytest.fixture
+def mock_playwright():
+    with patch("utils.page_pool.sync_playwright") as mock_sync:
+        playwright = MagicMock()
+        mock_sync.return_value.start.return_value = playwright
+
+        browser = playwright.chromium.launch.return_value
+        browser.is_connected.return_value = True
+
+        def new_context():
+            context = MagicMock()
+            context.new_page.return_value.is_closed.return_value = False
+            return context
+
+        browser.new_context.side_effect = new_context
+        yield playwright
+
+
+def test_browser_launched_once(mock_playwright):
+    pool = PagePool()
+    for _ in range(5):
+        with pool.page() as page:
+            page.goto("https://www.wg-gesucht.de")
+
+    assert mock_playwright.chromium.launch.call_count == 1
+    assert mock_playwright.chromium.launch.return_value.new_context.call_count == 1
+
+
+def test_page_recycled_after_max_navigations(mock_playwright):
+    pool = PagePool(max_navigations=2)
+    pages = []
+    for _ in range(4):
+        with pool.page() as page:
+            pages.append(page)
+
+    assert pages[0] is pages[1]
+    assert pages[1] is not pages[2]
+    assert pages[2] is pages[3]
+
+
+def test_closed_page_is_replaced(mock_playwright):
+    pool = PagePool()
+    with pool.page() as page:
+        first = page
+    first.is_closed.return_value = True
+
+    with pool.page() as page:
+        assert page is not first
+
+
+def test_browser_relaunched_after_crash(mock_playwright):
+    browser = mock_playwright.chromium.launch.return_value
+    pool = PagePool()
+    with pool.page():
+        pass
+
+    browser.is_connected.return_value = False
+    with pool.page():
+        browser.is_connected.return_value = True
+
+    assert mock_playwright.chromium.launch.call_count == 2
+
+
+def test_page_discarded_on_error(mock_playwright):
+    pool = PagePool()
+    with pytest.raises(RuntimeError):
+        with pool.page() as page:
+            first = page
+            raise RuntimeError("navigation failed")
+
+    with pool.page() as page:
+        assert page is not first
+
+
+def test_close(mock_playwright):
+    pool = PagePool()
+    with pool.page():
+        pass
+    pool.close()
+
+    mock_playwright.chromium.launch.return_value.close.assert_called_once()
+    mock_playwright.stop.assert_called_once()
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from utils.session_revocations import SessionRevocations
+
+
+def iso(delta: timedelta) -> str:
+    return (datetime.now() + delta).isoformat()
+
+
+@pytest.fixture
+def db_client():
+    client = MagicMock()
+    client.select.return_value = {"success": True, "data": []}
+    client.execute_query.return_value = {"success": True, "affected_rows": 0}
+    return client
+
+
+def test_refresh_loads_revocations_above_high_water(db_client):
+    db_client.select.return_value = {
+        "success": True,
+        "data": [
+            {"token": "a", "revocation_id": 3, "expires_at": iso(timedelta(hours=1))},
+            {"token": "b", "revocation_id": 7, "expires_at": iso(timedelta(hours=1))},
+        ],
+    }
+    revocations = SessionRevocations(db_client)
+    assert revocations.refresh() == 2
+    assert revocations.is_revoked("a") and revocations.is_revoked("b")
+    assert not revocations.is_revoked("c")
+    assert revocations.stats()["high_water"] == 7
+
+    db_client.select.return_value = {"success": True, "data": []}
+    revocations.refresh()
+    revocation_filter = db_client.select.call_args.kwargs["filters"][1]["or"][0]
+    assert revocation_filter == ["revocation_id", ">", 7]
+    # known revocations are kept
+    assert revocations.is_revoked("a")
+
+
+def test_expired_revocations_are_dropped(db_client):
+    db_client.select.return_value = {
+        "success": True,
+        "data": [{"token": "a", "revocation_id": 1, "expires_at": iso(timedelta(seconds=0.2))}],
+    }
+    revocations = SessionRevocations(db_client)
+    revocations.refresh()
+    assert revocations.is_revoked("a")
+
+    time.sleep(0.3)
+    db_client.select.return_value = {"success": True, "data": []}
+    revocations.refresh()
+    assert not revocations.is_revoked("a")
+
+
+def test_revoke(db_client):
+    expires_at = datetime.now() + timedelta(days=7)
+    db_client.execute_query.return_value = {
+        "success": True,
+        "affected_rows": 1,
+        "data": [{"revocation_id": 4, "expires_at": expires_at.isoformat()}],
+    }
+    revocations = SessionRevocations(db_client)
+    assert revocations.revoke("token") is True
+    assert revocations.is_revoked("token")
+    assert revocations.stats()["high_water"] == 4
+    query, params = db_client.execute_query.call_args.args
+    assert "nextval('session_revocations_seq')" in query
+    assert params[1] == "token"
+
+    # revoked before, e.g. by another auth service process
+    db_client.execute_query.return_value = {"success": True, "affected_rows": 0, "data": []}
+    revocations = SessionRevocations(db_client)
+    assert revocations.revoke("token", expires_at) is False
+    assert revocations.is_revoked("token")
+
+    db_client.execute_query.return_value = {"success": False, "error": "connection refused"}
+    with pytest.raises(RuntimeError):
+        revocations.revoke("other")
+
+
+def test_purge_expired_in_batches(db_client):
+    db_client.execute_query.side_effect = [
+        {"success": True, "affected_rows": 2},
+        {"success": True, "affected_rows": 2},
+        {"success": True, "affected_rows": 1},
+    ]
+    revocations = SessionRevocations(db_client, purge_batch_size=2)
+    assert revocations.purge_expired() == 5
+    assert db_client.execute_query.call_count == 3
+    assert db_client.execute_query.call_args.args[1][1] == 2
+    assert revocations.stats()["purged"] == 5
+
+
+def test_purge_stops_after_max_batches(db_client):
+    db_client.execute_query.return_value = {"success": True, "affected_rows": 2}
+    revocations = SessionRevocations(db_client, purge_batch_size=2)
+    assert revocations.purge_expired(max_batches=2) == 4
+
+
+def test_background_sync_survives_errors(db_client):
+    db_client.select.side_effect = [
+        {"success": False, "error": "connection refused"},
+        {"success": True, "data": []},
+        {"success": True, "data": [
+            {"token": "a", "revocation_id": 1, "expires_at": iso(timedelta(hours=1))},
+        ]},
+    ] + [{"success": True, "data": []}] * 100
+    revocations = SessionRevocations(db_client)
+    revocations.start(poll_interval=0.01, purge_interval=3600)
+    assert "connection refused" in revocations.stats()["last_error"]
+
+    deadline = time.monotonic() + 2
+    while not revocations.is_revoked("a") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    revocations.stop()
+    assert revocations.is_revoked("a")
+    assert revocations.stats()["last_error"] is None
+    # the first poll also purged the expired sessions
+    assert db_client.execute_query.call_count == 1
@@ -0,0 +1,108 @@
+import pytest
+import psycopg2
+from psycopg2 import errors
+from unittest.mock import MagicMock
+from utils.statement_cache import StatementCache, numbered_placeholders
+
+SELECT_USER = ("select", "users", (), "id = %s")
+
+
+def make_cursor():
+    cur = MagicMock()
+    cur.connection.prepared = set()
+    return cur
+
+
+def statements(cur) -> list:
+    return [call.args[0] for call in cur.execute.call_args_list]
+
+
+def test_numbered_placeholders():
+    assert numbered_placeholders("UPDATE users SET name = %s WHERE id = %s") == \
+        "UPDATE users SET name = $1 WHERE id = $2"
+    assert numbered_placeholders("SELECT * FROM users WHERE email LIKE %s AND id = %s",
+                                 start=3) == \
+        "SELECT * FROM users WHERE email LIKE $3 AND id = $4"
+    assert numbered_placeholders("SELECT '100%%'") == "SELECT '100%'"
+
+
+def test_prepares_once_per_connection():
+    cache = StatementCache()
+    cur = make_cursor()
+    for user_id in (1, 2, 3):
+        cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (user_id,))
+
+    assert statements(cur) == [
+        "PREPARE crud_1 AS SELECT * FROM users WHERE id = $1",
+        "EXECUTE crud_1 (%s)",
+        "EXECUTE crud_1 (%s)",
+        "EXECUTE crud_1 (%s)",
+    ]
+    assert cur.execute.call_args_list[-1].args[1] == (3,)
+    stats = cache.stats()
+    assert stats["statements"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_each_connection_prepares_the_shape():
+    cache = StatementCache()
+    first, second = make_cursor(), make_cursor()
+    cache.execute(first, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+    cache.execute(second, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+
+    assert statements(second)[0] == "PREPARE crud_1 AS SELECT * FROM users WHERE id = $1"
+    assert cache.stats()["misses"] == 2
+
+
+def test_connections_without_tracking_run_unprepared():
+    cache = StatementCache()
+    cur = MagicMock()
+    cur.connection = MagicMock(spec=["rollback"])
+    cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+
+    cur.execute.assert_called_once_with("SELECT * FROM users WHERE id = %s", (1,))
+    assert cache.stats()["unprepared"] == 1
+
+
+def test_unpreparable_shape_falls_back():
+    cache = StatementCache()
+    cur = make_cursor()
+    cur.execute.side_effect = [psycopg2.Error("could not determine data type"), None, None]
+    for _ in range(2):
+        cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+
+    assert statements(cur)[1:] == ["SELECT * FROM users WHERE id = %s"] * 2
+    cur.connection.rollback.assert_called_once()
+    assert cache.stats()["unprepared"] == 2 and cache.stats()["statements"] == 0
+
+
+def test_deallocated_statements_are_prepared_again():
+    cache = StatementCache()
+    cur = make_cursor()
+    cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+    cur.execute.side_effect = [errors.lookup("26000")("prepared statement does not exist"),
+                               None, None]
+    cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (2,))
+
+    assert statements(cur)[-2:] == ["PREPARE crud_1 AS SELECT * FROM users WHERE id = $1",
+                                    "EXECUTE crud_1 (%s)"]
+    assert cur.connection.prepared == {"crud_1"}
+
+
+def test_bounded_number_of_shapes():
+    cache = StatementCache(max_size=2)
+    cur = make_cursor()
+    for table in ("users", "searches", "sessions"):
+        cache.execute(cur, ("select", table, (), None), f"SELECT * FROM {table}")
+
+    assert cache.stats()["statements"] == 2
+    assert "DEALLOCATE ALL" in statements(cur)
+    assert cur.connection.prepared == {"crud_3"}
+
+
+def test_disabled_cache():
+    cache = StatementCache(max_size=0)
+    cur = make_cursor()
+    cache.execute(cur, SELECT_USER, "SELECT * FROM users WHERE id = %s", (1,))
+    cur.execute.assert_called_once_with("SELECT * FROM users WHERE id = %s", (1,))
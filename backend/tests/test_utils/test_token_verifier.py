@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from utils.token_verifier import TokenVerifier
+
+SECRET = "shared-secret"
+
+
+def make_token(user_id="42", key=SECRET, algorithm="HS256", expires_in=3600) -> str:
+    exp = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    return jwt.encode({"user_id": user_id, "exp": exp}, key, algorithm=algorithm)
+
+
+def test_verified_tokens_are_cached():
+    verifier = TokenVerifier(SECRET, revalidate_after=None)
+    token = make_token()
+
+    assert verifier.verify(token) == ("42", False)
+    assert verifier.verify(token) == ("42", False)
+    stats = verifier.stats()
+    assert (stats["tokens"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_invalid_tokens_are_rejected():
+    verifier = TokenVerifier(SECRET)
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(make_token(key="other-secret"))
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(make_token(expires_in=-1))
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        verifier.verify(jwt.encode({"user_id": "42"}, SECRET, algorithm="HS256"))
+    assert verifier.stats()["tokens"] == 0
+
+
+def test_cached_tokens_expire():
+    verifier = TokenVerifier(SECRET, revalidate_after=None)
+    token = make_token(expires_in=1)
+    verifier.verify(token)
+    time.sleep(1.1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+    assert verifier.stats()["tokens"] == 0
+
+
+def test_cache_is_bounded():
+    verifier = TokenVerifier(SECRET, max_size=2, revalidate_after=None)
+    tokens = [make_token(str(user_id)) for user_id in range(3)]
+    for token in tokens:
+        verifier.verify(token)
+    verifier.verify(tokens[2])
+    assert verifier.stats() == {"tokens": 2, "hits": 1, "misses": 3, "hit_rate": 0.25}
+
+
+def test_revocation_checks_are_due_periodically():
+    verifier = TokenVerifier(SECRET, revalidate_after=0.2)
+    token = make_token()
+
+    # new tokens are checked with the auth API once
+    assert verifier.verify(token) == ("42", True)
+    verifier.confirm(token)
+    assert verifier.verify(token) == ("42", False)
+    time.sleep(0.25)
+    assert verifier.verify(token) == ("42", True)
+
+    verifier.forget(token)
+    assert verifier.stats()["tokens"] == 0
+
+
+def test_rs256_with_public_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo).decode()
+    verifier = TokenVerifier(public_pem, algorithm="RS256")
+
+    assert verifier.verify(make_token(key=private_key, algorithm="RS256"))[0] == "42"
+    # an HS256 token signed with the public key must not pass
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(key=SECRET, algorithm="HS256"))
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.delenv("JWT_VERIFY_LOCALLY", raising=False)
+    assert TokenVerifier.from_env() is None
+
+    monkeypatch.setenv("JWT_VERIFY_LOCALLY", "true")
+    monkeypatch.delenv("JWT_SECRET", raising=False)
+    with pytest.raises(ValueError):
+        TokenVerifier.from_env()
+
+    monkeypatch.setenv("JWT_SECRET", SECRET)
+    monkeypatch.setenv("JWT_REVALIDATE_AFTER", "none")
+    verifier = TokenVerifier.from_env()
+    assert verifier.algorithm == "HS256" and verifier.revalidate_after is None
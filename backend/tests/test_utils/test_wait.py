@@ -0,0 +1,107 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from utils.wait import Waiter
+
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.find_elements.return_value = []
+    return driver
+
+
+def visible_element():
+    element = MagicMock()
+    element.is_displayed.return_value = True
+    element.is_enabled.return_value = True
+    return element
+
+
+def test_disables_implicit_waits(driver):
+    Waiter(driver)
+    driver.implicitly_wait.assert_called_once_with(0)
+
+
+def test_until_returns_as_soon_as_condition_holds(driver):
+    waiter = Waiter(driver, poll_interval=0.01, budget=5)
+    calls = iter([False, False, "ready"])
+
+    start = time.monotonic()
+    assert waiter.until(lambda d: next(calls), "step") == "ready"
+
+    assert time.monotonic() - start < 1
+    assert [step for step, _ in waiter.timings] == ["step"]
+    driver.save_screenshot.assert_not_called()
+
+
+def test_screenshot_only_on_timeout(driver, tmp_path):
+    waiter = Waiter(driver, poll_interval=0.01, budget=0.05, screenshot_dir=str(tmp_path))
+    with pytest.raises(TimeoutException):
+        waiter.until(lambda d: False, "visible message_input")
+    driver.save_screenshot.assert_called_once_with(
+        f"{tmp_path}/wait_failure_visible_message_input.png")
+
+    with pytest.raises(TimeoutException):
+        waiter.until(lambda d: False, "optional dialog", screenshot=False)
+    assert driver.save_screenshot.call_count == 1
+
+
+def test_element_falls_back_to_hidden_element(driver, tmp_path):
+    hidden = MagicMock()
+    hidden.is_displayed.return_value = False
+    driver.find_element.return_value = hidden
+
+    waiter = Waiter(driver, poll_interval=0.01, budget=0.05, screenshot_dir=str(tmp_path))
+    assert waiter.element(By.ID, "message_input") is hidden
+    driver.save_screenshot.assert_not_called()
+
+
+def test_element_missing(driver, tmp_path):
+    driver.find_element.side_effect = NoSuchElementException()
+    waiter = Waiter(driver, poll_interval=0.01, budget=0.05, screenshot_dir=str(tmp_path))
+    with pytest.raises(TimeoutException):
+        waiter.element(By.ID, "nonexistent-element")
+    driver.save_screenshot.assert_called_once_with(
+        f"{tmp_path}/wait_failure_visible_nonexistent_element.png")
+    assert not waiter.exists(By.ID, "nonexistent-element")
+
+
+def test_click_retries_intercepted_clicks(driver):
+    button = visible_element()
+    button.click.side_effect = [ElementClickInterceptedException(), None]
+    driver.find_element.return_value = button
+
+    waiter = Waiter(driver, poll_interval=0.01, budget=1)
+    waiter.click(By.ID, "login_submit")
+    assert button.click.call_count == 2
+
+
+def test_click_budget_exceeded(driver):
+    button = visible_element()
+    button.click.side_effect = ElementNotInteractableException()
+    driver.find_element.return_value = button
+
+    waiter = Waiter(driver, poll_interval=0.01, budget=0.05, screenshot_dir=None)
+    with pytest.raises(ElementNotInteractableException):
+        waiter.click(By.ID, "login_submit")
+
+
+def test_summary_reports_each_step(driver):
+    driver.find_element.return_value = visible_element()
+    waiter = Waiter(driver, poll_interval=0.01)
+    waiter.click(By.ID, "login_submit")
+    waiter.send_keys(By.ID, "login_password", "secret")
+
+    assert [step for step, _ in waiter.timings] == ["click login_submit",
+                                                   "visible login_password"]
+    assert waiter.summary().startswith(f"waited {waiter.total:.2f}s in 2 steps: ")
+    waiter.reset()
+    assert waiter.timings == []
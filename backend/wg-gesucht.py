@@ -6,9 +6,14 @@ import sys
 import time
 from subprocess import call
 
+import requests
 import yaml
 
 from src import ListingGetter, ListingInfoGetter, submit_wg
+from contacted_store import ContactedStore
+from detail_fetcher import DetailFetcher
+from listing_corpus import ListingCorpus
+from utils.page_pool import PagePool
 
 logging.basicConfig(
     format="[%(asctime)s | %(levelname)s] - %(message)s ",
@@ -29,43 +34,54 @@ def main(config):
         - Checks if listing is reupload by comparing to user_name and address
         - Gets listing text -> can be used for OpenAI further down the line
         - Attemps to submit an application
-        - Adds listing to 'past_listings.txt'
+        - Adds listing to the contacted listings store
     """
 
     # initialise old listings for later
-    old_listings = dict()
+    old_listings = set()
 
-    while True:
-        # read previously sent messages:
-        past_listings_file_name = "past_listings.txt"
-        if not os.path.exists(past_listings_file_name):
-            prev_listings = []
-        else:
-            with open(past_listings_file_name, "r") as msgs:
-                prev_listings = msgs.readlines()
+    # keep one browser alive across polls instead of launching one per search
+    page_pool = PagePool()
+
+    # previously contacted listings, loaded once and updated as messages are sent
+    contacted = ContactedStore("contacted_listings.sqlite3")
+    imported = contacted.import_legacy_file("past_listings.txt")
+    if imported:
+        logger.info(f"Imported {imported} listings from 'past_listings.txt'.")
+
+    # texts of contacted listings, appended line by line
+    listing_corpus = ListingCorpus("listing_texts.jsonl", segment_size=1000)
+    imported = listing_corpus.import_legacy_json("listing_texts.json")
+    if imported:
+        logger.info(f"Imported {imported} texts from 'listing_texts.json'.")
 
+    # downloads detail pages of new listings in the background
+    detail_fetcher = DetailFetcher(max_workers=4, requests_per_second=2)
+
+    while True:
         # get current listings
         url = config["url"]
-        listing_getter = ListingGetter(url)
-        info_dict = listing_getter.all_infos
-        new_listings = info_dict
-
-        # get diff: new - old listings
-        old_values = old_listings.values()
-        diff_dict = {
-            k: v for k, v in enumerate(new_listings.values()) if v not in old_values
-        }
-        if diff_dict:
-            logger.info(f"Found {len(diff_dict)} new listings.")
-            for listing in diff_dict.values():
-                # unpack listing dict
-                ref = listing["ref"]
-                listing_length_months = listing["rental_length_months"]
+        listing_getter = ListingGetter(url, page_pool=page_pool)
+        new_listings = listing_getter.all_listings
+
+        # get diff: new - old listings, listings are compared by their ad id
+        diff_listings = [listing for listing in new_listings if listing not in old_listings]
+        if diff_listings:
+            logger.info(f"Found {len(diff_listings)} new listings.")
+            # start downloading detail pages while the listings are filtered
+            detail_fetcher.prefetch(
+                listing.ref for listing in diff_listings
+                if ContactedStore.identifier(listing.user_name, listing.address) not in contacted
+            )
+            for listing in diff_listings:
+                # unpack listing
+                ref = listing.ref
+                listing_length_months = listing.rental_length_months
 
                 # add to config for submit_app function
                 config["ref"] = ref
-                config["user_name"] = listing["user_name"]
-                config["address"] = listing["address"]
+                config["user_name"] = listing.user_name
+                config["address"] = listing.address
                 logger.info(f"Trying to send message to: {listing}")
 
                 # check rental start date
@@ -78,11 +94,11 @@ def main(config):
                 earliest_allowable_start = desired_rental_start
                 # TODO! set to own value
                 latest_allowable_start = datetime.datetime.now() + datetime.timedelta(days=10000)
-                if (earliest_allowable_start > listing["rental_start"]) or (
-                    listing["rental_start"] > latest_allowable_start
+                if (earliest_allowable_start > listing.rental_start) or (
+                    listing.rental_start > latest_allowable_start
                 ):
                     logger.info(
-                        f"Rental start ({listing['rental_start']}) is outside of the desired start range. Skipping ..."
+                        f"Rental start ({listing.rental_start}) is outside of the desired start range. Skipping ..."
                     )
                     continue
 
@@ -98,17 +114,22 @@ def main(config):
                     continue
 
                 # check if already messaged listing in the past
-                listings_sent_identifier = (
-                    f"{listing['user_name']}: {listing['address']}\n"
+                listings_sent_identifier = ContactedStore.identifier(
+                    listing.user_name, listing.address
                 )
-                if listings_sent_identifier in prev_listings:
+                if listings_sent_identifier in contacted:
                     logger.info(
-                        "Listing in 'prev_listings' file, therfore contacted in the past! Skipping ..."
+                        "Listing in contacted listings, therfore contacted in the past! Skipping ..."
                     )
                     continue
 
                 # get listing text and store in config for later processing
-                listing_info_getter = ListingInfoGetter(ref)
+                try:
+                    html = detail_fetcher.get(ref)
+                except requests.RequestException as e:
+                    logger.info(f"Could not get listing page: {e}. Skipping ...")
+                    continue
+                listing_info_getter = ListingInfoGetter(listing, html=html)
                 listing_text = listing_info_getter.listing_text
                 config["listing_text"] = listing_text
 
@@ -117,14 +138,12 @@ def main(config):
 
                 # if new message sent -> store information about listing
                 if sending_successful:
-                    listing_info_getter.save_listing_text(
-                        "listing_texts.json", listing_text
-                    )
+                    listing_corpus.append(listing_text, ref=ref)
 
-                # add listing to past_listings.txt
-                with open(past_listings_file_name, "a") as msgs:
-                    msgs.write(f"{listings_sent_identifier}")
-            old_listings = new_listings.copy()
+                # add listing to the contacted listings
+                contacted.add(listings_sent_identifier, listing.listing_id)
+            detail_fetcher.discard()
+            old_listings = set(new_listings)
         else:
             logger.info("No new offers.")
         logger.info("Sleep.")
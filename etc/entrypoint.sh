@@ -39,6 +39,10 @@ sleep 5
 echo "Initializing database schema..."
 envsubst < "$WORKDIR/assets/sql/init.sql" | su - postgres -c "psql -d postgres"
 
+# Apply pending schema migrations
+echo "Applying database migrations..."
+python "$WORKDIR/backend/src/utils/migrations.py" "$WORKDIR/assets/sql/migrations"
+
 if [ "$REMOTE_CONTAINERS" = "true" ]; then
     exec "$@"
 else